@@ -51,6 +51,12 @@ elif [[ "${START_MODE}" == "worker" ]]; then
         exec celery --app=automated_actions.worker worker ${CELERY_OPTS} "$@"
     fi
 
+elif [[ "${START_MODE}" == "archive" ]]; then
+    echo "---> Archiving expiring actions ..."
+    exec python -m automated_actions.db.archive "$@"
+elif [[ "${START_MODE}" == "migrate" ]]; then
+    echo "---> Migrating database tables ..."
+    exec python -m automated_actions.db.migrations "$@"
 else
-    echo "unknow mode $START_MODE - use 'api' or 'worker' instead"
+    echo "unknow mode $START_MODE - use 'api', 'worker', 'archive', or 'migrate' instead"
 fi
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# create the action archive bucket
+awslocal s3 mb s3://automated-actions-archive
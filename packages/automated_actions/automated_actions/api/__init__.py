@@ -1,25 +1,48 @@
 import logging
+from time import perf_counter
 
 from fastapi import APIRouter, FastAPI
 
 from automated_actions.api.v1 import router as v1_router
-from automated_actions.auth import OPA, BearerTokenAuth, OpenIDConnect
+from automated_actions.auth import (
+    OPA,
+    BearerTokenAuth,
+    CapabilityToken,
+    OpenIDConnect,
+    TokenRevocationList,
+)
 from automated_actions.config import settings
-from automated_actions.db.models import ALL_TABLES, User
+from automated_actions.db.migrations import create_tables
+from automated_actions.db.models import (
+    ALL_TABLES,
+    RevokedToken,
+    User,
+    get_rate_limit_counter,
+)
+from automated_actions.rbac import RBAC
 
 api_router = APIRouter()
 log = logging.getLogger(__name__)
 
 
 def create_db_tables() -> None:
-    """Create DynamoDB tables if they do not exist."""
+    """Create DynamoDB tables if they do not exist.
+
+    Skipped with `AA_DB_CREATE_TABLES=0`; the tables are then created by the
+    migrations (`AA_START_MODE=migrate`). With the sqlite and memory action
+    backends, only the users and revoked tokens are stored in DynamoDB.
+    """
+    if not settings.db_create_tables:
+        log.info("Skipping the DynamoDB tables check (AA_DB_CREATE_TABLES=0)")
+        return
     log.info("Attempting to create DynamoDB tables if they do not exist...")
-    for table_model in ALL_TABLES:
-        if not table_model.exists():
-            log.info(f"Creating table {table_model.Meta.table_name}...")
-            table_model.create_table(wait=True)
-            log.info(f"Table {table_model.Meta.table_name} created.")
-    log.info("All tables checked.")
+    start = perf_counter()
+    created = create_tables(
+        ALL_TABLES if settings.action_backend == "dynamodb" else [User, RevokedToken]
+    )
+    log.info(
+        f"All tables checked in {perf_counter() - start:.2f}s, created: {created or 'none'}"
+    )
 
 
 async def initialize_auth_components(app: FastAPI) -> None:
@@ -33,13 +56,43 @@ async def initialize_auth_components(app: FastAPI) -> None:
         session_timeout_secs=settings.session_timeout_secs,
         enforce_https="https://" in settings.url,
         user_model=User,
+        userinfo_cache_ttl_secs=settings.oidc_userinfo_cache_ttl_secs,
+        userinfo_cache_size=settings.oidc_userinfo_cache_size,
+        verify_tokens_locally=settings.oidc_verify_tokens_locally,
     )
     app.state.token = BearerTokenAuth[User](  # type: ignore[type-var]
-        issuer=settings.url, secret=settings.token_secret, user_model=User
-    )
-    app.state.authz = OPA[User](  # type: ignore[type-var]
-        opa_host=settings.opa_host, package_name="authz", skip_endpoints=[]
+        issuer=settings.url,
+        secret=settings.token_secret,
+        user_model=User,
+        revocations=TokenRevocationList(
+            load=RevokedToken.revoked_since, store=RevokedToken.revoke
+        ),
     )
+    capability_token = None
+    if settings.authz_capability_token_ttl_secs > 0:
+        capability_token = CapabilityToken(
+            secret=settings.token_secret,
+            ttl_secs=settings.authz_capability_token_ttl_secs,
+            secure="https://" in settings.url,
+        )
+    if settings.authz_backend == "embedded":
+        app.state.authz = RBAC[User](  # type: ignore[type-var]
+            roles_paths=settings.authz_roles_paths,
+            skip_endpoints=[],
+            ops_counter=get_rate_limit_counter().get_ops_count,
+            reload_interval_secs=settings.authz_roles_reload_interval_secs,
+            capability_token=capability_token,
+        )
+    else:
+        app.state.authz = OPA[User](  # type: ignore[type-var]
+            opa_host=settings.opa_host,
+            package_name="authz",
+            skip_endpoints=[],
+            decision_cache_ttl_secs=settings.opa_decision_cache_ttl_secs,
+            decision_cache_size=settings.opa_decision_cache_size,
+            ops_counter=get_rate_limit_counter().get_ops_count,
+            capability_token=capability_token,
+        )
     log.info("Auth components initialized.")
 
 
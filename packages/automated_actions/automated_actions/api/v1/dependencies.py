@@ -1,9 +1,9 @@
 import logging
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response
 
-from automated_actions.auth import OPA, BearerTokenAuth
+from automated_actions.auth import OPA, Authorizer, BearerTokenAuth
 from automated_actions.db.models import User
 
 log = logging.getLogger(__name__)
@@ -25,8 +25,15 @@ def get_bearer_token_auth(request: Request) -> BearerTokenAuth:
 BearerTokenAuthDep = Annotated[BearerTokenAuth, Depends(get_bearer_token_auth)]
 
 
-async def get_authz(request: Request, user: UserDep) -> OPA:
-    return await request.app.state.authz(request, user)
+async def get_authz(request: Request, response: Response, user: UserDep) -> OPA:
+    return await request.app.state.authz(request, user, response)
 
 
 AuthZDep = Annotated[OPA, Depends(get_authz)]
+
+
+def get_authorizer(request: Request) -> Authorizer:
+    return request.app.state.authz
+
+
+AuthorizerDep = Annotated[Authorizer, Depends(get_authorizer)]
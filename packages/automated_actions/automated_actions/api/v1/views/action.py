@@ -1,27 +1,153 @@
 import logging
-from typing import Annotated
+from enum import StrEnum
+from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
 from automated_actions.api.v1.dependencies import UserDep
+from automated_actions.cache import TTLCache
+from automated_actions.config import settings
 from automated_actions.db.models import (
+    FINAL_STATUSES,
+    Action,
+    ActionManager,
+    ActionPage,
     ActionSchemaOut,
+    ActionSchemaSummary,
     ActionStatus,
+    get_action_manager,
 )
-from automated_actions.db.models._action import ActionManager, get_action_manager
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
 
 router = APIRouter()
 log = logging.getLogger(__name__)
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class ActionFields(StrEnum):
+    ALL = "all"
+    SUMMARY = "summary"
+
+
+FIELDS_DESCRIPTION = (
+    "Fields of the returned actions. `summary` omits `result` and `task_args`; "
+    "use `action-detail` to get them."
+)
+
+_summary_list = TypeAdapter(list[ActionSchemaSummary])
+
+# finished actions never change again, so they're served without reading the
+# actions table
+final_actions = TTLCache[str, ActionSchemaOut](
+    maxsize=settings.action_detail_cache_size,
+    ttl=settings.action_detail_cache_ttl_secs,
+)
+
+
+def action_etag(action: ActionSchemaOut) -> str:
+    """Entity tag of an action, changed by every update of the action."""
+    return f'"{action.updated_at!r}-{action.status}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an `If-None-Match` header matches the entity tag."""
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _iter_pages(
+    page: ActionPage[Action], read_page: Callable[[str], ActionPage[Action]]
+) -> Iterator[Action]:
+    while True:
+        yield from page.items
+        if not page.cursor:
+            return
+        page = read_page(page.cursor)
+
+
+def _json_line(action: Action, fields: ActionFields) -> str:
+    dump = action.dump_summary() if fields == ActionFields.SUMMARY else action.dump()
+    return f"{dump.model_dump_json()}\n"
+
+
+def ndjson_response(actions: Iterator[Action], fields: ActionFields) -> Response:
+    """Stream the actions as JSON lines while they're read."""
+    return StreamingResponse(
+        (_json_line(action, fields) for action in actions),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+def actions_response(
+    read_page: Callable[[str | None], ActionPage[Action]],
+    cursor: str | None,
+    fields: ActionFields,
+    request: Request,
+    response: Response,
+) -> list[ActionSchemaOut] | Response:
+    """Return the actions of the page after `cursor`, with the cursor of the next page, if any.
+
+    Clients accepting `application/x-ndjson` get the actions of this and all
+    following pages instead, streamed as JSON lines. The pages are read
+    while streaming, one at a time, so the memory usage doesn't grow with the
+    number of actions.
+
+    Raises `ValueError` for an invalid cursor.
+    """
+    page = read_page(cursor)
+    if NDJSON_MEDIA_TYPE in request.headers.get("Accept", ""):
+        return ndjson_response(_iter_pages(page, read_page), fields)
+    headers = {NEXT_CURSOR_HEADER: page.cursor} if page.cursor else {}
+    if fields == ActionFields.SUMMARY:
+        # bypass the ActionSchemaOut response model, which would add
+        # `result` and `task_args` back
+        return Response(
+            content=_summary_list.dump_json([
+                action.dump_summary() for action in page.items
+            ]),
+            media_type="application/json",
+            headers=headers,
+        )
+    response.headers.update(headers)
+    return [action.dump() for action in page.items]
+
+
+LIST_RESPONSES: dict[int | str, dict] = {
+    200: {
+        "headers": {
+            NEXT_CURSOR_HEADER: {
+                "description": "Cursor of the next page, if there are more actions",
+                "schema": {"type": "string"},
+            }
+        },
+        "content": {
+            NDJSON_MEDIA_TYPE: {
+                "schema": {"type": "string"},
+                "example": '{"action_id": "...", ...}\n{"action_id": "...", ...}\n',
+            }
+        },
+    }
+}
+
 
 @router.get(
     "/actions",
     operation_id="action-list",
     tags=["General"],
+    response_model=list[ActionSchemaOut],
+    responses=LIST_RESPONSES,
 )
 def action_list(
     user: UserDep,
     action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
+    request: Request,
+    response: Response,
     status: Annotated[
         ActionStatus | None, Query(description="Filter actions by their status")
     ] = None,
@@ -38,28 +164,108 @@ def action_list(
             ge=0,
         ),
     ] = None,
-) -> list[ActionSchemaOut]:
-    """Lists actions, optionally filtered by status, user, or age."""
-    return [
-        action.dump()
-        for action in action_mgr.get_user_actions(
-            action_user or user.username,
+    limit: Annotated[
+        int,
+        Query(description="Maximum number of actions to return", ge=1, le=1000),
+    ] = 100,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=f"Continue after the last action of a previous page ({NEXT_CURSOR_HEADER} response header)"
+        ),
+    ] = None,
+    fields: Annotated[
+        ActionFields, Query(description=FIELDS_DESCRIPTION)
+    ] = ActionFields.ALL,
+    after: Annotated[
+        str | None,
+        Query(
+            description="List the actions created after the action with this (time-ordered) ID instead, oldest first. The cursors of these pages are action IDs."
+        ),
+    ] = None,
+) -> list[ActionSchemaOut] | Response:
+    """Lists actions, newest first, optionally filtered by status, user, or age.
+
+    Returns at most `limit` actions. If there are more, the cursor of the
+    next page is returned in the `X-Next-Cursor` response header.
+
+    With `after`, lists the actions created after the given action instead,
+    oldest first. Actions created before the action IDs became time-ordered
+    aren't included.
+
+    With `Accept: application/x-ndjson`, all actions are streamed as JSON
+    lines, reading `limit` actions at a time.
+    """
+    username = action_user or user.username
+    max_age = max_age_minutes * 60 if max_age_minutes else max_age_minutes
+    summary = fields == ActionFields.SUMMARY
+
+    def read_page(cursor: str | None) -> ActionPage[Action]:
+        if after:
+            # ID range pages: the cursor is the ID of the last action
+            return action_mgr.get_user_actions_after(
+                username,
+                cursor or after,
+                status,
+                max_age=max_age,
+                limit=limit,
+                summary=summary,
+            )
+        return action_mgr.get_user_actions(
+            username,
             status,
-            max_age=max_age_minutes * 60 if max_age_minutes else max_age_minutes,
+            max_age=max_age,
+            limit=limit,
+            cursor=cursor,
+            summary=summary,
         )
-    ]
+
+    try:
+        return actions_response(read_page, cursor, fields, request, response)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.get(
     "/actions/{action_id}",
     operation_id="action-detail",
     tags=["General"],
+    response_model=ActionSchemaOut,
+    responses={
+        200: {
+            "headers": {
+                "ETag": {
+                    "description": "Entity tag of the action's current state",
+                    "schema": {"type": "string"},
+                }
+            }
+        },
+        304: {"description": "The action matches the `If-None-Match` entity tag"},
+    },
 )
 def action_detail(
-    action_id: str, action_mgr: Annotated[ActionManager, Depends(get_action_manager)]
-) -> ActionSchemaOut:
-    """Retrieves the details of a specific action by its ID."""
-    return action_mgr.get_or_404(action_id).dump()
+    action_id: str,
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
+    request: Request,
+    response: Response,
+) -> ActionSchemaOut | Response:
+    """Retrieves the details of a specific action by its ID.
+
+    Send the `ETag` of a previous response in the `If-None-Match` request
+    header to get an empty `304 Not Modified` response while the action is
+    unchanged.
+    """
+    action = final_actions.get(action_id)
+    if action is None:
+        action = action_mgr.get_or_404(action_id).dump()
+        if action.status in FINAL_STATUSES:
+            final_actions.set(action_id, action)
+    etag = action_etag(action)
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return action
 
 
 @router.post(
@@ -73,5 +279,5 @@ def action_cancel(
 ) -> ActionSchemaOut:
     """Cancels a pending or running action by its ID."""
     action = action_mgr.get_or_404(action_id)
-    action.set_status(ActionStatus.CANCELLED)
+    action_mgr.cancel_action(action)
     return action.dump()
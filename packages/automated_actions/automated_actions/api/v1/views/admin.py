@@ -1,14 +1,35 @@
 import logging
+from datetime import date
 from datetime import datetime as dt
+from typing import Annotated
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from automated_actions.api.v1.dependencies import BearerTokenAuthDep, UserDep
+from automated_actions.api.v1.views.action import (
+    FIELDS_DESCRIPTION,
+    LIST_RESPONSES,
+    NDJSON_MEDIA_TYPE,
+    NEXT_CURSOR_HEADER,
+    ActionFields,
+    actions_response,
+    ndjson_response,
+)
+from automated_actions.db.archive import ActionArchive, get_action_archive
+from automated_actions.db.models import (
+    ActionManager,
+    ActionSchemaOut,
+    ActionStatus,
+    get_action_manager,
+)
 
 router = APIRouter()
 log = logging.getLogger(__name__)
 
+MAX_SCAN_SEGMENTS = 16
+
 
 class CreateTokenParam(BaseModel):
     name: str
@@ -33,3 +54,172 @@ def create_token(
         email=param.email,
         expiration=param.expiration,
     )
+
+
+class RevokeTokenParam(BaseModel):
+    token: str
+
+
+@router.post(
+    "/admin/token/revoke",
+    operation_id="revoke-token",
+    tags=["Admin"],
+)
+def revoke_token(
+    param: RevokeTokenParam, user: UserDep, token_auth: BearerTokenAuthDep
+) -> str:
+    """Revoke a service account token.
+
+    Returns the ID of the revoked token. All API instances reject the token
+    after their next revocation list refresh at the latest.
+    """
+    jti = token_auth.revoke_token(param.token)
+    log.info(f"Token {jti} revoked by {user.username}")
+    return jti
+
+
+@router.get(
+    "/admin/actions",
+    operation_id="admin-action-list",
+    tags=["Admin"],
+    response_model=list[ActionSchemaOut],
+    responses=LIST_RESPONSES,
+)
+def admin_action_list(
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
+    request: Request,
+    response: Response,
+    status: Annotated[ActionStatus, Query(description="Status of the actions")],
+    max_age_minutes: Annotated[
+        int | None,
+        Query(
+            description="Filter actions by their age in minutes. Actions updated more than this many minutes ago will be excluded.",
+            ge=0,
+        ),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(description="Maximum number of actions to return", ge=1, le=1000),
+    ] = 100,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=f"Continue after the last action of a previous page ({NEXT_CURSOR_HEADER} response header)"
+        ),
+    ] = None,
+    fields: Annotated[
+        ActionFields, Query(description=FIELDS_DESCRIPTION)
+    ] = ActionFields.ALL,
+) -> list[ActionSchemaOut] | Response:
+    """Lists the actions of all users with the given status, newest first.
+
+    Returns at most `limit` actions. If there are more, the cursor of the
+    next page is returned in the `X-Next-Cursor` response header.
+
+    With `Accept: application/x-ndjson`, all actions are streamed as JSON
+    lines, reading `limit` actions at a time.
+    """
+    try:
+        return actions_response(
+            lambda cursor: action_mgr.get_actions_by_status(
+                status,
+                max_age=max_age_minutes * 60 if max_age_minutes else max_age_minutes,
+                limit=limit,
+                cursor=cursor,
+                summary=fields == ActionFields.SUMMARY,
+            ),
+            cursor,
+            fields,
+            request,
+            response,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get(
+    "/admin/actions/scan",
+    operation_id="admin-action-scan",
+    tags=["Admin"],
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "The actions as JSON lines",
+            "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+        }
+    },
+)
+def admin_action_scan(
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
+    status: Annotated[
+        list[ActionStatus] | None,
+        Query(description="Filter actions by their status; may be given repeatedly"),
+    ] = None,
+    name: Annotated[
+        str | None, Query(description="Filter actions by their name")
+    ] = None,
+    max_age_minutes: Annotated[
+        int | None,
+        Query(
+            description="Filter actions by their age in minutes. Actions updated more than this many minutes ago will be excluded.",
+            ge=0,
+        ),
+    ] = None,
+    segments: Annotated[
+        int,
+        Query(
+            description="Number of table segments read concurrently",
+            ge=1,
+            le=MAX_SCAN_SEGMENTS,
+        ),
+    ] = 4,
+    fields: Annotated[
+        ActionFields, Query(description=FIELDS_DESCRIPTION)
+    ] = ActionFields.ALL,
+) -> Response:
+    """Streams the actions of all users as JSON lines, in no particular order.
+
+    Reads the whole actions table with a parallel scan, filtered by status,
+    name, and age. Prefer `admin-action-list` to list the actions with a
+    single status.
+    """
+    return ndjson_response(
+        action_mgr.get_all_actions(
+            status or (),
+            name,
+            max_age=max_age_minutes * 60 if max_age_minutes else max_age_minutes,
+            segments=segments,
+            summary=fields == ActionFields.SUMMARY,
+        ),
+        fields,
+    )
+
+
+@router.get(
+    "/admin/archive/actions",
+    operation_id="admin-archive-action-list",
+    tags=["Admin"],
+)
+def admin_archive_action_list(
+    archive: Annotated[ActionArchive, Depends(get_action_archive)],
+    updated: Annotated[
+        date, Query(description="Date (UTC) of the last update of the actions")
+    ],
+    owner: Annotated[
+        str | None, Query(description="Filter actions by their owner")
+    ] = None,
+    status: Annotated[
+        ActionStatus | None, Query(description="Filter actions by their status")
+    ] = None,
+) -> list[ActionSchemaOut]:
+    """Lists archived actions last updated on the given date.
+
+    Finished actions are deleted after the configured retention period and
+    kept in the archive.
+    """
+    return [
+        action
+        for action in archive.read(updated)
+        if (owner is None or action.owner == owner)
+        and (status is None or action.status == status)
+    ]
@@ -0,0 +1,59 @@
+import logging
+
+from fastapi import APIRouter, Request
+from pydantic import BaseModel, Field
+
+from automated_actions.api.v1.dependencies import AuthorizerDep, UserDep
+
+router = APIRouter()
+log = logging.getLogger(__name__)
+
+MAX_AUTHORIZE_ITEMS = 500
+
+
+class AuthorizeItem(BaseModel):
+    obj: str
+    params: dict[str, str] = {}
+
+
+class AuthorizeRequest(BaseModel):
+    items: list[AuthorizeItem] = Field(max_length=MAX_AUTHORIZE_ITEMS)
+
+
+class AuthorizeDecision(AuthorizeItem):
+    authorized: bool
+    within_rate_limits: bool
+
+
+@router.post(
+    "/authorize",
+    operation_id="authorize",
+    tags=["General"],
+)
+async def authorize(
+    request: Request,
+    authorize_request: AuthorizeRequest,
+    user: UserDep,
+    authorizer: AuthorizerDep,
+) -> list[AuthorizeDecision]:
+    """Check multiple actions and their parameters at once.
+
+    Returns whether the current user is authorized to run each action with the
+    given parameters and whether the action is still within its rate limits.
+    Nothing is executed.
+    """
+    items = [(item.obj, item.params) for item in authorize_request.items]
+    decisions = await authorizer.authorize_batch(
+        user,
+        items,
+        rate_limited_objects=authorizer.rate_limited_objects(request.app.routes),
+    )
+    return [
+        AuthorizeDecision(
+            obj=obj,
+            params=params,
+            authorized=bool(decision.get("authorized")),
+            within_rate_limits=bool(decision.get("within_rate_limits")),
+        )
+        for (obj, params), decision in zip(items, decisions, strict=True)
+    ]
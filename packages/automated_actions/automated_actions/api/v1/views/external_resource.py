@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Path, Query
@@ -15,9 +16,10 @@ from automated_actions.celery.external_resource.tasks import (
 )
 from automated_actions.db.models import (
     Action,
+    ActionManager,
     ActionSchemaOut,
+    get_action_manager,
 )
-from automated_actions.db.models._action import ActionManager, get_action_manager
 
 router = APIRouter()
 log = logging.getLogger(__name__)
@@ -39,7 +41,7 @@ def get_action_external_resource_rds_reboot(
     Returns:
         A new Action object.
     """
-    return action_mgr.create_action(
+    return action_mgr.new_action(
         name=EXTERNAL_RESOURCE_RDS_REBOOT_ACTION_ID, owner=user
     )
 
@@ -50,10 +52,11 @@ def get_action_external_resource_rds_reboot(
     status_code=202,
     tags=["Actions"],
 )
-def external_resource_rds_reboot(
+async def external_resource_rds_reboot(
     account: Annotated[str, Path(description="AWS account name")],
     identifier: Annotated[str, Path(description="RDS instance identifier")],
     action: Annotated[Action, Depends(get_action_external_resource_rds_reboot)],
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
     *,
     force_failover: Annotated[
         bool,
@@ -69,14 +72,18 @@ def external_resource_rds_reboot(
     log.info(
         f"Restarting RDS {identifier} in AWS account {account}. action_id={action.action_id}"
     )
-    external_resource_rds_reboot_task.apply_async(
-        kwargs={
-            "account": account,
-            "identifier": identifier,
-            "force_failover": force_failover,
-            "action": action,
-        },
-        task_id=action.action_id,
+    await action_mgr.submit_action(
+        action,
+        enqueue=partial(
+            external_resource_rds_reboot_task.apply_async,
+            kwargs={
+                "account": account,
+                "identifier": identifier,
+                "force_failover": force_failover,
+                "action": action,
+            },
+            task_id=action.action_id,
+        ),
     )
     return action.dump()
 
@@ -93,7 +100,7 @@ def get_action_external_resource_rds_snapshot(
     Returns:
         A new Action object.
     """
-    return action_mgr.create_action(
+    return action_mgr.new_action(
         name=EXTERNAL_RESOURCE_RDS_SNAPSHOT_ACTION_ID, owner=user
     )
 
@@ -104,11 +111,12 @@ def get_action_external_resource_rds_snapshot(
     status_code=202,
     tags=["Actions"],
 )
-def external_resource_rds_snapshot(
+async def external_resource_rds_snapshot(
     account: Annotated[str, Path(description="AWS account name")],
     identifier: Annotated[str, Path(description="RDS instance identifier")],
     snapshot_identifier: Annotated[str, Path(description="Snapshot identifier")],
     action: Annotated[Action, Depends(get_action_external_resource_rds_snapshot)],
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
 ) -> ActionSchemaOut:
     """Create a snapshot of an RDS instance.
 
@@ -117,14 +125,18 @@ def external_resource_rds_snapshot(
     log.info(
         f"Creating snapshot of RDS {identifier} in AWS account {account}. action_id={action.action_id}"
     )
-    external_resource_rds_snapshot_task.apply_async(
-        kwargs={
-            "account": account,
-            "identifier": identifier,
-            "snapshot_identifier": snapshot_identifier,
-            "action": action,
-        },
-        task_id=action.action_id,
+    await action_mgr.submit_action(
+        action,
+        enqueue=partial(
+            external_resource_rds_snapshot_task.apply_async,
+            kwargs={
+                "account": account,
+                "identifier": identifier,
+                "snapshot_identifier": snapshot_identifier,
+                "action": action,
+            },
+            task_id=action.action_id,
+        ),
     )
     return action.dump()
 
@@ -141,7 +153,7 @@ def get_action_external_resource_flush_elasticache(
     Returns:
         A new Action object.
     """
-    return action_mgr.create_action(
+    return action_mgr.new_action(
         name=EXTERNAL_RESOURCE_FLUSH_ELASTICACHE_ACTION_ID, owner=user
     )
 
@@ -152,10 +164,11 @@ def get_action_external_resource_flush_elasticache(
     status_code=202,
     tags=["Actions"],
 )
-def external_resource_flush_elasticache(
+async def external_resource_flush_elasticache(
     account: Annotated[str, Path(description="AWS account name")],
     identifier: Annotated[str, Path(description="RDS instance identifier")],
     action: Annotated[Action, Depends(get_action_external_resource_flush_elasticache)],
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
 ) -> ActionSchemaOut:
     """Flush an ElastiCache instance.
 
@@ -164,12 +177,16 @@ def external_resource_flush_elasticache(
     log.info(
         f"Flushing ElastiCache {identifier} in AWS account {account}. action_id={action.action_id}"
     )
-    external_resource_flush_elasticache_task.apply_async(
-        kwargs={
-            "account": account,
-            "identifier": identifier,
-            "action": action,
-        },
-        task_id=action.action_id,
+    await action_mgr.submit_action(
+        action,
+        enqueue=partial(
+            external_resource_flush_elasticache_task.apply_async,
+            kwargs={
+                "account": account,
+                "identifier": identifier,
+                "action": action,
+            },
+            task_id=action.action_id,
+        ),
     )
     return action.dump()
@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
@@ -7,9 +8,10 @@ from automated_actions.api.v1.dependencies import UserDep  # noqa: TC001
 from automated_actions.celery.no_op.tasks import no_op as no_op_task
 from automated_actions.db.models import (
     Action,
+    ActionManager,
     ActionSchemaOut,
+    get_action_manager,
 )
-from automated_actions.db.models._action import ActionManager, get_action_manager
 
 router = APIRouter()
 log = logging.getLogger(__name__)
@@ -20,8 +22,8 @@ NO_OP = "no-op"
 def get_action(
     action_mgr: Annotated[ActionManager, Depends(get_action_manager)], user: UserDep
 ) -> Action:
-    """Creates a new action record for a no-op operation."""
-    return action_mgr.create_action(name=NO_OP, owner=user)
+    """Creates a new, not yet stored action for a no-op operation."""
+    return action_mgr.new_action(name=NO_OP, owner=user)
 
 
 @router.post(
@@ -31,14 +33,21 @@ def get_action(
     response_model_exclude_unset=True,
     tags=["Actions"],
 )
-def no_op(action: Annotated[Action, Depends(get_action)]) -> ActionSchemaOut:
+async def no_op(
+    action: Annotated[Action, Depends(get_action)],
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
+) -> ActionSchemaOut:
     """Initiates a no-operation action.
 
     This action performs no actual operation but can be used for testing.
     """
     log.info(f"{NO_OP}: action_id={action.action_id}")
-    no_op_task.apply_async(
-        kwargs={"action": action},
-        task_id=action.action_id,
+    await action_mgr.submit_action(
+        action,
+        enqueue=partial(
+            no_op_task.apply_async,
+            kwargs={"action": action},
+            task_id=action.action_id,
+        ),
     )
     return action.dump()
@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, Path, Query
@@ -15,9 +16,10 @@ from automated_actions.celery.openshift.tasks import (
 )
 from automated_actions.db.models import (
     Action,
+    ActionManager,
     ActionSchemaOut,
+    get_action_manager,
 )
-from automated_actions.db.models._action import ActionManager, get_action_manager
 
 router = APIRouter()
 log = logging.getLogger(__name__)
@@ -30,8 +32,8 @@ OPENSHIFT_TRIGGER_CRONJOB_ID = "openshift-trigger-cronjob"
 def get_action_openshift_workload_restart(
     action_mgr: Annotated[ActionManager, Depends(get_action_manager)], user: UserDep
 ) -> Action:
-    """Creates a new action record for an OpenShift operation."""
-    return action_mgr.create_action(name=OPENSHIFT_WORKLOAD_RESTART_ID, owner=user)
+    """Creates a new, not yet stored action for an OpenShift operation."""
+    return action_mgr.new_action(name=OPENSHIFT_WORKLOAD_RESTART_ID, owner=user)
 
 
 @router.post(
@@ -40,7 +42,7 @@ def get_action_openshift_workload_restart(
     status_code=202,
     tags=["Actions"],
 )
-def openshift_workload_restart(
+async def openshift_workload_restart(
     cluster: Annotated[str, Path(description="OpenShift cluster name")],
     namespace: Annotated[str, Path(description="OpenShift namespace")],
     kind: Annotated[
@@ -50,6 +52,7 @@ def openshift_workload_restart(
     ],
     name: Annotated[str, Path(description="OpenShift workload name")],
     action: Annotated[Action, Depends(get_action_openshift_workload_restart)],
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
 ) -> ActionSchemaOut:
     """Initiates a restart of a specified OpenShift workload.
 
@@ -59,15 +62,19 @@ def openshift_workload_restart(
     log.info(
         f"Restarting {kind}/{name} in {cluster}/{namespace}: action_id={action.action_id}"
     )
-    openshift_workload_restart_task.apply_async(
-        kwargs={
-            "cluster": cluster,
-            "namespace": namespace,
-            "kind": kind,
-            "name": name,
-            "action": action,
-        },
-        task_id=action.action_id,
+    await action_mgr.submit_action(
+        action,
+        enqueue=partial(
+            openshift_workload_restart_task.apply_async,
+            kwargs={
+                "cluster": cluster,
+                "namespace": namespace,
+                "kind": kind,
+                "name": name,
+                "action": action,
+            },
+            task_id=action.action_id,
+        ),
     )
     return action.dump()
 
@@ -75,8 +82,8 @@ def openshift_workload_restart(
 def get_action_openshift_workload_delete(
     action_mgr: Annotated[ActionManager, Depends(get_action_manager)], user: UserDep
 ) -> Action:
-    """Creates a new action record for an OpenShift operation."""
-    return action_mgr.create_action(name=OPENSHIFT_WORKLOAD_DELETE_ID, owner=user)
+    """Creates a new, not yet stored action for an OpenShift operation."""
+    return action_mgr.new_action(name=OPENSHIFT_WORKLOAD_DELETE_ID, owner=user)
 
 
 @router.post(
@@ -85,7 +92,7 @@ def get_action_openshift_workload_delete(
     status_code=202,
     tags=["Actions"],
 )
-def openshift_workload_delete(
+async def openshift_workload_delete(
     cluster: Annotated[str, Path(description="OpenShift cluster name")],
     namespace: Annotated[str, Path(description="OpenShift namespace")],
     kind: Annotated[
@@ -94,6 +101,7 @@ def openshift_workload_delete(
     ],
     name: Annotated[str, Path(description="OpenShift workload name")],
     action: Annotated[Action, Depends(get_action_openshift_workload_delete)],
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
     api_version: Annotated[str, Query(description="OpenShift API version")] = "v1",
 ) -> ActionSchemaOut:
     """Initiates a delete of a specified OpenShift workload.
@@ -104,16 +112,20 @@ def openshift_workload_delete(
     log.info(
         f"Deleting {kind}/{name} in {cluster}/{namespace}: action_id={action.action_id}"
     )
-    openshift_workload_delete_task.apply_async(
-        kwargs={
-            "cluster": cluster,
-            "namespace": namespace,
-            "api_version": api_version,
-            "kind": kind,
-            "name": name,
-            "action": action,
-        },
-        task_id=action.action_id,
+    await action_mgr.submit_action(
+        action,
+        enqueue=partial(
+            openshift_workload_delete_task.apply_async,
+            kwargs={
+                "cluster": cluster,
+                "namespace": namespace,
+                "api_version": api_version,
+                "kind": kind,
+                "name": name,
+                "action": action,
+            },
+            task_id=action.action_id,
+        ),
     )
     return action.dump()
 
@@ -121,8 +133,8 @@ def openshift_workload_delete(
 def get_action_openshift_trigger_cronjob(
     action_mgr: Annotated[ActionManager, Depends(get_action_manager)], user: UserDep
 ) -> Action:
-    """Creates a new action record for an OpenShift operation."""
-    return action_mgr.create_action(name=OPENSHIFT_TRIGGER_CRONJOB_ID, owner=user)
+    """Creates a new, not yet stored action for an OpenShift operation."""
+    return action_mgr.new_action(name=OPENSHIFT_TRIGGER_CRONJOB_ID, owner=user)
 
 
 @router.post(
@@ -131,23 +143,28 @@ def get_action_openshift_trigger_cronjob(
     status_code=202,
     tags=["Actions"],
 )
-def openshift_trigger_cronjob(
+async def openshift_trigger_cronjob(
     cluster: Annotated[str, Path(description="OpenShift cluster name")],
     namespace: Annotated[str, Path(description="OpenShift namespace")],
     cronjob: Annotated[str, Path(description="OpenShift cronjob name")],
     action: Annotated[Action, Depends(get_action_openshift_trigger_cronjob)],
+    action_mgr: Annotated[ActionManager, Depends(get_action_manager)],
 ) -> ActionSchemaOut:
     """Run a specified OpenShift cronjob immediately."""
     log.info(
         f"Triggering cronjob {cronjob} in {cluster}/{namespace}: action_id={action.action_id}"
     )
-    openshift_trigger_cronjob_task.apply_async(
-        kwargs={
-            "cluster": cluster,
-            "namespace": namespace,
-            "cronjob": cronjob,
-            "action": action,
-        },
-        task_id=action.action_id,
+    await action_mgr.submit_action(
+        action,
+        enqueue=partial(
+            openshift_trigger_cronjob_task.apply_async,
+            kwargs={
+                "cluster": cluster,
+                "namespace": namespace,
+                "cronjob": cronjob,
+                "action": action,
+            },
+            task_id=action.action_id,
+        ),
     )
     return action.dump()
@@ -0,0 +1,94 @@
+import logging
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from enum import StrEnum
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from automated_actions.config import settings
+from automated_actions.db.models import ActionStatus, get_action_stats
+
+router = APIRouter()
+log = logging.getLogger(__name__)
+
+DEFAULT_RANGE = timedelta(days=7)
+
+
+class StatsField(StrEnum):
+    NAME = "name"
+    STATUS = "status"
+    OWNER = "owner"
+    HOUR = "hour"
+
+
+class ActionStatsOut(BaseModel):
+    name: str | None = None
+    status: ActionStatus | None = None
+    owner: str | None = None
+    # start of the hour (timestamp)
+    hour: float | None = None
+    count: int
+
+
+def _utc(value: dt) -> dt:
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+@router.get(
+    "/stats",
+    operation_id="action-stats",
+    tags=["General"],
+)
+def action_stats(
+    since: Annotated[
+        dt | None,
+        Query(description="Start of the time range (UTC); defaults to 7 days ago"),
+    ] = None,
+    until: Annotated[
+        dt | None, Query(description="End of the time range (UTC); defaults to now")
+    ] = None,
+    group_by: Annotated[
+        list[StatsField] | None,
+        Query(
+            description="Fields to group the counts by; defaults to the action name and status"
+        ),
+    ] = None,
+    name: Annotated[
+        str | None, Query(description="Count only actions with this name")
+    ] = None,
+    status: Annotated[
+        ActionStatus | None, Query(description="Count only actions with this status")
+    ] = None,
+    owner: Annotated[
+        str | None, Query(description="Count only actions of this owner")
+    ] = None,
+) -> list[ActionStatsOut]:
+    """Counts the actions that finished in a time range, in hourly resolution.
+
+    The counts are maintained while the actions finish, so this reads one
+    counter per hour and group instead of all actions.
+    """
+    until = _utc(until) if until else dt.now(UTC)
+    since = _utc(since) if since else until - DEFAULT_RANGE
+    if since > until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    if until - since > timedelta(days=settings.action_stats_retention_days):
+        raise HTTPException(
+            status_code=400,
+            detail=f"The time range exceeds the statistics retention of {settings.action_stats_retention_days} days",
+        )
+    fields = group_by or [StatsField.NAME, StatsField.STATUS]
+    totals = get_action_stats().rollup(
+        since,
+        until,
+        [field.value for field in fields],
+        name=name,
+        status=status.value if status else None,
+        owner=owner,
+    )
+    return [
+        ActionStatsOut(**dict(zip(fields, key, strict=True)), count=count)
+        for key, count in sorted(totals.items())
+    ]
@@ -1,8 +1,11 @@
+import asyncio
+import contextlib
 import logging
 import logging.config
 import socket
 from contextlib import asynccontextmanager
 from importlib.metadata import version
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 from fastapi import APIRouter as FastAPIAPIRouter
@@ -18,6 +21,7 @@ from automated_actions.api import (
     initialize_auth_components,
 )
 from automated_actions.config import settings
+from automated_actions.db.models import User
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
@@ -25,6 +29,32 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 
+async def flush_user_updates(interval: float) -> None:
+    """Periodically write the queued user updates to the database."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(User.flush_allowed_actions)
+        except Exception:
+            log.exception("Failed to flush queued user updates")
+
+
+async def load_token_revocations(app: FastAPI) -> asyncio.Task[None] | None:
+    """Load the token revocation list and return its periodic refresh task."""
+    token_auth = getattr(app.state, "token", None)
+    if not token_auth or not (revocations := token_auth.revocations):
+        return None
+    log.info("Lifespan: Loading the token revocation list...")
+    await asyncio.to_thread(revocations.refresh)
+    if settings.token_revocation_refresh_interval_secs <= 0:
+        return None
+    return asyncio.create_task(
+        revocations.refresh_periodically(
+            settings.token_revocation_refresh_interval_secs
+        )
+    )
+
+
 @asynccontextmanager
 async def app_lifespan_manager(
     app: FastAPI,
@@ -34,15 +64,26 @@ async def app_lifespan_manager(
     run_router_config: bool = True,
 ) -> AsyncGenerator[None]:
     log.info("Lifespan: Application startup sequence initiated.")
+    start = perf_counter()
 
     if run_db_init:
         log.info("Lifespan: Executing database tables creation...")
         create_db_tables()
 
+    user_flusher = None
+    if run_db_init and settings.user_cache_flush_interval_secs > 0:
+        user_flusher = asyncio.create_task(
+            flush_user_updates(settings.user_cache_flush_interval_secs)
+        )
+
     if run_auth_init:
         log.info("Lifespan: Initializing authentication components...")
         await initialize_auth_components(app)
 
+    revocations_refresher = None
+    if run_db_init:
+        revocations_refresher = await load_token_revocations(app)
+
     # Router-Konfiguration und -Einbindung
     default_router = FastAPIAPIRouter()
     hostname = socket.gethostname()
@@ -58,10 +99,27 @@ async def app_lifespan_manager(
         configure_routers(app)
         app.include_router(api_router, prefix="/api")
 
-    log.info("Lifespan: Application startup complete.")
+    log.info(
+        f"Lifespan: Application startup complete in {perf_counter() - start:.2f}s."
+    )
     yield
     log.info("Lifespan: Application shutdown sequence initiated.")
 
+    if revocations_refresher:
+        revocations_refresher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await revocations_refresher
+
+    if user_flusher:
+        user_flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await user_flusher
+        log.info("Lifespan: Writing queued user updates...")
+        await asyncio.to_thread(User.flush_allowed_actions)
+
+    if authz := getattr(app.state, "authz", None):
+        await authz.aclose()
+
 
 def create_app(
     *,
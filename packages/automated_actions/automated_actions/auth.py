@@ -1,20 +1,40 @@
+import asyncio
+import contextlib
+import hashlib
+import json
 import logging
 import re
+import time
+from abc import ABC, abstractmethod
 from datetime import UTC
 from datetime import datetime as dt
 from json import JSONDecodeError
 from typing import TYPE_CHECKING, Any, Protocol, Self
 from urllib.parse import quote
+from uuid import uuid4
 
 import httpxyz as httpx
 import jwt
 from fastapi import APIRouter, HTTPException, Request, Response, status
-from itsdangerous import URLSafeTimedSerializer
+from fastapi.routing import APIRoute
+from itsdangerous import BadData, URLSafeTimedSerializer
 from pydantic import BaseModel
 from starlette.responses import RedirectResponse
 
+from automated_actions.cache import TTLCache
+from automated_actions.executor import run_blocking
+from automated_actions.metrics import (
+    authz_capability_token,
+    oidc_userinfo_cache,
+    opa_decision_cache,
+    opa_query_duration,
+)
+from automated_actions.permissions import Permission, decide
+
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Mapping
+
+    from starlette.routing import BaseRoute
 
 log = logging.getLogger(__name__)
 
@@ -26,6 +46,7 @@ class AccessToken(BaseModel):
     iss: str  # issuer
     exp: int  # expiration time
     iat: int  # issued at
+    jti: str | None = None  # token ID
 
 
 class UserModelProtocol(Protocol):
@@ -39,6 +60,74 @@ class UserModelProtocol(Protocol):
     def set_allowed_actions(self, allowed_actions: Iterable[str]) -> None: ...
 
 
+class JWKS:
+    """Cached JSON Web Key Set of an OIDC provider.
+
+    The keys are refreshed in the background when a token references an unknown
+    key ID, e.g. after a key rotation, but not more often than every
+    `min_refresh_interval_secs`. Requests with an unknown key ID wait at most
+    `max_wait_secs` for the refresh and are rejected if it doesn't provide the
+    key by then; a slow or failing provider never holds them longer.
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        min_refresh_interval_secs: int = 60,
+        max_wait_secs: float = 0.5,
+    ) -> None:
+        self.jwks_uri = jwks_uri
+        self.min_refresh_interval_secs = min_refresh_interval_secs
+        self.max_wait_secs = max_wait_secs
+        self.keys: dict[str, jwt.PyJWK] = {}
+        self._last_refresh: float | None = None
+        self._refresh: asyncio.Task[None] | None = None
+
+    async def refresh(self) -> None:
+        """Fetch the current key set from the OIDC provider."""
+        async with httpx.AsyncClient() as client:
+            response = await client.get(self.jwks_uri, timeout=5)
+        response.raise_for_status()
+        jwk_set = jwt.PyJWKSet.from_dict(response.json())
+        self.keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+        self._last_refresh = time.monotonic()
+
+    def _schedule_refresh(self) -> asyncio.Task[None] | None:
+        """Start a background refresh unless one is running or was started recently."""
+        if self._refresh and not self._refresh.done():
+            return self._refresh
+        now = time.monotonic()
+        if (
+            self._last_refresh is not None
+            and now - self._last_refresh < self.min_refresh_interval_secs
+        ):
+            return None
+        # rate limit failed refreshes as well
+        self._last_refresh = now
+        self._refresh = asyncio.create_task(self.refresh())
+        self._refresh.add_done_callback(_log_refresh_error)
+        return self._refresh
+
+    async def get_signing_key(self, kid: str) -> jwt.PyJWK:
+        if key := self.keys.get(kid):
+            return key
+
+        # unknown key ID: refresh the key set in the background (once for all
+        # requests) and wait for it only briefly
+        if (refresh := self._schedule_refresh()) and self.max_wait_secs > 0:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(asyncio.shield(refresh), self.max_wait_secs)
+
+        if key := self.keys.get(kid):
+            return key
+        raise jwt.InvalidKeyError(f"Unknown signing key ID: {kid}")
+
+
+def _log_refresh_error(task: asyncio.Task[None]) -> None:
+    if not task.cancelled() and (exc := task.exception()):
+        log.error(f"Failed to refresh the JSON Web Key Set: {exc}")
+
+
 class OpenIDConnect[UserModel: UserModelProtocol]:
     def __init__(
         self,
@@ -54,6 +143,9 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
         scope: str = "openid email profile",
         enforce_https: bool = True,
         user_model: type[UserModel],
+        userinfo_cache_ttl_secs: int = 300,
+        userinfo_cache_size: int = 1024,
+        jwks: JWKS | None = None,
     ) -> None:
         self.issuer = issuer
         self.client_id = client_id
@@ -61,6 +153,8 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
         self.scope = scope
         self.enforce_https = enforce_https
         self.user_model = user_model
+        # verify the access tokens locally if the key set is available
+        self.jwks = jwks
 
         self.authorization_endpoint = authorization_endpoint
         self.token_endpoint = token_endpoint
@@ -91,6 +185,13 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
         self.session_serializer = URLSafeTimedSerializer(session_secret)
         self.session_timeout_secs = session_timeout_secs
 
+        # validated access tokens, keyed by the token hash
+        self.userinfo_cache = TTLCache[str, AccessToken](
+            maxsize=userinfo_cache_size, ttl=userinfo_cache_ttl_secs
+        )
+        # in-flight userinfo lookups, to coalesce concurrent requests
+        self._userinfo_lookups: dict[str, asyncio.Task[AccessToken]] = {}
+
     @classmethod
     async def create(
         cls,
@@ -103,6 +204,9 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
         scope: str = "openid email profile",
         enforce_https: bool = True,
         user_model: type[UserModel],
+        userinfo_cache_ttl_secs: int = 300,
+        userinfo_cache_size: int = 1024,
+        verify_tokens_locally: bool = False,
     ) -> OpenIDConnect[UserModel]:
         async with httpx.AsyncClient() as client:
             res = await client.get(
@@ -111,6 +215,11 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
         res.raise_for_status()
         endpoints: dict[str, str] = res.json()
 
+        jwks = None
+        if verify_tokens_locally:
+            jwks = JWKS(endpoints["jwks_uri"])
+            await jwks.refresh()
+
         return cls(
             issuer=issuer,
             client_id=client_id,
@@ -123,6 +232,9 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
             scope=scope,
             enforce_https=enforce_https,
             user_model=user_model,
+            userinfo_cache_ttl_secs=userinfo_cache_ttl_secs,
+            userinfo_cache_size=userinfo_cache_size,
+            jwks=jwks,
         )
 
     async def __call__(self, request: Request) -> UserModel:
@@ -139,7 +251,7 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
             # already authenticated
             try:
                 access_token = self.session_serializer.loads(session_token)
-                return self.get_user_info(access_token)
+                return await self.get_user_info(access_token)
             except Exception:
                 log.exception("Access token cannot be loaded or is outdated")
                 raise enforce_login from None
@@ -189,13 +301,47 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
         response.delete_cookie("session")
         return response
 
-    def get_user_info(self, access_token: str) -> UserModel:
-        # Check against the userinfo endpoint
-        response = httpx.get(
-            self.userinfo_endpoint,
-            headers={"Authorization": f"Bearer {access_token}"},
-            timeout=5,
+    async def get_user_info(self, access_token: str) -> UserModel:
+        token = await self.validate_access_token(access_token)
+        # loading an uncached user reads (and may write) DynamoDB
+        return await run_blocking(
+            self.user_model.load,
+            username=token.preferred_username,
+            name=token.name,
+            email=token.email,
         )
+
+    async def validate_access_token(self, access_token: str) -> AccessToken:
+        """Validate the access token against the userinfo endpoint.
+
+        Validated tokens are cached (keyed by the token hash) until they expire
+        at the latest, and concurrent lookups for the same token share one call.
+        With a JWKS, the token signature is verified locally instead.
+        """
+        if self.jwks:
+            return await self._verify_locally(self.jwks, access_token)
+
+        key = hashlib.sha256(access_token.encode()).hexdigest()
+        if token := self.userinfo_cache.get(key):
+            oidc_userinfo_cache.labels(result="hit").inc()
+            return token
+
+        oidc_userinfo_cache.labels(result="miss").inc()
+        if key not in self._userinfo_lookups:
+            lookup = asyncio.create_task(self._fetch_userinfo(key, access_token))
+            lookup.add_done_callback(lambda _: self._userinfo_lookups.pop(key, None))
+            self._userinfo_lookups[key] = lookup
+        # shield the shared lookup from the cancellation of a single request
+        return await asyncio.shield(self._userinfo_lookups[key])
+
+    async def _fetch_userinfo(self, key: str, access_token: str) -> AccessToken:
+        # Check against the userinfo endpoint
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                self.userinfo_endpoint,
+                headers={"Authorization": f"Bearer {access_token}"},
+                timeout=5,
+            )
         response.raise_for_status()
         token = AccessToken(
             **jwt.decode(
@@ -207,53 +353,166 @@ class OpenIDConnect[UserModel: UserModelProtocol]:
                 },
             )
         )
-        return self.user_model.load(
-            username=token.preferred_username,
-            name=token.name,
-            email=token.email,
+        self.userinfo_cache.set(key, token, ttl=token.exp - time.time())
+        return token
+
+    async def _verify_locally(self, jwks: JWKS, access_token: str) -> AccessToken:
+        header = jwt.get_unverified_header(access_token)
+        signing_key = await jwks.get_signing_key(header.get("kid", ""))
+        return AccessToken(
+            **jwt.decode(
+                access_token,
+                signing_key.key,
+                algorithms=[signing_key.algorithm_name],
+                issuer=self.issuer,
+                options={
+                    "require": ["exp", "iat", "iss"],
+                    "verify_exp": True,
+                    "verify_iss": True,
+                    # access tokens are issued for the OIDC provider's audience
+                    "verify_aud": False,
+                },
+            )
+        )
+
+
+class CapabilityToken:
+    """Short-lived, signed token with all permissions of a user.
+
+    Issued as a cookie after a successful authorization. Requests presenting a
+    valid token are authorized locally by any API replica. The rate limits are
+    still checked for every request.
+    """
+
+    cookie = "capability"
+
+    def __init__(self, secret: str, ttl_secs: int, *, secure: bool = True) -> None:
+        self.serializer = URLSafeTimedSerializer(secret, salt="capability")
+        self.ttl_secs = ttl_secs
+        self.secure = secure
+        # compiled permissions of recently seen tokens
+        self._permissions = TTLCache[str, tuple[str, list[Permission]]](
+            maxsize=1024, ttl=ttl_secs
         )
 
+    def dumps(self, username: str, permissions: list[dict[str, Any]]) -> str:
+        return self.serializer.dumps({"sub": username, "permissions": permissions})
+
+    def loads(self, token: str, username: str) -> list[Permission] | None:
+        """Return the permissions of a valid, not expired token of the user."""
+        if (cached := self._permissions.get(token)) is None:
+            try:
+                data, issued_at = self.serializer.loads(
+                    token, max_age=self.ttl_secs, return_timestamp=True
+                )
+            except BadData:
+                return None
+            cached = (
+                data["sub"],
+                [Permission.compile(permission) for permission in data["permissions"]],
+            )
+            # verified tokens are cached until they expire
+            remaining = self.ttl_secs - (dt.now(UTC) - issued_at).total_seconds()
+            self._permissions.set(token, cached, ttl=remaining)
+        sub, permissions = cached
+        return permissions if sub == username else None
+
+    def set_cookie(self, response: Response, token: str) -> None:
+        response.set_cookie(
+            key=self.cookie,
+            value=token,
+            max_age=self.ttl_secs,
+            secure=self.secure,
+            httponly=True,
+        )
+
+
+class Authorizer[UserModel: UserModelProtocol](ABC):
+    """FastAPI authorization dependency.
+
+    Subclasses implement the `authorized`, `within_rate_limits`, and `objects`
+    decisions of the `authz` policy.
+    """
 
-class OPA[UserModel: UserModelProtocol]:
     def __init__(
         self,
-        opa_host: str,
         skip_endpoints: list[str] | None = None,
-        package_name: str = "authz",
+        ops_counter: Callable[[str, str], int] | None = None,
+        rate_limited_tags: Iterable[str] = ("Actions",),
+        capability_token: CapabilityToken | None = None,
     ) -> None:
-        self.opa_url = (
-            f"{opa_host.rstrip('/')}/v1/data/{package_name.replace('.', '/')}"
-        )
         self.skip_endpoints = [re.compile(skip) for skip in skip_endpoints or []]
+        # returns the number of recent (username, obj) operations for rate limiting
+        self.ops_counter = ops_counter
+        self.rate_limited_tags = set(rate_limited_tags)
+        self.capability_token = capability_token
 
-    def should_skip_endpoint(self, endpoint: str) -> bool:
-        return any(skip.match(endpoint) for skip in self.skip_endpoints)
-
-    async def query_opa(
-        self, user: UserModel, obj: str, params: dict[str, str]
-    ) -> dict:
-        """Query OPA data endpoint for authorization and other decisions."""
-        data = {"input": user.dump().model_dump()}
-        data["input"]["obj"] = obj
-        data["input"]["params"] = params
-
-        async with httpx.AsyncClient() as client:
-            opa_decision = await client.post(f"{self.opa_url}", json=data, timeout=5)
-
-        if opa_decision.status_code != status.HTTP_200_OK:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"OPA returned unexpected http status code: {opa_decision.status_code}",
+    @abstractmethod
+    async def decide(
+        self,
+        user: UserModel,
+        obj: str,
+        params: dict[str, str],
+        ops_count: int | None = None,
+    ) -> dict[str, Any]:
+        """Return the policy decisions for the user and the requested object."""
+
+    @abstractmethod
+    async def user_permissions(self, user: UserModel) -> list[dict[str, Any]]:
+        """Return all permissions of the user in the format of the policy data."""
+
+    @abstractmethod
+    async def decide_batch(
+        self, user: UserModel, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Return the `authorized` and `within_rate_limits` decisions per item.
+
+        Items are `{"obj", "params", "ops_count"}` dicts (`ops_count` is optional).
+        The decisions are returned in the order of the items.
+        """
+
+    def rate_limited_objects(self, routes: Iterable[BaseRoute]) -> set[str]:
+        """Return the objects (operation IDs) of the rate limited routes."""
+        return {
+            route.operation_id
+            for route in routes
+            if isinstance(route, APIRoute)
+            and route.operation_id
+            and self.rate_limited_tags.intersection(route.tags)
+        }
+
+    async def authorize_batch(
+        self,
+        user: UserModel,
+        items: list[tuple[str, dict[str, str]]],
+        rate_limited_objects: Iterable[str] = (),
+    ) -> list[dict[str, Any]]:
+        """Return the policy decisions for multiple (obj, params) items.
+
+        The operations of every distinct rate limited object are counted once
+        and concurrently.
+        """
+        ops_counts: dict[str, int] = {}
+        if ops_counter := self.ops_counter:
+            objs = sorted({obj for obj, _ in items}.intersection(rate_limited_objects))
+            counts = await asyncio.gather(
+                *(run_blocking(ops_counter, user.username, obj) for obj in objs)
             )
+            ops_counts = dict(zip(objs, counts, strict=True))
+        return await self.decide_batch(
+            user,
+            [
+                {"obj": obj, "params": params}
+                | ({"ops_count": ops_counts[obj]} if obj in ops_counts else {})
+                for obj, params in items
+            ],
+        )
 
-        try:
-            return opa_decision.json().get("result")
-        except JSONDecodeError as e:
-            log.exception("Unable to decode OPA response.")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="OPA returned unexpected result",
-            ) from e
+    async def aclose(self) -> None:  # noqa: B027
+        """Release resources held by the authorizer."""
+
+    def should_skip_endpoint(self, endpoint: str) -> bool:
+        return any(skip.match(endpoint) for skip in self.skip_endpoints)
 
     @staticmethod
     def user_is_authorized(opa_data: dict[str, Any]) -> None:
@@ -272,7 +531,55 @@ class OPA[UserModel: UserModelProtocol]:
                 detail="Action rate limit exceeded!",
             )
 
-    async def __call__(self, request: Request, user: UserModel) -> None:
+    def capability_decision(
+        self,
+        request: Request,
+        user: UserModel,
+        obj: str,
+        params: dict[str, str],
+        ops_count: int | None,
+    ) -> dict[str, Any] | None:
+        """Return the decisions based on the request's capability token, if any.
+
+        Denials aren't final because the permissions may have changed since the
+        token has been issued.
+        """
+        if not self.capability_token or not (
+            token := request.cookies.get(self.capability_token.cookie)
+        ):
+            return None
+        if (permissions := self.capability_token.loads(token, user.username)) is None:
+            authz_capability_token.labels(result="invalid").inc()
+            return None
+        decision = decide(permissions, obj, params, ops_count or 0)
+        if not decision["authorized"]:
+            authz_capability_token.labels(result="denied").inc()
+            return None
+        authz_capability_token.labels(result="authorized").inc()
+        return decision
+
+    async def issue_capability_token(
+        self,
+        user: UserModel,
+        response: Response,
+        permissions: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Set a capability token cookie with the user's permissions.
+
+        Pass the `permissions` if the decision already contains them; they are
+        looked up otherwise.
+        """
+        if not self.capability_token:
+            return
+        if permissions is None:
+            permissions = await self.user_permissions(user)
+        token = self.capability_token.dumps(user.username, permissions)
+        self.capability_token.set_cookie(response, token)
+        authz_capability_token.labels(result="issued").inc()
+
+    async def __call__(
+        self, request: Request, user: UserModel, response: Response | None = None
+    ) -> None:
         # allow endpoints without authorization
         if self.should_skip_endpoint(request.url.path):
             return
@@ -280,19 +587,234 @@ class OPA[UserModel: UserModelProtocol]:
         # check if user is authorized to access endpoint
         params = request.path_params.copy()
         params.update(request.query_params)
-        opa_data = await self.query_opa(
-            user, obj=request["route"].operation_id, params=params
+        route = request["route"]
+        ops_count = None
+        if self.ops_counter and self.rate_limited_tags.intersection(route.tags):
+            ops_count = await run_blocking(
+                self.ops_counter, user.username, route.operation_id
+            )
+        opa_data = self.capability_decision(
+            request, user, obj=route.operation_id, params=params, ops_count=ops_count
         )
+        if opa_data is None:
+            opa_data = await self.decide(
+                user, obj=route.operation_id, params=params, ops_count=ops_count
+            )
+            if opa_data.get("authorized") and response is not None:
+                await self.issue_capability_token(
+                    user, response, opa_data.get("permissions")
+                )
         self.user_is_authorized(opa_data)
         self.user_is_within_rate_limits(opa_data)
         user.set_allowed_actions(allowed_actions=opa_data.get("objects", []))
 
 
+class OPA[UserModel: UserModelProtocol](Authorizer[UserModel]):
+    def __init__(
+        self,
+        opa_host: str,
+        skip_endpoints: list[str] | None = None,
+        package_name: str = "authz",
+        decision_cache_ttl_secs: int = 0,
+        decision_cache_size: int = 1024,
+        ops_counter: Callable[[str, str], int] | None = None,
+        rate_limited_tags: Iterable[str] = ("Actions",),
+        capability_token: CapabilityToken | None = None,
+    ) -> None:
+        super().__init__(
+            skip_endpoints=skip_endpoints,
+            ops_counter=ops_counter,
+            rate_limited_tags=rate_limited_tags,
+            capability_token=capability_token,
+        )
+        self.opa_url = (
+            f"{opa_host.rstrip('/')}/v1/data/{package_name.replace('.', '/')}"
+        )
+        # one pooled client for all OPA queries; closed via `aclose`
+        self.client = httpx.AsyncClient(timeout=5)
+        # `authorized` and `objects` decisions keyed by the policy inputs (see
+        # `_decision_key`). `within_rate_limits` depends on the user's past
+        # actions and is never cached.
+        self.decision_cache = TTLCache[str, dict[str, Any]](
+            maxsize=decision_cache_size, ttl=decision_cache_ttl_secs
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def query_opa(
+        self, user: UserModel, obj: str, params: dict[str, str], rule: str = ""
+    ) -> Any:
+        """Query OPA data endpoint for authorization and other decisions.
+
+        Without a `rule`, the whole package document is returned.
+        """
+        return await self._query(self._opa_input(user, obj, params), rule=rule)
+
+    @staticmethod
+    def _opa_input(user: UserModel, obj: str, params: dict[str, str]) -> dict:
+        data = {"input": user.dump().model_dump()}
+        data["input"]["obj"] = obj
+        data["input"]["params"] = params
+        return data
+
+    @staticmethod
+    def _decision_key(username: str, obj: str, params: dict[str, str]) -> str:
+        """Return the decision cache key: a digest of the inputs the policies use.
+
+        The other user attributes in the OPA input, e.g., `updated_at` and
+        `allowed_actions`, change without affecting the decisions, and the
+        `ops_count` only affects the never cached `within_rate_limits`.
+        """
+        return hashlib.sha256(
+            json.dumps([username, obj, params], sort_keys=True).encode()
+        ).hexdigest()
+
+    async def _query(self, data: dict[str, Any], rule: str = "") -> Any:
+        url = f"{self.opa_url}/{rule}" if rule else self.opa_url
+        with opa_query_duration.labels(rule=rule or "all").time():
+            opa_decision = await self.client.post(url, json=data)
+
+        if opa_decision.status_code != status.HTTP_200_OK:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"OPA returned unexpected http status code: {opa_decision.status_code}",
+            )
+
+        try:
+            return opa_decision.json().get("result")
+        except JSONDecodeError as e:
+            log.exception("Unable to decode OPA response.")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="OPA returned unexpected result",
+            ) from e
+
+    async def decide(
+        self,
+        user: UserModel,
+        obj: str,
+        params: dict[str, str],
+        ops_count: int | None = None,
+    ) -> dict[str, Any]:
+        """Return the OPA decisions, served from the decision cache if possible.
+
+        On a cache hit, only `within_rate_limits` is queried, and not at all if
+        the user isn't authorized anyway. The decisions include the user's
+        `permissions` for issuing a capability token without another query.
+        """
+        data = self._opa_input(user, obj, params)
+        key = self._decision_key(user.username, obj, params)
+        if ops_count is not None:
+            data["input"]["ops_count"] = ops_count
+
+        if (decision := self.decision_cache.get(key)) is None:
+            opa_decision_cache.labels(result="miss").inc()
+            opa_data = await self._query(data) or {}
+            decision = {
+                "authorized": opa_data.get("authorized"),
+                "objects": opa_data.get("objects", []),
+            }
+            # the whole package document includes the user's permissions
+            if "permissions" in opa_data:
+                decision["permissions"] = opa_data["permissions"]
+            self.decision_cache.set(key, decision)
+            return opa_data
+
+        opa_decision_cache.labels(result="hit").inc()
+        if not decision["authorized"]:
+            return decision
+        return decision | {
+            "within_rate_limits": await self._query(data, rule="within_rate_limits")
+        }
+
+    async def user_permissions(self, user: UserModel) -> list[dict[str, Any]]:
+        data = {"input": user.dump().model_dump()}
+        return await self._query(data, rule="permissions") or []
+
+    async def decide_batch(
+        self, user: UserModel, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Return the OPA decisions of all items in a single `batch` query."""
+        data = {"input": user.dump().model_dump()}
+        data["input"]["items"] = items
+        return await self._query(data, rule="batch") or []
+
+
+class TokenRevocationList:
+    """In-process copy of the revoked bearer token IDs (`jti`).
+
+    Checking a token is a dict lookup without any network call. The first
+    refresh loads all revoked tokens from the `load` callable; the periodic
+    ones load only the tokens revoked since the previous refresh. Tokens
+    revoked by another API process are rejected after the next refresh.
+    """
+
+    # reload a bit before the previous refresh, for the clock skew between API
+    # processes and the replication lag of the storage
+    REFRESH_OVERLAP_SECS = 60
+
+    def __init__(
+        self,
+        load: Callable[[float | None], Mapping[str, float]],
+        store: Callable[[str, str, dt], None],
+    ) -> None:
+        # returns the expiration timestamps of the tokens revoked since a
+        # timestamp (all with None), by ID
+        self.load = load
+        # persists a revoked (jti, username, expiration)
+        self.store = store
+        # replaced, never mutated, so lookups need no lock
+        self._ids: dict[str, float] = {}
+        self._refreshed_at: float | None = None
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def refresh(self) -> None:
+        started = time.time()
+        revoked = self.load(
+            None
+            if self._refreshed_at is None
+            else self._refreshed_at - self.REFRESH_OVERLAP_SECS
+        )
+        now = time.time()
+        # expired tokens are rejected anyway
+        self._ids = {
+            jti: expires_at
+            for jti, expires_at in (self._ids | dict(revoked)).items()
+            if expires_at > now
+        }
+        self._refreshed_at = started
+
+    async def refresh_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                log.exception("Failed to refresh the token revocation list")
+
+    def revoke(self, jti: str, username: str, expires_at: dt) -> None:
+        self.store(jti, username, expires_at)
+        self._ids = {**self._ids, jti: expires_at.timestamp()}
+
+
 class BearerTokenAuth[UserModel: UserModelProtocol]:
-    def __init__(self, issuer: str, secret: str, user_model: type[UserModel]) -> None:
+    def __init__(
+        self,
+        issuer: str,
+        secret: str,
+        user_model: type[UserModel],
+        revocations: TokenRevocationList | None = None,
+    ) -> None:
         self.issuer = issuer
         self.secret = secret
         self.user_model = user_model
+        self.revocations = revocations
 
     async def __call__(self, request: Request) -> UserModel | None:
         if authorization := request.headers.get("Authorization"):
@@ -307,26 +829,34 @@ class BearerTokenAuth[UserModel: UserModelProtocol]:
             # extract the token from the header
             token = authorization.split(" ")[1]
             try:
-                return self.get_user_info(token)
+                # loading an uncached user reads (and may write) DynamoDB
+                return await run_blocking(self.get_user_info, token)
             except Exception:
                 log.exception("Access token cannot be loaded or is not valid anymore")
 
         return None
 
-    def get_user_info(self, encoded_token: str) -> UserModel:
-        token = AccessToken(
+    def decode_token(
+        self, encoded_token: str, *, verify_exp: bool = True
+    ) -> AccessToken:
+        return AccessToken(
             **jwt.decode(
                 encoded_token,
                 self.secret,
                 algorithms="HS256",
                 options={
                     "require": ["exp", "iat", "iss"],
-                    "verify_exp": True,
+                    "verify_exp": verify_exp,
                     "verify_iss": True,
                 },
                 issuer=self.issuer,
             )
         )
+
+    def get_user_info(self, encoded_token: str) -> UserModel:
+        token = self.decode_token(encoded_token)
+        if self.revocations is not None and token.jti and token.jti in self.revocations:
+            raise ValueError(f"Token {token.jti} has been revoked")
         return self.user_model.load(
             username=token.preferred_username,
             name=token.name,
@@ -342,7 +872,31 @@ class BearerTokenAuth[UserModel: UserModelProtocol]:
                 "iss": self.issuer,
                 "exp": expiration,
                 "iat": dt.now(tz=UTC),
+                "jti": str(uuid4()),
             },
             self.secret,
             algorithm="HS256",
         )
+
+    def revoke_token(self, encoded_token: str) -> str:
+        """Revoke a token issued by `create_token` and return its ID."""
+        if self.revocations is None:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Token revocation is not available",
+            )
+        try:
+            token = self.decode_token(encoded_token, verify_exp=False)
+        except jwt.InvalidTokenError, ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token"
+            ) from None
+        if not token.jti:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Token has no ID and can't be revoked; rotate the token secret instead",
+            )
+        self.revocations.revoke(
+            token.jti, token.preferred_username, dt.fromtimestamp(token.exp, tz=UTC)
+        )
+        return token.jti
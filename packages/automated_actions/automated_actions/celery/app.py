@@ -54,6 +54,7 @@ app = Celery(
         },
     },
     broker_connection_retry_on_startup=True,
+    task_always_eager=settings.task_always_eager,
     worker_enable_remote_control=False,
     worker_log_format="%(asctime)s [%(levelname)s] %(name)s %(message)s",
     # support pydantic models
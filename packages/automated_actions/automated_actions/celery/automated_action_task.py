@@ -2,11 +2,17 @@ import logging
 from time import time
 from typing import TYPE_CHECKING, Any
 
+from celery.exceptions import Ignore
 from hvac.exceptions import VaultError
 from kubernetes.client.exceptions import ApiException
+from pynamodb.exceptions import UpdateError
 
 from automated_actions.celery.metrics import action_elapsed_time
-from automated_actions.db.models import ActionStatus
+from automated_actions.db.models import (
+    ActionStatus,
+    StatusTransitionError,
+    get_action_manager,
+)
 from celery import Task
 
 if TYPE_CHECKING:
@@ -20,13 +26,27 @@ class AutomatedActionTask(Task):
     default_retry_delay = 5
     max_retries = 3
 
-    def before_start(  # noqa: PLR6301
+    def before_start(
         self,
-        task_id: str,  # noqa: ARG002
+        task_id: str,
         args: tuple,  # noqa: ARG002
         kwargs: dict,
     ) -> None:
-        kwargs["action"].set_status(ActionStatus.RUNNING)
+        # the API server stores the action and enqueues the task concurrently;
+        # wait for the action record or skip the task if it never shows up
+        try:
+            kwargs["action"].start(attempt=self.request.retries)
+        except StatusTransitionError as exc:
+            # a duplicate (redelivered) task or a cancelled action
+            log.warning("skipping the task: %s", exc)
+            raise Ignore from exc
+        except UpdateError as exc:
+            if exc.cause_response_code != "ConditionalCheckFailedException":
+                raise
+            if self.request.retries < self.max_retries:
+                raise self.retry(countdown=self.default_retry_delay) from exc
+            log.warning("action %s not found, skipping the task", task_id)
+            raise Ignore from exc
         log.info("status=%s", ActionStatus.RUNNING)
 
     def on_success(  # noqa: PLR6301
@@ -37,11 +57,8 @@ class AutomatedActionTask(Task):
         kwargs: dict,
     ) -> None:
         result = "ok"
-        kwargs["action"].set_final_state(
-            status=ActionStatus.SUCCESS,
-            result=result,
-            task_args=_task_kwargs_to_store(kwargs),
-        )
+        if not _set_final_state(kwargs, ActionStatus.SUCCESS, result):
+            return
         log.info(
             "status=%s - %s",
             ActionStatus.SUCCESS,
@@ -61,11 +78,8 @@ class AutomatedActionTask(Task):
         einfo: ExceptionInfo,  # noqa: ARG002
     ) -> None:
         result = str(exc)
-        kwargs["action"].set_final_state(
-            status=ActionStatus.FAILURE,
-            result=result,
-            task_args=_task_kwargs_to_store(kwargs),
-        )
+        if not _set_final_state(kwargs, ActionStatus.FAILURE, result):
+            return
         log.error(
             "status=%s - %s",
             ActionStatus.FAILURE,
@@ -76,15 +90,33 @@ class AutomatedActionTask(Task):
             name=kwargs["action"].name, status=ActionStatus.FAILURE
         ).observe(amount=elapsed_time)
 
-    def on_retry(  # noqa: PLR6301
+    def on_retry(
         self,
         exc: Exception,
         task_id: str,  # noqa: ARG002
         args: tuple,  # noqa: ARG002
-        kwargs: dict,  # noqa: ARG002
+        kwargs: dict,
         einfo: ExceptionInfo,  # noqa: ARG002
     ) -> None:
         log.debug("retrying due to %s", exc)
+        try:
+            kwargs["action"].record_retry(attempt=self.request.retries, error=str(exc))
+        except UpdateError as update_exc:
+            # e.g., waiting for the action to be stored, see before_start
+            log.debug("unable to record the retry: %s", update_exc)
+
+
+def _set_final_state(kwargs: dict, status: ActionStatus, result: str) -> bool:
+    """Store and count the final state of the action unless it has been cancelled."""
+    try:
+        kwargs["action"].set_final_state(
+            status=status, result=result, task_args=_task_kwargs_to_store(kwargs)
+        )
+    except StatusTransitionError as exc:
+        log.warning("discarding the result %s - %s: %s", status, result, exc)
+        return False
+    get_action_manager().count_final(kwargs["action"], status)
+    return True
 
 
 def _task_kwargs_to_store(kwargs: dict) -> dict:
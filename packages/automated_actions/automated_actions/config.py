@@ -1,3 +1,6 @@
+from typing import Literal, Self
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -41,12 +44,44 @@ class Settings(BaseSettings):
     broker_aws_secret_access_key: str = "localstack"  # noqa: S105
     retries: int | None = None
     retry_delay: int = 10
+    # run the tasks in the API process instead of sending them to the workers
+    task_always_eager: bool = False
 
     # db config
     dynamodb_url: str = "http://localhost:4566"
     dynamodb_aws_region: str = "us-east-1"
     dynamodb_aws_access_key_id: str = "localstack"
     dynamodb_aws_secret_access_key: str = "localstack"  # noqa: S105
+    # check (and create) the tables on API startup; disable it if they are
+    # created by the migrate job
+    db_create_tables: bool = True
+    # threads for the blocking DynamoDB and SQS calls of an API process
+    db_threads: int = 64
+    user_cache_ttl_secs: int = 60
+    user_cache_size: int = 1024
+    user_cache_flush_interval_secs: int = 10
+    action_status_index_enabled: bool = False
+    # spread the owner index over this many keys per owner; 0 or 1 disables it
+    action_owner_shards: int = 0
+    # storage of the actions, their rate limit counters and statistics; sqlite
+    # and memory are meant for local runs and tests
+    action_backend: Literal["dynamodb", "sqlite", "memory"] = "dynamodb"
+    action_sqlite_path: str = "automated-actions.db"
+    action_detail_cache_ttl_secs: int = 3600
+    action_detail_cache_size: int = 4096
+    # finished actions are deleted (TTL) this many days after their last
+    # update; 0 keeps them forever
+    action_retention_days: int = 0
+    # hourly action statistics are deleted (TTL) after this many days
+    action_stats_retention_days: int = 400
+
+    # archive config
+    archive_s3_url: str = "http://localhost:4566"
+    archive_aws_region: str = "us-east-1"
+    archive_aws_access_key_id: str = "localstack"
+    archive_aws_secret_access_key: str = "localstack"  # noqa: S105
+    archive_bucket: str = "automated-actions-archive"
+    archive_lead_days: int = 2
 
     # OIDC config
     oidc_issuer: str = "https://auth.redhat.com/auth/realms/EmployeeIDP"
@@ -55,9 +90,22 @@ class Settings(BaseSettings):
     session_secret: str
     session_timeout_secs: int = 3600
     token_secret: str
+    token_revocation_refresh_interval_secs: int = 30
+    oidc_userinfo_cache_ttl_secs: int = 300
+    oidc_userinfo_cache_size: int = 1024
+    oidc_verify_tokens_locally: bool = False
 
     # AuthZ
+    authz_backend: Literal["opa", "embedded"] = "opa"
+    authz_roles_paths: list[str] = []
+    authz_roles_reload_interval_secs: int = 10
     opa_host: str = "http://opa:8181"
+    opa_decision_cache_ttl_secs: int = 0
+    opa_decision_cache_size: int = 1024
+    # lifetime of the signed capability tokens issued after a successful
+    # authorization; 0 disables them
+    authz_capability_token_ttl_secs: int = 0
+    rate_limit_window_secs: int = 3600
 
     # worker metrics config
     worker_metrics_port: int = 8000
@@ -78,5 +126,15 @@ class Settings(BaseSettings):
         ExternalResourceElastiCacheConfig()
     )
 
+    @model_validator(mode="after")
+    def check_action_backend(self) -> Self:
+        # the workers would never see the actions of the API process
+        if self.action_backend == "memory" and not self.task_always_eager:
+            raise ValueError(
+                "The memory action backend isn't shared with the worker processes; "
+                "use the sqlite backend or set AA_TASK_ALWAYS_EAGER"
+            )
+        return self
+
 
 settings = Settings()
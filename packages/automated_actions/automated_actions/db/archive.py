@@ -0,0 +1,141 @@
+"""Archive of expired actions.
+
+With `AA_ACTION_RETENTION_DAYS` set, finished actions expire that many days
+after their last update and DynamoDB deletes them (time to live). Before
+they expire, the archiver
+
+    python -m automated_actions.db.archive
+
+writes them as gzipped JSON lines to the `AA_ARCHIVE_BUCKET` S3 bucket,
+partitioned by the date of their last update:
+
+    actions/date=<updated_at date>/expires-<expires_at date>.jsonl.gz
+
+Run it at least once a day. Each run archives the actions expiring within the
+next `AA_ARCHIVE_LEAD_DAYS` days that haven't been archived yet, so a few
+failed runs don't lose actions.
+"""
+
+import gzip
+import logging
+from collections import defaultdict
+from datetime import UTC, date, timedelta
+from datetime import datetime as dt
+from typing import Any
+
+import boto3
+from botocore.exceptions import ClientError
+
+from automated_actions.config import settings
+from automated_actions.db.models import Action, ActionSchemaOut
+
+log = logging.getLogger(__name__)
+
+PREFIX = "actions"
+
+
+def archive_key(updated: date, expires: date) -> str:
+    return f"{PREFIX}/date={updated.isoformat()}/expires-{expires.isoformat()}.jsonl.gz"
+
+
+class ActionArchive:
+    """Gzipped JSON lines files of actions in an S3 bucket."""
+
+    def __init__(self, client: Any, bucket: str) -> None:
+        self.client = client
+        self.bucket = bucket
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") == "404":
+                return False
+            raise
+        return True
+
+    def write(self, key: str, actions: list[ActionSchemaOut]) -> None:
+        body = "".join(f"{action.model_dump_json()}\n" for action in actions)
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=gzip.compress(body.encode()),
+            ContentType="application/gzip",
+        )
+
+    def read(self, updated: date) -> list[ActionSchemaOut]:
+        """Return the archived actions last updated on the given date."""
+        actions: list[ActionSchemaOut] = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self.bucket, Prefix=f"{PREFIX}/date={updated.isoformat()}/"
+        ):
+            for obj in page.get("Contents", []):
+                body = self.client.get_object(Bucket=self.bucket, Key=obj["Key"])
+                actions.extend(
+                    ActionSchemaOut.model_validate_json(line)
+                    for line in gzip.decompress(body["Body"].read()).splitlines()
+                    if line
+                )
+        return actions
+
+
+def get_action_archive() -> ActionArchive:
+    """Get the action archive."""
+    return ActionArchive(
+        boto3.client(
+            "s3",
+            endpoint_url=settings.archive_s3_url,
+            region_name=settings.archive_aws_region,
+            aws_access_key_id=settings.archive_aws_access_key_id,
+            aws_secret_access_key=settings.archive_aws_secret_access_key,
+        ),
+        settings.archive_bucket,
+    )
+
+
+def archive_expiring_actions(
+    archive: ActionArchive, today: date, lead_days: int, retention_days: int
+) -> int:
+    """Archive the actions expiring within `lead_days` days after `today`.
+
+    An expiry date is archived at once: all its actions have been finished
+    at least `retention_days - lead_days` days ago and none has expired yet.
+    Already archived expiry dates are skipped. Returns the number of
+    archived actions.
+    """
+    if retention_days <= lead_days:
+        raise ValueError("The retention period must be longer than the lead time")
+    start = dt.combine(today + timedelta(days=1), dt.min.time(), tzinfo=UTC)
+    end = start + timedelta(days=lead_days)
+    groups: defaultdict[tuple[date, date], list[ActionSchemaOut]] = defaultdict(list)
+    for action in Action.scan(Action.expires_at.between(start, end)):
+        # `between` includes the end
+        if action.expires_at >= end:
+            continue
+        updated = dt.fromtimestamp(action.updated_at, UTC).date()
+        groups[updated, action.expires_at.date()].append(action.dump())
+
+    archived = 0
+    for (updated, expires), actions in sorted(groups.items()):
+        key = archive_key(updated, expires)
+        if archive.exists(key):
+            continue
+        archive.write(key, actions)
+        log.info(f"Archived {len(actions)} actions to {key}")
+        archived += len(actions)
+    return archived
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if not settings.action_retention_days:
+        log.info("AA_ACTION_RETENTION_DAYS isn't set, nothing to archive")
+    else:
+        count = archive_expiring_actions(
+            get_action_archive(),
+            today=dt.now(UTC).date(),
+            lead_days=settings.archive_lead_days,
+            retention_days=settings.action_retention_days,
+        )
+        log.info(f"Archived {count} actions")
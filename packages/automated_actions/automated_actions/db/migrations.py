@@ -0,0 +1,252 @@
+"""DynamoDB schema migrations.
+
+New tables are created with all their indexes and their time to live on
+startup (see `AA_DB_CREATE_TABLES`). Missing tables are created and existing
+tables are migrated by running
+
+    python -m automated_actions.db.migrations
+
+e.g., as a `AA_START_MODE=migrate` job before rolling out a new version.
+
+The migrations are idempotent; run them again after all API and worker
+instances have been upgraded to fix items written by previous versions in
+the meantime.
+
+Indexes the models no longer have, e.g., the `status-index` replaced by the
+`status-shard-index`, aren't deleted: previous versions may still query
+them during a rollout. Delete them once all instances have been upgraded;
+DynamoDB keeps writing them until then.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from time import sleep
+from typing import TYPE_CHECKING
+
+from pynamodb.exceptions import UpdateError
+
+from automated_actions.config import settings
+from automated_actions.db.models import ALL_TABLES, FINAL_STATUSES, Action
+from automated_actions.db.models._action import (
+    owner_shard_key,
+    owner_status_key,
+    status_shard_key,
+)
+
+if TYPE_CHECKING:
+    from pynamodb.expressions.update import Action as PynamoAction
+    from pynamodb.models import Model
+
+log = logging.getLogger(__name__)
+
+INDEX_POLL_INTERVAL_SECS = 10
+
+
+def _create_table(model: type[Model]) -> bool:
+    if model.exists():
+        return False
+    log.info(f"Creating table {model.Meta.table_name}...")
+    model.create_table(wait=True)
+    log.info(f"Table {model.Meta.table_name} created.")
+    return True
+
+
+def create_tables(models: list[type[Model]] = ALL_TABLES) -> list[str]:
+    """Create the tables of the models that do not exist.
+
+    The tables are checked and created concurrently. Returns the names of
+    the created tables.
+    """
+    with ThreadPoolExecutor(max_workers=max(len(models), 1)) as executor:
+        created = list(executor.map(_create_table, models))
+    return [
+        model.Meta.table_name
+        for model, was_created in zip(models, created, strict=True)
+        if was_created
+    ]
+
+
+def _index_status(model: type[Model], index_name: str) -> str | None:
+    for index in model.describe_table().get("GlobalSecondaryIndexes", []):
+        if index["IndexName"] == index_name:
+            return index["IndexStatus"]
+    return None
+
+
+def create_missing_indexes(model: type[Model]) -> list[str]:
+    """Create the global secondary indexes of the model missing in its table.
+
+    DynamoDB builds only one index per table at a time, therefore this waits
+    until each index is active before creating the next one.
+    """
+    created = []
+    for index in model._get_schema()["global_secondary_indexes"]:  # noqa: SLF001
+        name = index["index_name"]
+        if _index_status(model, name) is not None:
+            continue
+        log.info(f"Creating index {name} of table {model.Meta.table_name}...")
+        model._get_connection().connection.dispatch(  # noqa: SLF001
+            "UpdateTable",
+            {
+                "TableName": model.Meta.table_name,
+                "AttributeDefinitions": index["attribute_definitions"],
+                "GlobalSecondaryIndexUpdates": [
+                    {
+                        "Create": {
+                            "IndexName": name,
+                            "KeySchema": index["key_schema"],
+                            "Projection": index["projection"],
+                        }
+                    }
+                ],
+            },
+        )
+        while _index_status(model, name) != "ACTIVE":
+            sleep(INDEX_POLL_INTERVAL_SECS)
+        log.info(f"Index {name} of table {model.Meta.table_name} created.")
+        created.append(name)
+    return created
+
+
+def enable_ttl(model: type[Model]) -> bool:
+    """Enable the time to live of the model's table, if it has a TTL attribute.
+
+    Returns whether it has been enabled.
+    """
+    if not model._ttl_attribute():  # noqa: SLF001
+        return False
+    description = model._get_connection().connection.dispatch(  # noqa: SLF001
+        "DescribeTimeToLive", {"TableName": model.Meta.table_name}
+    )
+    if description["TimeToLiveDescription"]["TimeToLiveStatus"] in {
+        "ENABLED",
+        "ENABLING",
+    }:
+        return False
+    model.update_ttl(ignore_update_ttl_errors=False)
+    log.info(f"Time to live of table {model.Meta.table_name} enabled.")
+    return True
+
+
+def _update_unless_changed(action: Action, *actions: PynamoAction) -> bool:
+    try:
+        action.update(
+            actions=list(actions),
+            # don't overwrite the changes of a concurrent status update
+            condition=Action.status == action.status,
+            touch=False,
+        )
+    except UpdateError as exc:
+        if exc.cause_response_code != "ConditionalCheckFailedException":
+            raise
+        return False
+    return True
+
+
+def backfill_action_owner_status(shards: int = 0) -> int:
+    """Set the owner-status index key of actions written by previous versions.
+
+    With more than one owner `shards`, remove it instead: sharded owners
+    aren't in the owner-status index. Returns the number of updated actions.
+    """
+    updated = 0
+    for action in Action.scan(
+        attributes_to_get=["action_id", "owner", "status", "owner_status"]
+    ):
+        if shards > 1:
+            if action.owner_status is None:
+                continue
+            update: PynamoAction = Action.owner_status.remove()
+        else:
+            key = owner_status_key(action.owner, action.status)
+            if action.owner_status == key:
+                continue
+            update = Action.owner_status.set(key)
+        if _update_unless_changed(action, update):
+            updated += 1
+    return updated
+
+
+def backfill_action_owner_shard(shards: int) -> int:
+    """Set the owner-shard index key of actions stored with another shard count.
+
+    Returns the number of updated actions.
+    """
+    updated = 0
+    for action in Action.scan(
+        attributes_to_get=["action_id", "owner", "status", "owner_shard"]
+    ):
+        key = owner_shard_key(action.owner, action.action_id, shards)
+        if action.owner_shard == key:
+            continue
+        if _update_unless_changed(action, Action.owner_shard.set(key)):
+            updated += 1
+    return updated
+
+
+def backfill_action_status_shard() -> int:
+    """Set the status-shard index key of actions written by previous versions.
+
+    Returns the number of updated actions.
+    """
+    updated = 0
+    for action in Action.scan(
+        attributes_to_get=["action_id", "status", "status_shard"]
+    ):
+        key = status_shard_key(action.status, action.action_id)
+        if action.status_shard == key:
+            continue
+        if _update_unless_changed(action, Action.status_shard.set(key)):
+            updated += 1
+    return updated
+
+
+def backfill_action_expires_at(retention_days: int, lead_days: int) -> int:
+    """Set the expiry of finished actions stored without one.
+
+    Actions expire `retention_days` after their last update, but not before
+    the archiver has had the chance to archive them (`lead_days` from now).
+    Returns the number of updated actions.
+    """
+    earliest = dt.now(UTC) + timedelta(days=lead_days + 1)
+    updated = 0
+    for action in Action.scan(
+        Action.expires_at.does_not_exist(),
+        attributes_to_get=["action_id", "status", "updated_at"],
+    ):
+        if action.status not in FINAL_STATUSES:
+            continue
+        expires_at = max(
+            dt.fromtimestamp(action.updated_at, UTC) + timedelta(days=retention_days),
+            earliest,
+        )
+        if _update_unless_changed(action, Action.expires_at.set(expires_at)):
+            updated += 1
+    return updated
+
+
+def migrate() -> None:
+    """Create the missing tables and migrate all existing ones."""
+    log.info(f"Created the tables {create_tables() or 'none'}")
+    for model in ALL_TABLES:
+        create_missing_indexes(model)
+        enable_ttl(model)
+    count = backfill_action_owner_status(settings.action_owner_shards)
+    log.info(f"Backfilled the owner-status of {count} actions")
+    count = backfill_action_status_shard()
+    log.info(f"Backfilled the status-shard of {count} actions")
+    if settings.action_owner_shards > 1:
+        count = backfill_action_owner_shard(settings.action_owner_shards)
+        log.info(f"Backfilled the owner-shard of {count} actions")
+    if settings.action_retention_days:
+        count = backfill_action_expires_at(
+            settings.action_retention_days, settings.archive_lead_days
+        )
+        log.info(f"Backfilled the expiry of {count} actions")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    migrate()
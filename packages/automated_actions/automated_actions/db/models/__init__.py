@@ -1,30 +1,90 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from automated_actions.config import settings
 
 from ._action import (
+    FINAL_STATUSES,
+    TRANSITIONS,
     Action,
+    ActionEvent,
     ActionManager,
+    ActionPage,
     ActionSchemaIn,
     ActionSchemaOut,
+    ActionSchemaSummary,
     ActionStatus,
-    get_action_manager,
+    StatusTransitionError,
+    decode_cursor,
+    encode_cursor,
 )
 from ._base import Table
+from ._rate_limit import RateLimitCounter
+from ._revoked_token import RevokedToken
+from ._sqlite import SQLiteAction, SQLiteActionStats, SQLiteRateLimitCounter
+from ._stats import STATS_FIELDS, ActionStats
 from ._user import User, UserSchemaOut
 
 if TYPE_CHECKING:
     from pynamodb.models import Model
 
-ALL_TABLES: list[type[Model]] = [User, Action]
+ALL_TABLES: list[type[Model]] = [
+    User,
+    Action,
+    RateLimitCounter,
+    RevokedToken,
+    ActionStats,
+]
+
+
+def get_rate_limit_counter() -> type[RateLimitCounter | SQLiteRateLimitCounter]:
+    """Get the rate limit counter of the configured storage backend."""
+    if settings.action_backend != "dynamodb":
+        return SQLiteRateLimitCounter
+    return RateLimitCounter
+
+
+def get_action_stats() -> type[ActionStats | SQLiteActionStats]:
+    """Get the action statistics of the configured storage backend."""
+    if settings.action_backend != "dynamodb":
+        return SQLiteActionStats
+    return ActionStats
+
+
+def get_action_manager() -> ActionManager[Any]:
+    """Get the action manager of the configured storage backend."""
+    if settings.action_backend != "dynamodb":
+        return ActionManager[SQLiteAction](
+            SQLiteAction, counter=SQLiteRateLimitCounter, stats=SQLiteActionStats
+        )
+    return ActionManager[Action](Action, counter=RateLimitCounter, stats=ActionStats)
+
 
 __all__ = [
     "ALL_TABLES",
+    "FINAL_STATUSES",
+    "STATS_FIELDS",
+    "TRANSITIONS",
     "Action",
+    "ActionEvent",
     "ActionManager",
+    "ActionPage",
     "ActionSchemaIn",
     "ActionSchemaOut",
+    "ActionSchemaSummary",
+    "ActionStats",
     "ActionStatus",
+    "RateLimitCounter",
+    "RevokedToken",
+    "SQLiteAction",
+    "SQLiteActionStats",
+    "SQLiteRateLimitCounter",
+    "StatusTransitionError",
     "Table",
     "User",
     "UserSchemaOut",
+    "decode_cursor",
+    "encode_cursor",
     "get_action_manager",
+    "get_action_stats",
+    "get_rate_limit_counter",
 ]
@@ -1,20 +1,53 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import heapq
+import json
+import logging
+import operator
 import uuid
-from datetime import UTC
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, timedelta
 from datetime import datetime as dt
 from enum import StrEnum
-from typing import TYPE_CHECKING, Any, Protocol, Self, TypeVar
+from functools import reduce
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, Protocol, Self, TypeVar
 
+from fastapi import HTTPException
 from pydantic import BaseModel, model_validator
-from pynamodb.attributes import DynamicMapAttribute, NumberAttribute, UnicodeAttribute
+from pynamodb.attributes import (
+    DynamicMapAttribute,
+    ListAttribute,
+    MapAttribute,
+    NumberAttribute,
+    TTLAttribute,
+    UnicodeAttribute,
+)
+from pynamodb.exceptions import DoesNotExist, PynamoDBException, UpdateError
 from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
 
 from automated_actions.config import settings
 from automated_actions.db.models._base import Table
+from automated_actions.executor import run_blocking
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterator, Sequence
+
+    from pynamodb._schema import ModelSchema
+    from pynamodb.expressions.condition import Condition
+    from pynamodb.expressions.update import Action as PynamoAction
+    from pynamodb.indexes import Index
+    from pynamodb.pagination import ResultIterator
+
+log = logging.getLogger(__name__)
+
+# queries the shards of an index concurrently, see `_read_shards`
+_shard_executor = ThreadPoolExecutor(thread_name_prefix="index-shards")
 
 
 class ActionStatus(StrEnum):
@@ -25,26 +58,120 @@ class ActionStatus(StrEnum):
     CANCELLED = "CANCELLED"
 
 
+FINAL_STATUSES = frozenset({
+    ActionStatus.SUCCESS,
+    ActionStatus.FAILURE,
+    ActionStatus.CANCELLED,
+})
+
+# status -> the statuses an action may change to it from
+TRANSITIONS: dict[ActionStatus, frozenset[ActionStatus]] = {
+    # retries of the claiming task may claim a RUNNING action again, see
+    # `Action.start`
+    ActionStatus.RUNNING: frozenset({ActionStatus.PENDING}),
+    ActionStatus.SUCCESS: frozenset({ActionStatus.RUNNING}),
+    # from PENDING if the task couldn't be enqueued or started
+    ActionStatus.FAILURE: frozenset({ActionStatus.PENDING, ActionStatus.RUNNING}),
+    ActionStatus.CANCELLED: frozenset({ActionStatus.PENDING, ActionStatus.RUNNING}),
+}
+
+
+class StatusTransitionError(Exception):
+    """The current status of an action doesn't allow the requested change."""
+
+    def __init__(self, action_id: str, current: str, status: ActionStatus) -> None:
+        super().__init__(f"Action {action_id} is {current} and can't become {status}")
+        self.current = current
+        self.status = status
+
+
 class ActionSchemaIn(BaseModel):
     name: str
     owner: str
     status: ActionStatus = ActionStatus.PENDING
 
 
+class ActionSchemaSummary(ActionSchemaIn):
+    """An action without its task arguments and result."""
+
+    action_id: str
+    created_at: float
+    updated_at: float
+
+
+# attributes read from DynamoDB for an `ActionSchemaSummary`
+SUMMARY_ATTRIBUTES = list(ActionSchemaSummary.model_fields)
+# ... and the index key attributes: a page ending within a DynamoDB page
+# continues after the key of its last action, built from its attributes
+SUMMARY_QUERY_ATTRIBUTES = [
+    *SUMMARY_ATTRIBUTES,
+    "owner_status",
+    "owner_shard",
+    "status_shard",
+]
+
+
+# history event of a failed task run that is retried
+RETRY_EVENT = "RETRY"
+MAX_EVENT_ERROR_LENGTH = 1000
+
+
+class ActionEvent(BaseModel):
+    """A status change or a task retry of an action."""
+
+    # an `ActionStatus` or `RETRY_EVENT`
+    event: str
+    at: float
+    # retry count of the task run
+    attempt: int | None = None
+    error: str | None = None
+
+
 class ActionSchemaOut(ActionSchemaIn):
     action_id: str
     result: str | None = None
     task_args: dict | None = None
+    history: list[ActionEvent] | None = None
+    # time from the creation to the first task run
+    queue_wait_secs: float | None = None
+    # time from the first task run to the final status
+    run_secs: float | None = None
     created_at: float
     updated_at: float
 
+    @model_validator(mode="before")
+    @classmethod
+    def compile_history(cls, data: Any) -> Any:
+        if isinstance(data, dict) and data.get("history"):
+            data["history"] = [
+                event.as_dict() if isinstance(event, MapAttribute) else event
+                for event in data["history"]
+            ]
+        return data
+
+    @model_validator(mode="after")
+    def derive_durations(self) -> Self:
+        if not self.history:
+            return self
+        started = next(
+            (e.at for e in self.history if e.event == ActionStatus.RUNNING), None
+        )
+        finished = next(
+            (e.at for e in reversed(self.history) if e.event in FINAL_STATUSES), None
+        )
+        if started is not None:
+            self.queue_wait_secs = started - self.history[0].at
+            if finished is not None:
+                self.run_secs = finished - started
+        return self
+
     @model_validator(mode="before")
     @classmethod
     def compile_task_args(cls, data: Any) -> Any:
         if isinstance(data, dict) and "task_args" in data:
             if data["task_args"] is None:
                 data["task_args"] = {}
-            else:
+            elif isinstance(data["task_args"], DynamicMapAttribute):
                 task_args = {
                     k: data["task_args"].attribute_values[k]
                     for k in data["task_args"].attribute_values
@@ -54,6 +181,255 @@ class ActionSchemaOut(ActionSchemaIn):
         return data
 
 
+T_co = TypeVar("T_co", covariant=True)
+
+
+class ActionPage(NamedTuple, Generic[T_co]):  # noqa: UP046 - covariant, see ActionProtocol
+    """A page of actions and the cursor of the next page, if any."""
+
+    items: Sequence[T_co]
+    cursor: str | None
+
+
+def encode_cursor(last_evaluated_key: dict[str, dict[str, str]] | list) -> str:
+    """Return an opaque cursor for a DynamoDB `last_evaluated_key`.
+
+    The cursors of sharded indexes hold a list of keys, see `encode_shard_cursor`.
+    """
+    return base64.urlsafe_b64encode(
+        json.dumps(last_evaluated_key, separators=(",", ":")).encode()
+    ).decode()
+
+
+def _load_cursor(cursor: str) -> Any:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _check_key(key: Any, **hash_key: str) -> dict[str, dict[str, str]]:
+    if (
+        not isinstance(key, dict)
+        or key.keys() != {"action_id", "updated_at", *hash_key}
+        or not all(
+            isinstance(value, dict)
+            and len(value) == 1
+            and all(isinstance(v, str) for v in value.values())
+            for value in key.values()
+        )
+        or any(key[name] != {"S": value} for name, value in hash_key.items())
+    ):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def decode_cursor(cursor: str, **hash_key: str) -> dict[str, dict[str, str]]:
+    """Return the `last_evaluated_key` of an index cursor.
+
+    `hash_key` is the hash key attribute and value of the queried index, e.g.,
+    `owner="username"`; cursors of other indexes or hash keys are invalid.
+    """
+    return _check_key(_load_cursor(cursor), **hash_key)
+
+
+# position of a shard in a sharded index cursor: the key to continue after,
+# {} to start at the beginning, or None if all its items have been read
+ShardPosition = dict[str, dict[str, str]] | None
+# the read actions of a shard and its position after them
+ShardPage = tuple[list["Action"], ShardPosition]
+
+
+def encode_shard_cursor(positions: Sequence[ShardPosition]) -> str | None:
+    """Return the cursor of the shard positions; None if all shards are read."""
+    if all(position is None for position in positions):
+        return None
+    return encode_cursor(list(positions))
+
+
+def decode_shard_cursor(
+    cursor: str, attribute: str, keys: Sequence[str]
+) -> list[ShardPosition]:
+    """Return the shard positions of a sharded index cursor.
+
+    `keys` are the hash keys of the shards in the `attribute` hash key
+    attribute of the queried index; cursors of other shards are invalid.
+    """
+    positions = _load_cursor(cursor)
+    if not isinstance(positions, list) or len(positions) != len(keys):
+        raise ValueError("Invalid cursor")
+    return [
+        position
+        if position is None or position == {}
+        else _check_key(position, **{attribute: key})
+        for position, key in zip(positions, keys, strict=True)
+    ]
+
+
+# the ID range of `find_by_owner_after` ends this long after the current time
+# to include the actions created by API instances with a clock ahead
+ID_RANGE_CLOCK_SKEW_SECS = 60
+
+
+def new_action_id() -> str:
+    """Return a new time-ordered action ID (UUIDv7).
+
+    The first 48 bits of a UUIDv7 are its creation time in milliseconds, so
+    the IDs sort by creation time, as numbers and as strings.
+    """
+    return str(uuid.uuid7())
+
+
+def is_time_ordered(action_id: str) -> bool:
+    """Return whether the action ID is time-ordered; earlier IDs are UUIDv4."""
+    try:
+        return uuid.UUID(action_id).version == 7  # noqa: PLR2004
+    except ValueError:
+        return False
+
+
+def action_id_bound(timestamp: float) -> str:
+    """Return a string sorting after the time-ordered IDs created until `timestamp`."""
+    millis = f"{int(timestamp * 1000):012x}"
+    # "~" sorts after the hex digits and the "-" that follow the time
+    return f"{millis[:8]}-{millis[8:]}~"
+
+
+def owner_status_key(owner: str, status: str) -> str:
+    """Return the hash key of the owner-status index."""
+    return f"{owner}#{status}"
+
+
+# keys of the status-shard index per status; changing it requires running
+# the migrations (see `db.migrations.backfill_action_status_shard`)
+STATUS_SHARDS = 8
+
+
+def _shard(action_id: str, shards: int) -> int:
+    return zlib.crc32(action_id.encode()) % shards
+
+
+def status_shard_keys(status: str) -> list[str]:
+    """Return the hash keys of the status's shards of the status-shard index."""
+    return [f"{status}#{shard}" for shard in range(STATUS_SHARDS)]
+
+
+def status_shard_key(status: str, action_id: str) -> str:
+    """Return the hash key of the status-shard index of an action.
+
+    The actions with a status are spread evenly over `STATUS_SHARDS` keys, so
+    the writes of all PENDING or RUNNING actions don't go to one partition.
+    """
+    return status_shard_keys(status)[_shard(action_id, STATUS_SHARDS)]
+
+
+def owner_shard_keys(owner: str, shards: int) -> list[str]:
+    """Return the hash keys of the owner's shards of the owner-shard index."""
+    return [f"{owner}#{shard}" for shard in range(shards)]
+
+
+def owner_shard_key(owner: str, action_id: str, shards: int) -> str:
+    """Return the hash key of the owner-shard indexes of an action.
+
+    The actions of an owner are spread evenly over `shards` keys, so the
+    writes of a busy owner don't all go to one index partition.
+    """
+    return owner_shard_keys(owner, shards)[_shard(action_id, shards)]
+
+
+def _query_shard(
+    index: Index[Action],
+    key: str,
+    start: ShardPosition,
+    limit: int | None,
+    **kwargs: Any,
+) -> tuple[list[Action], ShardPosition]:
+    """Read up to `limit` actions of a shard after the `start` key.
+
+    A query may stop short of `limit`, e.g., if the filter discards actions
+    of a page; query again until `limit` actions have been read or the shard
+    is exhausted. Merging the shards relies on it: the actions of a shard
+    that haven't been read sort after all read ones. Returns the actions and
+    the key to continue after, or None if the shard is exhausted.
+    """
+    items: list[Action] = []
+    while True:
+        results = index.query(
+            key,
+            last_evaluated_key=start or None,
+            limit=None if limit is None else limit - len(items),
+            **kwargs,
+        )
+        items.extend(results)
+        start = results.last_evaluated_key
+        if start is None or (limit is not None and len(items) >= limit):
+            return items, start
+
+
+def _read_shards(
+    starts: Sequence[ShardPosition],
+    query: Callable[[int, ShardPosition, int | None], ShardPage],
+    limit: int | None,
+    key: Callable[[Action], Any],
+    *,
+    reverse: bool = False,
+) -> tuple[list[tuple[int, Action]], list[ShardPage]]:
+    """Read the first `limit` actions of the merged shards, ordered by `key`.
+
+    `query(shard, start, limit)` reads a shard, see `_query_shard`. The
+    shards are read concurrently in chunks of `limit / len(starts)` actions,
+    and only the shards whose read actions are all among the first `limit`
+    are read further; a page reads about `limit` plus a chunk per shard
+    instead of `limit` from every shard.
+
+    Returns the merged (shard, action) pairs and the read actions of each
+    shard with the key to continue it after them (None if exhausted).
+    """
+    chunk = -(-limit // len(starts)) if limit else limit
+    pages: list[ShardPage] = [([], start) for start in starts]
+    pending = [shard for shard, start in enumerate(starts) if start is not None]
+    while True:
+        for shard, (items, end) in zip(
+            pending,
+            _shard_executor.map(
+                lambda shard: query(shard, pages[shard][1], chunk), pending
+            ),
+            strict=True,
+        ):
+            pages[shard] = (pages[shard][0] + items, end)
+        merged = list(
+            islice(
+                heapq.merge(
+                    *(
+                        [(shard, a) for a in items]
+                        for shard, (items, _) in enumerate(pages)
+                    ),
+                    key=lambda item: key(item[1]),
+                    reverse=reverse,
+                ),
+                limit,
+            )
+        )
+        read = Counter(shard for shard, _ in merged)
+        # the unread actions of the other shards sort after the page
+        pending = [
+            shard
+            for shard, (items, end) in enumerate(pages)
+            if end is not None and read[shard] == len(items)
+        ]
+        if not limit or not pending:
+            return merged, pages
+
+
+class ActionEventAttribute(MapAttribute):
+    """See `ActionEvent`."""
+
+    event = UnicodeAttribute()
+    at = NumberAttribute()
+    attempt = NumberAttribute(null=True)
+    error = UnicodeAttribute(null=True)
+
+
 class OwnerIndex(GlobalSecondaryIndex["Action"]):
     class Meta:
         index_name = "owner-index"
@@ -63,6 +439,60 @@ class OwnerIndex(GlobalSecondaryIndex["Action"]):
     updated_at = NumberAttribute(range_key=True)
 
 
+class OwnerStatusIndex(GlobalSecondaryIndex["Action"]):
+    class Meta:
+        index_name = "owner-status-index"
+        projection = AllProjection()
+
+    owner_status = UnicodeAttribute(hash_key=True)
+    updated_at = NumberAttribute(range_key=True)
+
+
+class OwnerIdIndex(GlobalSecondaryIndex["Action"]):
+    class Meta:
+        index_name = "owner-id-index"
+        projection = AllProjection()
+
+    owner = UnicodeAttribute(hash_key=True)
+    action_id = UnicodeAttribute(range_key=True)
+
+
+class OwnerShardIndex(GlobalSecondaryIndex["Action"]):
+    class Meta:
+        index_name = "owner-shard-index"
+        projection = AllProjection()
+
+    owner_shard = UnicodeAttribute(hash_key=True)
+    updated_at = NumberAttribute(range_key=True)
+
+
+class OwnerShardIdIndex(GlobalSecondaryIndex["Action"]):
+    class Meta:
+        index_name = "owner-shard-id-index"
+        projection = AllProjection()
+
+    owner_shard = UnicodeAttribute(hash_key=True)
+    action_id = UnicodeAttribute(range_key=True)
+
+
+# indexes keyed by a single owner; with `AA_ACTION_OWNER_SHARDS`, the tables
+# don't have them and the owner-shard indexes replace them
+UNSHARDED_OWNER_INDEXES = frozenset({
+    OwnerIndex.Meta.index_name,
+    OwnerStatusIndex.Meta.index_name,
+    OwnerIdIndex.Meta.index_name,
+})
+
+
+class StatusShardIndex(GlobalSecondaryIndex["Action"]):
+    class Meta:
+        index_name = "status-shard-index"
+        projection = AllProjection()
+
+    status_shard = UnicodeAttribute(hash_key=True)
+    updated_at = NumberAttribute(range_key=True)
+
+
 class Action(Table[ActionSchemaIn, ActionSchemaOut]):
     """Action."""
 
@@ -70,24 +500,147 @@ class Action(Table[ActionSchemaIn, ActionSchemaOut]):
         table_name = f"aa-{settings.environment}-actions"
         schema_out = ActionSchemaOut
 
+    @classmethod
+    def _get_schema(cls) -> ModelSchema:
+        schema = super()._get_schema()
+        if settings.action_owner_shards <= 1:
+            return schema
+        # all writes of an owner would go to one partition of these indexes
+        schema["global_secondary_indexes"] = [
+            index
+            for index in schema["global_secondary_indexes"]
+            if index["index_name"] not in UNSHARDED_OWNER_INDEXES
+        ]
+        keys = {key["AttributeName"] for key in schema["key_schema"]} | {
+            key["AttributeName"]
+            for index in schema["global_secondary_indexes"]
+            for key in index["key_schema"]
+        }
+        schema["attribute_definitions"] = [
+            definition
+            for definition in schema["attribute_definitions"]
+            if definition["AttributeName"] in keys
+        ]
+        return schema
+
     @staticmethod
     def _pre_create(values: dict[str, Any]) -> dict[str, Any]:
         values = super(Action, Action)._pre_create(values)
-        values["action_id"] = str(uuid.uuid4())
+        values["action_id"] = new_action_id()
+        values["status_shard"] = status_shard_key(values["status"], values["action_id"])
+        if settings.action_owner_shards > 1:
+            values["owner_shard"] = owner_shard_key(
+                values["owner"], values["action_id"], settings.action_owner_shards
+            )
+        else:
+            values["owner_status"] = owner_status_key(values["owner"], values["status"])
+        values["history"] = [
+            ActionEventAttribute(event=values["status"], at=values["created_at"])
+        ]
         return values
 
+    @staticmethod
+    def _record(
+        event: str, attempt: int | None = None, error: str | None = None
+    ) -> PynamoAction:
+        return Action.history.set(
+            (Action.history | []).append([
+                ActionEventAttribute(
+                    event=event,
+                    at=dt.now(tz=UTC).timestamp(),
+                    attempt=attempt,
+                    error=error[:MAX_EVENT_ERROR_LENGTH] if error else None,
+                )
+            ])
+        )
+
+    def _status_actions(
+        self, status: ActionStatus, attempt: int | None = None
+    ) -> list[PynamoAction]:
+        # keep the owner-status index key in sync with the status; sharded
+        # owners aren't in the owner-status index
+        actions: list[PynamoAction] = [
+            Action.status.set(status.value),
+            Action.status_shard.set(status_shard_key(status.value, self.action_id)),
+            Action.owner_status.remove()
+            if settings.action_owner_shards > 1
+            else Action.owner_status.set(owner_status_key(self.owner, status.value)),
+            self._record(status.value, attempt),
+        ]
+        if status in FINAL_STATUSES and settings.action_retention_days:
+            actions.append(
+                Action.expires_at.set(
+                    dt.now(tz=UTC) + timedelta(days=settings.action_retention_days)
+                )
+            )
+        return actions
+
+    def _transition(
+        self,
+        status: ActionStatus,
+        actions: Sequence[PynamoAction] = (),
+        condition: Condition | None = None,
+        attempt: int | None = None,
+    ) -> None:
+        """Change the status, if allowed by `TRANSITIONS` or the given condition.
+
+        Raises `StatusTransitionError` if the current status doesn't allow the
+        change and `UpdateError` if the action hasn't been stored (yet).
+        """
+        try:
+            self.update(
+                actions=[*self._status_actions(status, attempt), *actions],
+                condition=Action.status.is_in(
+                    *sorted(s.value for s in TRANSITIONS[status])
+                )
+                if condition is None
+                else condition,
+            )
+        except UpdateError as exc:
+            if exc.cause_response_code != "ConditionalCheckFailedException":
+                raise
+            try:
+                self.refresh()
+            except DoesNotExist:
+                raise exc from None
+            raise StatusTransitionError(self.action_id, self.status, status) from exc
+
     def set_status(self, status: ActionStatus) -> None:
-        self.update(actions=[Action.status.set(status.value)])
+        self._transition(status)
+
+    def start(self, attempt: int = 0) -> None:
+        """Claim a PENDING action for a task run and set its RUNNING status.
+
+        `attempt` is the retry count of the task run. A retry of the claiming
+        task claims the RUNNING action again, a duplicate run (e.g., a
+        redelivered message) doesn't.
+        """
+        self._transition(
+            ActionStatus.RUNNING,
+            [Action.attempt.set(attempt)],
+            condition=(Action.status == ActionStatus.PENDING.value)
+            | (
+                (Action.status == ActionStatus.RUNNING.value)
+                & (Action.attempt < attempt)
+            ),
+            attempt=attempt,
+        )
+
+    def record_retry(self, attempt: int, error: str) -> None:
+        """Record a failed task run that is retried.
+
+        Raises `UpdateError` if the action hasn't been stored (yet).
+        """
+        self.update(
+            actions=[self._record(RETRY_EVENT, attempt, error)],
+            condition=Action.action_id.exists(),
+        )
 
     def set_final_state(
         self, status: ActionStatus, result: str, task_args: dict
     ) -> None:
-        self.update(
-            actions=[
-                Action.status.set(status.value),
-                Action.result.set(result),
-                Action.task_args.set(task_args),
-            ]
+        self._transition(
+            status, [Action.result.set(result), Action.task_args.set(task_args)]
         )
 
     @classmethod
@@ -96,39 +649,269 @@ class Action(Table[ActionSchemaIn, ActionSchemaOut]):
         username: str,
         status: ActionStatus | None = None,
         max_age: int | None = None,
-    ) -> Iterable[Action]:
-        """Returns actions for owner."""
-        match (status, max_age):
-            case (None, None):
-                # If no status or max_age is provided, return all actions for the user
-                return cls.owner_index.query(username)
-            case (None, max_age_val) if max_age_val is not None:
-                # If no status is provided, but max_age is, return actions
-                # for the user not older than max_age
-                return cls.owner_index.query(
-                    username,
-                    range_key_condition=cls.updated_at
-                    >= int(dt.now(tz=UTC).timestamp() - max_age_val),
-                )
-            case (status_val, None) if status_val is not None:
-                # If status is provided, but no max_age, return actions
-                # for the user with the given status
-                return cls.owner_index.query(
-                    username, filter_condition=cls.status == status_val.value
-                )
-            case (status_val, max_age_val) if (
-                status_val is not None and max_age_val is not None
-            ):
-                # If both status and max_age are provided, return actions
-                # for the user with the given status not older than max_age
-                return cls.owner_index.query(
-                    username,
-                    range_key_condition=cls.updated_at
-                    >= int(dt.now(tz=UTC).timestamp() - max_age_val),
-                    filter_condition=cls.status == status_val.value,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[Action]:
+        """Returns actions for owner, newest first.
+
+        Returns at most `limit` actions and continues after the last action of
+        a previous page if a `cursor` is given. Raises `ValueError` for an
+        invalid cursor. With `summary`, only the `SUMMARY_ATTRIBUTES` of the
+        actions are read.
+        """
+        range_key_condition = (
+            cls.updated_at >= int(dt.now(tz=UTC).timestamp() - max_age)
+            if max_age is not None
+            else None
+        )
+        if settings.action_owner_shards > 1:
+            return cls._find_by_shards(
+                cls.owner_shard_index,
+                "owner_shard",
+                owner_shard_keys(username, settings.action_owner_shards),
+                range_key_condition,
+                cls.status == status.value if status else None,
+                limit=limit,
+                cursor=cursor,
+                summary=summary,
+            )
+        if status and settings.action_status_index_enabled:
+            # status filter as key condition; reads only the matching actions
+            key = owner_status_key(username, status.value)
+            results = cls.owner_status_index.query(
+                key,
+                range_key_condition=range_key_condition,
+                scan_index_forward=False,
+                limit=limit,
+                last_evaluated_key=decode_cursor(cursor, owner_status=key)
+                if cursor
+                else None,
+                attributes_to_get=SUMMARY_QUERY_ATTRIBUTES if summary else None,
+            )
+        else:
+            results = cls.owner_index.query(
+                username,
+                range_key_condition=range_key_condition,
+                filter_condition=cls.status == status.value if status else None,
+                scan_index_forward=False,
+                limit=limit,
+                last_evaluated_key=decode_cursor(cursor, owner=username)
+                if cursor
+                else None,
+                attributes_to_get=SUMMARY_QUERY_ATTRIBUTES if summary else None,
+            )
+        return cls._page(results)
+
+    @classmethod
+    def _find_by_shards(
+        cls: type[Self],
+        index: Index[Action],
+        attribute: str,
+        keys: Sequence[str],
+        range_key_condition: Condition | None,
+        filter_condition: Condition | None,
+        *,
+        limit: int | None,
+        cursor: str | None,
+        summary: bool,
+    ) -> ActionPage[Action]:
+        """Query the shards of an index concurrently and merge them, newest first.
+
+        `keys` are the hash keys of the shards in the `attribute` hash key
+        attribute of the `index`.
+
+        See `_read_shards` for the actions read from each shard; the cursor
+        holds the position of each shard after the last of its actions on
+        the page.
+        """
+        positions: list[ShardPosition] = (
+            decode_shard_cursor(cursor, attribute, keys) if cursor else [{}] * len(keys)
+        )
+
+        def query(shard: int, start: ShardPosition, chunk: int | None) -> ShardPage:
+            return _query_shard(
+                index,
+                keys[shard],
+                start,
+                chunk,
+                range_key_condition=range_key_condition,
+                filter_condition=filter_condition,
+                scan_index_forward=False,
+                attributes_to_get=SUMMARY_QUERY_ATTRIBUTES if summary else None,
+            )
+
+        merged, pages = _read_shards(
+            positions, query, limit, operator.attrgetter("updated_at"), reverse=True
+        )
+        read = Counter(shard for shard, _ in merged)
+        for shard, (items, end) in enumerate(pages):
+            if read[shard] == len(items):
+                positions[shard] = end
+            elif read[shard]:
+                last = items[read[shard] - 1]
+                positions[shard] = {
+                    "action_id": {"S": last.action_id},
+                    attribute: {"S": keys[shard]},
+                    "updated_at": {"N": str(cls.updated_at.serialize(last.updated_at))},
+                }
+        return ActionPage(
+            items=[action for _, action in merged],
+            cursor=encode_shard_cursor(positions),
+        )
+
+    @classmethod
+    def find_by_owner_after(
+        cls: type[Self],
+        username: str,
+        after: str,
+        status: ActionStatus | None = None,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        summary: bool = False,
+    ) -> ActionPage[Action]:
+        """Returns actions for owner created after the action `after`, oldest first.
+
+        Pages by ID range: the cursor of the next page is the ID of the last
+        read action. With `AA_ACTION_OWNER_SHARDS`, the owner's shards are
+        queried concurrently and merged by ID. Raises `ValueError` if `after`
+        isn't a time-ordered ID. Actions with the random IDs of previous
+        versions sort anywhere and are left out; `find_by_owner` lists them.
+        See `find_by_owner` for `limit` and `summary`.
+        """
+        if not is_time_ordered(after):
+            raise ValueError("Invalid cursor: not a time-ordered action ID")
+        conditions: list[Condition] = []
+        if status:
+            conditions.append(cls.status == status.value)
+        if max_age is not None:
+            conditions.append(
+                cls.updated_at >= int(dt.now(tz=UTC).timestamp() - max_age)
+            )
+        # excludes the random IDs of previous versions greater than `after`
+        range_key_condition = cls.action_id <= action_id_bound(
+            dt.now(tz=UTC).timestamp() + ID_RANGE_CLOCK_SKEW_SECS
+        )
+        filter_condition = reduce(operator.and_, conditions) if conditions else None
+        if settings.action_owner_shards > 1:
+            keys = owner_shard_keys(username, settings.action_owner_shards)
+
+            def query(shard: int, start: ShardPosition, chunk: int | None) -> ShardPage:
+                return _query_shard(
+                    cls.owner_shard_id_index,
+                    keys[shard],
+                    start,
+                    chunk,
+                    range_key_condition=range_key_condition,
+                    filter_condition=filter_condition,
+                    attributes_to_get=SUMMARY_QUERY_ATTRIBUTES if summary else None,
                 )
-            case _:
-                return []
+
+            merged, pages = _read_shards(
+                [
+                    {"owner_shard": {"S": key}, "action_id": {"S": after}}
+                    for key in keys
+                ],
+                query,
+                limit,
+                operator.attrgetter("action_id"),
+            )
+            more = sum(len(items) for items, _ in pages) > len(merged) or any(
+                end is not None for _, end in pages
+            )
+            return ActionPage(
+                items=[action for _, action in merged],
+                cursor=merged[-1][1].action_id if merged and more else None,
+            )
+        results = cls.owner_id_index.query(
+            username,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            limit=limit,
+            last_evaluated_key={"owner": {"S": username}, "action_id": {"S": after}},
+            attributes_to_get=SUMMARY_QUERY_ATTRIBUTES if summary else None,
+        )
+        items = list(results)
+        return ActionPage(
+            items=items,
+            cursor=results.last_evaluated_key["action_id"]["S"]
+            if results.last_evaluated_key
+            else None,
+        )
+
+    @classmethod
+    def find_by_status(
+        cls: type[Self],
+        status: ActionStatus,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[Action]:
+        """Returns actions of all owners with the given status, newest first.
+
+        Queries the status's shards of the status-shard index concurrently.
+        See `find_by_owner` for `limit`, `cursor`, and `summary`.
+        """
+        return cls._find_by_shards(
+            cls.status_shard_index,
+            "status_shard",
+            status_shard_keys(status.value),
+            cls.updated_at >= int(dt.now(tz=UTC).timestamp() - max_age)
+            if max_age is not None
+            else None,
+            None,
+            limit=limit,
+            cursor=cursor,
+            summary=summary,
+        )
+
+    @classmethod
+    def find_all(
+        cls: type[Self],
+        statuses: Sequence[ActionStatus] = (),
+        name: str | None = None,
+        max_age: int | None = None,
+        *,
+        segments: int,
+        summary: bool = False,
+    ) -> Iterator[Action]:
+        """Yields the actions of all owners in no particular order.
+
+        Reads the whole table with a parallel scan of `segments` segments;
+        the filters are applied by DynamoDB but the scan reads (and is charged
+        for) all actions. See `find_by_owner` for `summary`.
+        """
+        conditions: list[Condition] = []
+        if statuses:
+            conditions.append(cls.status.is_in(*sorted(s.value for s in statuses)))
+        if name:
+            conditions.append(cls.name == name)
+        if max_age is not None:
+            conditions.append(
+                cls.updated_at >= int(dt.now(tz=UTC).timestamp() - max_age)
+            )
+        return cls.parallel_scan(
+            reduce(operator.and_, conditions) if conditions else None,
+            segments=segments,
+            attributes_to_get=SUMMARY_ATTRIBUTES if summary else None,
+        )
+
+    def dump_summary(self) -> ActionSchemaSummary:
+        return ActionSchemaSummary(**self.attribute_values)
+
+    @staticmethod
+    def _page(results: ResultIterator[Action]) -> ActionPage[Action]:
+        items = list(results)
+        return ActionPage(
+            items=items,
+            cursor=encode_cursor(results.last_evaluated_key)
+            if results.last_evaluated_key
+            else None,
+        )
 
     action_id = UnicodeAttribute(hash_key=True)
     name = UnicodeAttribute()
@@ -136,16 +919,45 @@ class Action(Table[ActionSchemaIn, ActionSchemaOut]):
     result = UnicodeAttribute(null=True)
     task_args = DynamicMapAttribute(null=True)
     owner = UnicodeAttribute()
+    # retry count of the task run that claimed the action
+    attempt = NumberAttribute(null=True)
+    # status changes and task retries; null for actions stored before
+    history = ListAttribute(of=ActionEventAttribute, null=True)
+    # "<owner>#<status>"; null for actions stored before the index existed
+    # and with `AA_ACTION_OWNER_SHARDS`
+    owner_status = UnicodeAttribute(null=True)
+    # "<owner>#<shard>" with `AA_ACTION_OWNER_SHARDS`, see `owner_shard_key`
+    owner_shard = UnicodeAttribute(null=True)
+    # "<status>#<shard>", see `status_shard_key`; null for actions stored
+    # before the index existed
+    status_shard = UnicodeAttribute(null=True)
+    # set on the final status if a retention period is configured; expired
+    # actions are deleted by DynamoDB and kept in the archive (db.archive)
+    expires_at = TTLAttribute(null=True)
     owner_index = OwnerIndex()
-
-
-T_co = TypeVar("T_co", covariant=True)
+    owner_status_index = OwnerStatusIndex()
+    status_shard_index = StatusShardIndex()
+    owner_id_index = OwnerIdIndex()
+    owner_shard_index = OwnerShardIndex()
+    owner_shard_id_index = OwnerShardIdIndex()
 
 
 class ActionProtocol(Protocol[T_co]):
     """Protocol for the action model."""
 
+    action_id: Any
+    name: Any
+    owner: Any
     status: Any
+    created_at: Any
+
+    def set_status(self, status: ActionStatus) -> None: ...
+
+    def set_final_state(
+        self, status: ActionStatus, result: str, task_args: dict
+    ) -> None: ...
+
+    def save(self) -> Any: ...
 
     @classmethod
     def find_by_owner(
@@ -153,7 +965,45 @@ class ActionProtocol(Protocol[T_co]):
         username: str,
         status: ActionStatus | None,
         max_age: int | None = None,
-    ) -> Iterable[T_co]: ...
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[T_co]: ...
+
+    @classmethod
+    def find_by_owner_after(
+        cls,
+        username: str,
+        after: str,
+        status: ActionStatus | None = None,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        summary: bool = False,
+    ) -> ActionPage[T_co]: ...
+
+    @classmethod
+    def find_by_status(
+        cls,
+        status: ActionStatus,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[T_co]: ...
+
+    @classmethod
+    def find_all(
+        cls,
+        statuses: Sequence[ActionStatus] = (),
+        name: str | None = None,
+        max_age: int | None = None,
+        *,
+        segments: int,
+        summary: bool = False,
+    ) -> Iterator[T_co]: ...
 
     @classmethod
     def get_or_404(cls, pk: str) -> T_co: ...
@@ -161,33 +1011,181 @@ class ActionProtocol(Protocol[T_co]):
     @classmethod
     def create(cls, params: ActionSchemaIn) -> T_co: ...
 
+    @classmethod
+    def new(cls, params: ActionSchemaIn) -> T_co: ...
+
 
 class User(Protocol):
     username: str
 
 
+class CounterProtocol(Protocol):
+    """Protocol for the rate limit counter model."""
+
+    @classmethod
+    def increment(cls, username: str, name: str) -> None: ...
+
+    @classmethod
+    def decrement(cls, username: str, name: str, created_at: float) -> None: ...
+
+
+class StatsProtocol(Protocol):
+    """Protocol for the action statistics model."""
+
+    @classmethod
+    def increment(cls, name: str, status: str, owner: str) -> None: ...
+
+
 class ActionManager[ActionClass: ActionProtocol]:
     """Abstract class for the action model."""
 
-    def __init__(self, klass: type[ActionClass]) -> None:
+    def __init__(
+        self,
+        klass: type[ActionClass],
+        counter: type[CounterProtocol] | None = None,
+        stats: type[StatsProtocol] | None = None,
+    ) -> None:
         self.klass = klass
+        self.counter = counter
+        self.stats = stats
+
+    def count_final(self, action: ActionClass, status: ActionStatus) -> None:
+        """Count an action that reached a final status in the statistics, if any."""
+        if not self.stats:
+            return
+        try:
+            self.stats.increment(action.name, status.value, action.owner)
+        except PynamoDBException as exc:
+            # statistics are best effort
+            log.warning(f"Unable to count action {action.action_id}: {exc}")
 
     def get_user_actions(
         self,
         username: str,
         status: ActionStatus | None = None,
         max_age: int | None = None,
-    ) -> Iterable[ActionClass]:
-        return self.klass.find_by_owner(username, status, max_age)
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[ActionClass]:
+        return self.klass.find_by_owner(
+            username, status, max_age, limit=limit, cursor=cursor, summary=summary
+        )
+
+    def get_user_actions_after(
+        self,
+        username: str,
+        after: str,
+        status: ActionStatus | None = None,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        summary: bool = False,
+    ) -> ActionPage[ActionClass]:
+        """Get the actions of the user created after the action `after`, oldest first."""
+        return self.klass.find_by_owner_after(
+            username, after, status, max_age, limit=limit, summary=summary
+        )
+
+    def get_actions_by_status(
+        self,
+        status: ActionStatus,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[ActionClass]:
+        """Get the actions of all users with the given status."""
+        return self.klass.find_by_status(
+            status, max_age, limit=limit, cursor=cursor, summary=summary
+        )
+
+    def get_all_actions(
+        self,
+        statuses: Sequence[ActionStatus] = (),
+        name: str | None = None,
+        max_age: int | None = None,
+        *,
+        segments: int,
+        summary: bool = False,
+    ) -> Iterator[ActionClass]:
+        """Get the actions of all users, in no particular order."""
+        return self.klass.find_all(
+            statuses, name, max_age, segments=segments, summary=summary
+        )
 
     def get_or_404(self, pk: str) -> ActionClass:
         """Get an action by its primary key or raise a 404 error."""
         return self.klass.get_or_404(pk)
 
-    def create_action(self, name: str, owner: User) -> ActionClass:
-        return self.klass.create(ActionSchemaIn(name=name, owner=owner.username))
+    def new_action(self, name: str, owner: User) -> ActionClass:
+        """Return a new action with a locally generated ID, without storing it."""
+        return self.klass.new(ActionSchemaIn(name=name, owner=owner.username))
+
+    async def submit_action(
+        self, action: ActionClass, enqueue: Callable[[], Any]
+    ) -> ActionClass:
+        """Store a new action and enqueue its task concurrently.
+
+        If enqueueing fails, the stored action is marked as failed. If storing
+        fails, the already enqueued task doesn't find the action and skips it
+        (see `AutomatedActionTask.before_start`).
+        """
+        calls = [run_blocking(action.save), asyncio.to_thread(enqueue)]
+        if self.counter:
+            calls.append(
+                run_blocking(self.counter.increment, action.owner, action.name)
+            )
+        saved, enqueued, *counted = await asyncio.gather(*calls, return_exceptions=True)
+        if isinstance(counted[0] if counted else None, BaseException):
+            # the action runs anyway; its rate limit count is off by one
+            log.error(f"Unable to count action {action.action_id}: {counted[0]}")
+
+        if not isinstance(saved, BaseException) and not isinstance(
+            enqueued, BaseException
+        ):
+            return action
+
+        if isinstance(enqueued, BaseException) and not isinstance(saved, BaseException):
+            try:
+                await run_blocking(
+                    action.set_final_state,
+                    status=ActionStatus.FAILURE,
+                    result=f"Unable to enqueue the action: {enqueued}",
+                    task_args={},
+                )
+            except StatusTransitionError as exc:
+                # the task has been enqueued after all (e.g., a timed out send)
+                log.warning(f"Unable to mark action {action.action_id} failed: {exc}")
+            else:
+                await run_blocking(self.count_final, action, ActionStatus.FAILURE)
+        if self.counter and counted and not isinstance(counted[0], BaseException):
+            await run_blocking(
+                self.counter.decrement, action.owner, action.name, action.created_at
+            )
+        error = enqueued if isinstance(enqueued, BaseException) else saved
+        log.error(f"Unable to submit action {action.action_id}: {error}")
+        raise HTTPException(
+            status_code=503,
+            detail="Unable to submit the action, please try again later",
+        ) from error
 
+    def cancel_action(self, action: ActionClass) -> None:
+        """Cancel an action; cancelled actions don't count against rate limits.
 
-def get_action_manager() -> ActionManager[Action]:
-    """Get the action manager."""
-    return ActionManager[Action](Action)
+        Raises a 409 error if the action has already finished.
+        """
+        if action.status == ActionStatus.CANCELLED:
+            return
+        try:
+            action.set_status(ActionStatus.CANCELLED)
+        except StatusTransitionError as exc:
+            if exc.current == ActionStatus.CANCELLED:
+                # cancelled concurrently
+                return
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        if self.counter:
+            self.counter.decrement(action.owner, action.name, action.created_at)
+        self.count_final(action, ActionStatus.CANCELLED)
@@ -1,3 +1,6 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC
 from datetime import datetime as dt
 from typing import TYPE_CHECKING, Any, ClassVar, Self
@@ -11,6 +14,8 @@ from pynamodb.models import Model as PynamoModel
 from automated_actions.config import settings
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
     from pynamodb.expressions.condition import Condition
     from pynamodb.expressions.update import Action as PynamoAction
 
@@ -40,10 +45,14 @@ class Table[SchemaIn: PydanticBaseModel, SchemaOut: PydanticBaseModel](PynamoMod
     def dump(self) -> SchemaOut:
         return self.Meta.schema_out(**self.attribute_values)
 
+    @classmethod
+    def new(cls, item: SchemaIn) -> Self:
+        """Return a new item without saving it."""
+        return cls(**cls._pre_create(item.model_dump(exclude_none=True)))
+
     @classmethod
     def create(cls, item: SchemaIn) -> Self:
-        data = cls._pre_create(item.model_dump(exclude_none=True))
-        db_item = cls(**data)
+        db_item = cls.new(item)
         db_item.save()
         return db_item
 
@@ -53,12 +62,59 @@ class Table[SchemaIn: PydanticBaseModel, SchemaOut: PydanticBaseModel](PynamoMod
         condition: Condition | None = None,
         *,
         add_version_condition: bool = True,
+        touch: bool = True,
     ) -> Any:
-        actions.append(Table.updated_at.set(dt.now(UTC).timestamp()))
+        """Update the item; `touch=False` keeps its `updated_at`, e.g., for migrations."""
+        if touch:
+            actions.append(Table.updated_at.set(dt.now(UTC).timestamp()))
         return super().update(
             actions, condition, add_version_condition=add_version_condition
         )
 
+    @classmethod
+    def parallel_scan(
+        cls,
+        filter_condition: Condition | None = None,
+        *,
+        segments: int,
+        attributes_to_get: Sequence[str] | None = None,
+        buffer_size: int = 1000,
+    ) -> Iterator[Self]:
+        """Scan the table with `segments` concurrent segment scans.
+
+        The items are yielded in no particular order while the segments are
+        read. At most `buffer_size` items wait to be consumed; the scans pause
+        while the buffer is full. Closing the iterator stops the scans.
+        """
+        # items, scan errors, and None for each finished segment
+        items: queue.Queue[Any] = queue.Queue(maxsize=buffer_size)
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=segments) as pool:
+            for segment in range(segments):
+                pool.submit(
+                    _read_segment,
+                    cls.scan(
+                        filter_condition,
+                        segment=segment,
+                        total_segments=segments,
+                        attributes_to_get=attributes_to_get,
+                    ),
+                    items,
+                    stop,
+                )
+            try:
+                running = segments
+                while running:
+                    item = items.get()
+                    if item is None:
+                        running -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                stop.set()
+
     @classmethod
     def get_or_404(cls, pk: str) -> Self:
         try:
@@ -66,3 +122,26 @@ class Table[SchemaIn: PydanticBaseModel, SchemaOut: PydanticBaseModel](PynamoMod
         except DoesNotExist:
             raise HTTPException(status_code=404, detail="Item not found") from None
         return item
+
+
+def _put(items: queue.Queue[Any], stop: threading.Event, item: Any) -> bool:
+    """Put the item into the queue unless the consumer stops in the meantime."""
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=0.1)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _read_segment(
+    scan: Iterable[Any], items: queue.Queue[Any], stop: threading.Event
+) -> None:
+    try:
+        for item in scan:
+            if not _put(items, stop, item):
+                return
+    except Exception as exc:  # noqa: BLE001 - raised by the consumer
+        _put(items, stop, exc)
+    _put(items, stop, None)
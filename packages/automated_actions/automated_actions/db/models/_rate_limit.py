@@ -0,0 +1,99 @@
+import contextlib
+import math
+from datetime import UTC
+from datetime import datetime as dt
+from typing import TYPE_CHECKING
+
+from pynamodb.attributes import NumberAttribute, TTLAttribute, UnicodeAttribute
+from pynamodb.exceptions import UpdateError
+from pynamodb.models import Model as PynamoModel
+
+from automated_actions.config import settings
+from automated_actions.db.models._base import Table
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def window_start(timestamp: float) -> int:
+    """Return the start of the fixed rate limit window of `timestamp`."""
+    window = settings.rate_limit_window_secs
+    return int(timestamp // window * window)
+
+
+def estimate_ops_count(counts: Iterable[tuple[float, float]], now: float) -> int:
+    """Estimate the number of actions in the sliding window ending `now`.
+
+    `counts` are the (window start, ops) of the current and the previous fixed
+    window; the previous one is weighted by the part still overlapping the
+    sliding window.
+    """
+    current_start = window_start(now)
+    current: float = 0
+    previous: float = 0
+    for start, ops in counts:
+        if start == current_start:
+            current = ops
+        else:
+            previous = ops
+    overlap = 1 - (now - current_start) / settings.rate_limit_window_secs
+    return math.ceil(current + previous * overlap)
+
+
+class RateLimitCounter(PynamoModel):
+    """Per (user, action) counter of executed actions in fixed time windows.
+
+    The number of actions in the sliding rate limit window is estimated from the
+    current and the previous fixed window, weighting the previous window by the
+    part still overlapping the sliding window.
+    """
+
+    class Meta(Table.Meta):
+        table_name = f"aa-{settings.environment}-rate-limit"
+
+    @staticmethod
+    def _key(username: str, name: str) -> str:
+        return f"{username}#{name}"
+
+    @classmethod
+    def increment(cls, username: str, name: str) -> None:
+        """Count an action in the current window."""
+        now = dt.now(UTC).timestamp()
+        cls(cls._key(username, name), window_start(now)).update(
+            actions=[
+                cls.ops.add(1),
+                # keep the window as long as it can be the previous window
+                cls.expires_at.set(
+                    dt.fromtimestamp(
+                        window_start(now) + 2 * settings.rate_limit_window_secs,
+                        UTC,
+                    )
+                ),
+            ]
+        )
+
+    @classmethod
+    def decrement(cls, username: str, name: str, created_at: float) -> None:
+        """Stop counting an action, e.g. because it has been cancelled."""
+        # the window may have expired already or the action was never counted
+        with contextlib.suppress(UpdateError):
+            cls(cls._key(username, name), window_start(created_at)).update(
+                actions=[cls.ops.add(-1)], condition=cls.ops > 0
+            )
+
+    @classmethod
+    def get_ops_count(cls, username: str, name: str) -> int:
+        """Return the estimated number of actions in the sliding window."""
+        now = dt.now(UTC).timestamp()
+        counters = cls.query(
+            cls._key(username, name),
+            cls.window >= window_start(now) - settings.rate_limit_window_secs,
+        )
+        return estimate_ops_count(
+            ((counter.window, counter.ops) for counter in counters), now
+        )
+
+    key = UnicodeAttribute(hash_key=True)
+    window = NumberAttribute(range_key=True)
+    ops = NumberAttribute(default=0)
+    expires_at = TTLAttribute(null=True)
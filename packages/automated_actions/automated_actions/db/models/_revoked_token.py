@@ -0,0 +1,69 @@
+from datetime import UTC
+from datetime import datetime as dt
+
+from pynamodb.attributes import NumberAttribute, TTLAttribute, UnicodeAttribute
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+from pynamodb.models import Model as PynamoModel
+
+from automated_actions.config import settings
+from automated_actions.db.models._base import Table
+
+# hash key of the revoked-at index; all revocations share it, they are rare
+REVOKED = "revoked"
+
+
+class RevokedAtIndex(GlobalSecondaryIndex["RevokedToken"]):
+    class Meta:
+        index_name = "revoked-at-index"
+        projection = AllProjection()
+
+    kind = UnicodeAttribute(hash_key=True)
+    revoked_at = NumberAttribute(range_key=True)
+
+
+class RevokedToken(PynamoModel):
+    """Revoked bearer token IDs (`jti`).
+
+    Entries expire together with the revoked tokens.
+    """
+
+    class Meta(Table.Meta):
+        table_name = f"aa-{settings.environment}-revoked-tokens"
+
+    @classmethod
+    def revoke(cls, jti: str, username: str, expires_at: dt) -> None:
+        cls(
+            jti,
+            username=username,
+            revoked_at=dt.now(UTC).timestamp(),
+            expires_at=expires_at,
+        ).save()
+
+    @classmethod
+    def revoked_since(cls, since: float | None = None) -> dict[str, float]:
+        """Return the expiration timestamps of the revoked tokens, by ID.
+
+        With `since`, only the tokens revoked since then are queried from the
+        revoked-at index; otherwise all tokens are read with a scan, including
+        the ones revoked before the index existed.
+        """
+        now = dt.now(UTC)
+        tokens = (
+            cls.scan()
+            if since is None
+            else cls.revoked_at_index.query(REVOKED, cls.revoked_at >= since)
+        )
+        # DynamoDB deletes expired items only eventually
+        return {
+            token.jti: token.expires_at.timestamp()
+            for token in tokens
+            if token.expires_at > now
+        }
+
+    jti = UnicodeAttribute(hash_key=True)
+    username = UnicodeAttribute()
+    kind = UnicodeAttribute(default=REVOKED)
+    revoked_at = NumberAttribute()
+    expires_at = TTLAttribute()
+
+    revoked_at_index = RevokedAtIndex()
@@ -0,0 +1,614 @@
+"""Actions stored in SQLite instead of DynamoDB.
+
+`SQLiteAction` implements the `ActionProtocol` of the DynamoDB `Action`
+model, including its status transitions, history, and pagination cursors,
+for local runs, tests, and load tests without a DynamoDB stand-in (see
+`AA_ACTION_BACKEND`). `SQLiteRateLimitCounter` and `SQLiteActionStats` keep
+the rate limit counters and statistics of the actions in the same database.
+Users and revoked tokens are still stored in DynamoDB.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from itertools import starmap
+from typing import TYPE_CHECKING, Any, ClassVar, Self
+
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from pynamodb.exceptions import UpdateError
+
+from automated_actions.config import settings
+from automated_actions.db.models._action import (
+    FINAL_STATUSES,
+    ID_RANGE_CLOCK_SKEW_SECS,
+    MAX_EVENT_ERROR_LENGTH,
+    RETRY_EVENT,
+    SUMMARY_ATTRIBUTES,
+    TRANSITIONS,
+    ActionEvent,
+    ActionPage,
+    ActionSchemaIn,
+    ActionSchemaOut,
+    ActionSchemaSummary,
+    ActionStatus,
+    StatusTransitionError,
+    action_id_bound,
+    decode_cursor,
+    encode_cursor,
+    is_time_ordered,
+    new_action_id,
+)
+from automated_actions.db.models._rate_limit import estimate_ops_count, window_start
+from automated_actions.db.models._stats import HOUR_SECS, STATS_FIELDS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+MEMORY = ":memory:"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actions (
+    action_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    result TEXT,
+    task_args TEXT,
+    attempt INTEGER,
+    history TEXT,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS owner_index ON actions (owner, updated_at, action_id);
+CREATE INDEX IF NOT EXISTS owner_status_index
+    ON actions (owner, status, updated_at, action_id);
+CREATE INDEX IF NOT EXISTS status_index ON actions (status, updated_at, action_id);
+CREATE INDEX IF NOT EXISTS owner_id_index ON actions (owner, action_id);
+CREATE TABLE IF NOT EXISTS rate_limit (
+    key TEXT NOT NULL,
+    window INTEGER NOT NULL,
+    ops INTEGER NOT NULL,
+    PRIMARY KEY (key, window)
+);
+CREATE TABLE IF NOT EXISTS action_stats (
+    hour INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (hour, name, status, owner)
+);
+"""
+
+# columns stored as JSON text
+JSON_COLUMNS = frozenset({"task_args", "history"})
+
+
+class ActionDatabase:
+    """A SQLite database of actions; `:memory:` for an in-memory database.
+
+    The threads of a process share one connection. File databases use the
+    write-ahead log, so the API and worker processes read while another one
+    writes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self.connection.row_factory = sqlite3.Row
+        if path != MEMORY:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> list[sqlite3.Row]:
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def iterate(
+        self, sql: str, params: Sequence[Any] = (), batch_size: int = 100
+    ) -> Iterator[sqlite3.Row]:
+        """Yield the rows of a query, reading `batch_size` rows at a time.
+
+        The connection is only locked while reading a batch, so the other
+        threads aren't blocked while the rows are consumed.
+        """
+        with self.lock:
+            cursor = self.connection.execute(sql, params)
+        try:
+            while True:
+                with self.lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            with self.lock:
+                cursor.close()
+
+
+def _not_stored(action_id: str) -> UpdateError:
+    """Return the error of a conditional DynamoDB update of a missing action."""
+    return UpdateError(
+        f"Action {action_id} not found",
+        cause=ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        ),
+    )
+
+
+def _event(
+    event: str, attempt: int | None = None, error: str | None = None
+) -> dict[str, Any]:
+    return ActionEvent(
+        event=event,
+        at=dt.now(UTC).timestamp(),
+        attempt=attempt,
+        error=error[:MAX_EVENT_ERROR_LENGTH] if error else None,
+    ).model_dump(exclude_none=True)
+
+
+@dataclass
+class SQLiteAction:
+    """An action stored in SQLite; see `Action` for the attributes."""
+
+    _database: ClassVar[ActionDatabase | None] = None
+    _connect_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    action_id: str
+    name: str
+    owner: str
+    status: str
+    created_at: float
+    updated_at: float
+    result: str | None = None
+    task_args: dict | None = None
+    attempt: int | None = None
+    history: list[dict[str, Any]] | None = None
+    expires_at: float | None = None
+
+    @classmethod
+    def connect(cls, path: str) -> None:
+        """Store the actions in the SQLite database at `path` (or `:memory:`)."""
+        cls._database = ActionDatabase(path)
+
+    @classmethod
+    def database(cls) -> ActionDatabase:
+        with cls._connect_lock:
+            if cls._database is None:
+                cls._database = ActionDatabase(
+                    MEMORY
+                    if settings.action_backend == "memory"
+                    else settings.action_sqlite_path
+                )
+            return cls._database
+
+    @classmethod
+    def _from_row(cls, row: sqlite3.Row) -> Self:
+        return cls(**{
+            key: json.loads(value) if key in JSON_COLUMNS and value else value
+            for key, value in dict(row).items()
+        })
+
+    @staticmethod
+    def _to_column(key: str, value: Any) -> Any:
+        return json.dumps(value) if key in JSON_COLUMNS and value is not None else value
+
+    @classmethod
+    def new(cls, params: ActionSchemaIn) -> Self:
+        """Return a new action without saving it."""
+        now = dt.now(UTC).timestamp()
+        return cls(
+            action_id=new_action_id(),
+            name=params.name,
+            owner=params.owner,
+            status=params.status.value,
+            created_at=now,
+            updated_at=now,
+            history=[{"event": params.status.value, "at": now}],
+        )
+
+    @classmethod
+    def create(cls, params: ActionSchemaIn) -> Self:
+        action = cls.new(params)
+        action.save()
+        return action
+
+    def save(self) -> None:
+        values = asdict(self)
+        self.database().execute(
+            f"INSERT OR REPLACE INTO actions ({', '.join(values)}) "  # noqa: S608
+            f"VALUES ({', '.join('?' * len(values))})",
+            list(starmap(self._to_column, values.items())),
+        )
+
+    @classmethod
+    def get_or_404(cls, pk: str) -> Self:
+        rows = cls.database().execute("SELECT * FROM actions WHERE action_id = ?", [pk])
+        if not rows:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return cls._from_row(rows[0])
+
+    def dump(self) -> ActionSchemaOut:
+        return ActionSchemaOut(**asdict(self))
+
+    def dump_summary(self) -> ActionSchemaSummary:
+        return ActionSchemaSummary(**asdict(self))
+
+    def _update(
+        self, values: dict[str, Any], event: dict[str, Any], condition: str, *args: Any
+    ) -> bool:
+        """Update the action and append the event to its history if `condition` holds.
+
+        Returns whether it has been updated. Raises `UpdateError` if the
+        action hasn't been stored (yet).
+        """
+        values = {**values, "updated_at": dt.now(UTC).timestamp()}
+        rows = self.database().execute(
+            f"UPDATE actions SET {', '.join(f'{key} = ?' for key in values)}, "  # noqa: S608
+            "history = json_insert(coalesce(history, '[]'), '$[#]', json(?)) "
+            f"WHERE action_id = ? AND ({condition}) RETURNING *",
+            [
+                *starmap(self._to_column, values.items()),
+                json.dumps(event),
+                self.action_id,
+                *args,
+            ],
+        )
+        if not rows:
+            current = self.database().execute(
+                "SELECT status FROM actions WHERE action_id = ?", [self.action_id]
+            )
+            if not current:
+                raise _not_stored(self.action_id)
+            self.status = current[0]["status"]
+            return False
+        updated = self._from_row(rows[0])
+        for field in fields(self):
+            setattr(self, field.name, getattr(updated, field.name))
+        return True
+
+    def _transition(
+        self,
+        status: ActionStatus,
+        values: dict[str, Any] | None = None,
+        condition: str | None = None,
+        *args: Any,
+        attempt: int | None = None,
+    ) -> None:
+        """Change the status, if allowed by `TRANSITIONS` or the given condition.
+
+        See `Action._transition`.
+        """
+        values = {"status": status.value, **(values or {})}
+        if status in FINAL_STATUSES and settings.action_retention_days:
+            values["expires_at"] = (
+                dt.now(UTC) + timedelta(days=settings.action_retention_days)
+            ).timestamp()
+        if condition is None:
+            allowed = sorted(s.value for s in TRANSITIONS[status])
+            condition = f"status IN ({', '.join('?' * len(allowed))})"
+            args = tuple(allowed)
+        if not self._update(values, _event(status.value, attempt), condition, *args):
+            raise StatusTransitionError(self.action_id, self.status, status)
+
+    def set_status(self, status: ActionStatus) -> None:
+        self._transition(status)
+
+    def start(self, attempt: int = 0) -> None:
+        """Claim a PENDING action for a task run, see `Action.start`."""
+        self._transition(
+            ActionStatus.RUNNING,
+            {"attempt": attempt},
+            "status = ? OR (status = ? AND attempt < ?)",
+            ActionStatus.PENDING.value,
+            ActionStatus.RUNNING.value,
+            attempt,
+            attempt=attempt,
+        )
+
+    def record_retry(self, attempt: int, error: str) -> None:
+        """Record a failed task run that is retried, see `Action.record_retry`."""
+        self._update({}, _event(RETRY_EVENT, attempt, error), "1")
+
+    def set_final_state(
+        self, status: ActionStatus, result: str, task_args: dict
+    ) -> None:
+        self._transition(status, {"result": result, "task_args": task_args})
+
+    @staticmethod
+    def _query(
+        conditions: dict[str, Any],
+        max_age: int | None,
+        *,
+        summary: bool,
+        extra: str = "",
+        params: Sequence[Any] = (),
+    ) -> tuple[str, list[Any]]:
+        """Return the SQL query of the actions matching the conditions."""
+        where = [f"{column} = ?" for column in conditions]
+        values = list(conditions.values())
+        if max_age is not None:
+            where.append("updated_at >= ?")
+            values.append(int(dt.now(UTC).timestamp() - max_age))
+        sql = (
+            f"SELECT {', '.join(SUMMARY_ATTRIBUTES) if summary else '*'} "  # noqa: S608
+            f"FROM actions WHERE {' AND '.join(['1', *where])} {extra}"
+        )
+        return sql, [*values, *params]
+
+    @classmethod
+    def _select(
+        cls,
+        conditions: dict[str, Any],
+        max_age: int | None,
+        *,
+        summary: bool,
+        extra: str = "",
+        params: Sequence[Any] = (),
+    ) -> list[Self]:
+        rows = cls.database().execute(
+            *cls._query(
+                conditions, max_age, summary=summary, extra=extra, params=params
+            )
+        )
+        return [cls._from_row(row) for row in rows]
+
+    @classmethod
+    def _page(
+        cls,
+        max_age: int | None,
+        *,
+        limit: int | None,
+        cursor: str | None,
+        summary: bool,
+        **hash_key: str,
+    ) -> ActionPage[Self]:
+        """Return a page of the actions with the given `hash_key`, newest first.
+
+        The cursors have the format of the cursors of the DynamoDB indexes.
+        """
+        extra, params = "", []
+        if cursor:
+            key = decode_cursor(cursor, **hash_key)
+            try:
+                (updated_at,) = key["updated_at"].values()
+                (action_id,) = key["action_id"].values()
+                params = [float(updated_at), float(updated_at), action_id]
+            except ValueError as exc:
+                raise ValueError("Invalid cursor") from exc
+            extra = "AND (updated_at < ? OR (updated_at = ? AND action_id < ?)) "
+        extra += "ORDER BY updated_at DESC, action_id DESC"
+        if limit is not None:
+            # one more action tells whether there's a next page
+            extra += " LIMIT ?"
+            params.append(limit + 1)
+        actions = cls._select(
+            hash_key, max_age, summary=summary, extra=extra, params=params
+        )
+        if limit is None or len(actions) <= limit:
+            return ActionPage(items=actions, cursor=None)
+        last = actions[limit - 1]
+        return ActionPage(
+            items=actions[:limit],
+            cursor=encode_cursor({
+                "action_id": {"S": last.action_id},
+                "updated_at": {"N": repr(last.updated_at)},
+                **{name: {"S": value} for name, value in hash_key.items()},
+            }),
+        )
+
+    @classmethod
+    def find_by_owner(
+        cls,
+        username: str,
+        status: ActionStatus | None = None,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[Self]:
+        """Returns actions for owner, newest first; see `Action.find_by_owner`."""
+        if status:
+            return cls._page(
+                max_age,
+                limit=limit,
+                cursor=cursor,
+                summary=summary,
+                owner=username,
+                status=status.value,
+            )
+        return cls._page(
+            max_age, limit=limit, cursor=cursor, summary=summary, owner=username
+        )
+
+    @classmethod
+    def find_by_owner_after(
+        cls,
+        username: str,
+        after: str,
+        status: ActionStatus | None = None,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        summary: bool = False,
+    ) -> ActionPage[Self]:
+        """Returns actions for owner created after the action `after`, oldest first.
+
+        See `Action.find_by_owner_after`.
+        """
+        if not is_time_ordered(after):
+            raise ValueError("Invalid cursor: not a time-ordered action ID")
+        conditions = {"owner": username}
+        if status:
+            conditions["status"] = status.value
+        extra = "AND action_id > ? AND action_id <= ? ORDER BY action_id"
+        params: list[Any] = [
+            after,
+            action_id_bound(dt.now(UTC).timestamp() + ID_RANGE_CLOCK_SKEW_SECS),
+        ]
+        if limit is not None:
+            extra += " LIMIT ?"
+            params.append(limit + 1)
+        actions = cls._select(
+            conditions, max_age, summary=summary, extra=extra, params=params
+        )
+        if limit is None or len(actions) <= limit:
+            return ActionPage(items=actions, cursor=None)
+        return ActionPage(items=actions[:limit], cursor=actions[limit - 1].action_id)
+
+    @classmethod
+    def find_by_status(
+        cls,
+        status: ActionStatus,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[Self]:
+        """Returns actions of all owners with the given status, newest first."""
+        return cls._page(
+            max_age, limit=limit, cursor=cursor, summary=summary, status=status.value
+        )
+
+    @classmethod
+    def find_all(
+        cls,
+        statuses: Sequence[ActionStatus] = (),
+        name: str | None = None,
+        max_age: int | None = None,
+        *,
+        segments: int,  # noqa: ARG003 - a single query, see `Action.find_all`
+        summary: bool = False,
+    ) -> Iterator[Self]:
+        """Yields the actions of all owners in no particular order."""
+        extra, params = "", [s.value for s in statuses]
+        if statuses:
+            extra = f"AND status IN ({', '.join('?' * len(statuses))})"
+        rows = cls.database().iterate(
+            *cls._query(
+                {"name": name} if name else {},
+                max_age,
+                summary=summary,
+                extra=extra,
+                params=params,
+            )
+        )
+        return (cls._from_row(row) for row in rows)
+
+
+class SQLiteRateLimitCounter:
+    """`RateLimitCounter` stored in the database of the `SQLiteAction`s."""
+
+    @staticmethod
+    def _key(username: str, name: str) -> str:
+        return f"{username}#{name}"
+
+    @classmethod
+    def increment(cls, username: str, name: str) -> None:
+        """Count an action in the current window."""
+        start = window_start(dt.now(UTC).timestamp())
+        database = SQLiteAction.database()
+        database.execute(
+            "INSERT INTO rate_limit (key, window, ops) VALUES (?, ?, 1) "
+            "ON CONFLICT (key, window) DO UPDATE SET ops = ops + 1",
+            [cls._key(username, name), start],
+        )
+        # keep the window as long as it can be the previous window
+        database.execute(
+            "DELETE FROM rate_limit WHERE key = ? AND window < ?",
+            [cls._key(username, name), start - settings.rate_limit_window_secs],
+        )
+
+    @classmethod
+    def decrement(cls, username: str, name: str, created_at: float) -> None:
+        """Stop counting an action, e.g. because it has been cancelled."""
+        SQLiteAction.database().execute(
+            "UPDATE rate_limit SET ops = ops - 1 WHERE key = ? AND window = ? AND ops > 0",
+            [cls._key(username, name), window_start(created_at)],
+        )
+
+    @classmethod
+    def get_ops_count(cls, username: str, name: str) -> int:
+        """Return the estimated number of actions in the sliding window."""
+        now = dt.now(UTC).timestamp()
+        rows = SQLiteAction.database().execute(
+            "SELECT window, ops FROM rate_limit WHERE key = ? AND window >= ?",
+            [
+                cls._key(username, name),
+                window_start(now) - settings.rate_limit_window_secs,
+            ],
+        )
+        return estimate_ops_count(((row["window"], row["ops"]) for row in rows), now)
+
+
+class SQLiteActionStats:
+    """`ActionStats` stored in the database of the `SQLiteAction`s."""
+
+    @classmethod
+    def increment(cls, name: str, status: str, owner: str) -> None:
+        """Count an action that reached a final status in the current hour."""
+        hour = int(dt.now(UTC).timestamp() // HOUR_SECS * HOUR_SECS)
+        database = SQLiteAction.database()
+        database.execute(
+            "INSERT INTO action_stats (hour, name, status, owner, total) "
+            "VALUES (?, ?, ?, ?, 1) "
+            "ON CONFLICT (hour, name, status, owner) DO UPDATE SET total = total + 1",
+            [hour, name, status, owner],
+        )
+        database.execute(
+            "DELETE FROM action_stats WHERE hour < ?",
+            [hour - settings.action_stats_retention_days * 24 * HOUR_SECS],
+        )
+
+    @classmethod
+    def rollup(
+        cls,
+        since: dt,
+        until: dt,
+        group_by: Iterable[str],
+        *,
+        name: str | None = None,
+        status: str | None = None,
+        owner: str | None = None,
+    ) -> Counter[tuple]:
+        """Sum the counters of the hours between `since` and `until`.
+
+        See `ActionStats.rollup`.
+        """
+        group_by = tuple(group_by)
+        if not set(group_by).issubset(STATS_FIELDS):
+            raise ValueError(f"Unknown statistics fields: {group_by}")
+        filters = {
+            k: v
+            for k, v in {"name": name, "status": status, "owner": owner}.items()
+            if v
+        }
+        rows = SQLiteAction.database().execute(
+            f"SELECT {''.join(f'{field}, ' for field in group_by)}"  # noqa: S608
+            "sum(total) AS total FROM action_stats WHERE hour BETWEEN ? AND ? "
+            f"{''.join(f'AND {key} = ? ' for key in filters)}"
+            f"{'GROUP BY ' + ', '.join(group_by) if group_by else ''}",
+            [
+                int(since.timestamp() // HOUR_SECS * HOUR_SECS),
+                int(until.timestamp() // HOUR_SECS * HOUR_SECS),
+                *filters.values(),
+            ],
+        )
+        return Counter({
+            tuple(row[field] for field in group_by): row["total"]
+            for row in rows
+            if row["total"]
+        })
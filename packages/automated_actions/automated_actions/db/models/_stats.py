@@ -0,0 +1,129 @@
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from typing import TYPE_CHECKING
+
+from pynamodb.attributes import NumberAttribute, TTLAttribute, UnicodeAttribute
+from pynamodb.models import Model as PynamoModel
+
+from automated_actions.config import settings
+from automated_actions.db.models._base import Table
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+HOUR_SECS = 3600
+STATS_FIELDS = ("name", "status", "owner", "hour")
+# partitions per day; changing it hides the counters stored before
+STATS_SHARDS = 8
+
+# queries the partitions of a time range concurrently
+_executor = ThreadPoolExecutor(max_workers=STATS_SHARDS, thread_name_prefix="stats")
+
+
+class ActionStats(PynamoModel):
+    """Per (action name, final status, owner, hour) counter of finished actions.
+
+    The counters of a day are spread over `STATS_SHARDS` partitions, so
+    concurrent increments don't share a hot partition, and the counters of a
+    time range are read with one query per partition and day, no matter how
+    many actions finished.
+    """
+
+    class Meta(Table.Meta):
+        table_name = f"aa-{settings.environment}-action-stats"
+
+    @staticmethod
+    def _hour(timestamp: float) -> int:
+        return int(timestamp // HOUR_SECS * HOUR_SECS)
+
+    @staticmethod
+    def _day(hour: int) -> str:
+        return dt.fromtimestamp(hour, UTC).date().isoformat()
+
+    @staticmethod
+    def _shard(name: str, status: str, owner: str) -> int:
+        return zlib.crc32(f"{name}#{status}#{owner}".encode()) % STATS_SHARDS
+
+    @classmethod
+    def increment(cls, name: str, status: str, owner: str) -> None:
+        """Count an action that reached a final status in the current hour."""
+        hour = cls._hour(dt.now(UTC).timestamp())
+        cls(
+            f"{cls._day(hour)}#{cls._shard(name, status, owner)}",
+            f"{hour}#{name}#{status}#{owner}",
+        ).update(
+            actions=[
+                cls.total.add(1),
+                cls.hour.set(hour),
+                cls.name.set(name),
+                cls.status.set(status),
+                cls.owner.set(owner),
+                cls.expires_at.set(
+                    dt.fromtimestamp(hour, UTC)
+                    + timedelta(days=settings.action_stats_retention_days)
+                ),
+            ]
+        )
+
+    @classmethod
+    def rollup(
+        cls,
+        since: dt,
+        until: dt,
+        group_by: Iterable[str],
+        *,
+        name: str | None = None,
+        status: str | None = None,
+        owner: str | None = None,
+    ) -> Counter[tuple]:
+        """Sum the counters of the hours between `since` and `until`.
+
+        Returns the totals keyed by the values of the `group_by` attributes
+        (see `STATS_FIELDS`) of the counters matching the given filters.
+        """
+        group_by = tuple(group_by)
+        filters = {
+            k: v
+            for k, v in {"name": name, "status": status, "owner": owner}.items()
+            if v
+        }
+        first = cls._hour(since.timestamp())
+        last = cls._hour(until.timestamp())
+        days = []
+        day = dt.fromtimestamp(first, UTC).date()
+        while day <= dt.fromtimestamp(last, UTC).date():
+            days.append(day.isoformat())
+            day += timedelta(days=1)
+
+        def query(partition: str) -> list[ActionStats]:
+            # all range keys of the hours between first and last: '$' sorts
+            # right after the '#' separator
+            return list(
+                cls.query(partition, cls.bucket.between(f"{first}#", f"{last}$"))
+            )
+
+        totals: Counter[tuple] = Counter()
+        for counters in _executor.map(
+            query, [f"{d}#{shard}" for d in days for shard in range(STATS_SHARDS)]
+        ):
+            for counter in counters:
+                if any(getattr(counter, k) != v for k, v in filters.items()):
+                    continue
+                totals[tuple(getattr(counter, f) for f in group_by)] += int(
+                    counter.total
+                )
+        return totals
+
+    # "<UTC date of the hour>#<shard>"
+    day = UnicodeAttribute(hash_key=True)
+    # "<hour>#<name>#<status>#<owner>"
+    bucket = UnicodeAttribute(range_key=True)
+    hour = NumberAttribute()
+    name = UnicodeAttribute()
+    status = UnicodeAttribute()
+    owner = UnicodeAttribute()
+    total = NumberAttribute(default=0)
+    expires_at = TTLAttribute(null=True)
@@ -1,11 +1,16 @@
+import logging
+import threading
 from typing import Self
 
 from pydantic import BaseModel
 from pynamodb.attributes import ListAttribute, UnicodeAttribute
 
+from automated_actions.cache import TTLCache
 from automated_actions.config import settings
 from automated_actions.db.models._base import Table
 
+log = logging.getLogger(__name__)
+
 
 class UserSchemaIn(BaseModel):
     name: str
@@ -28,21 +33,66 @@ class User(Table[UserSchemaIn, UserSchemaOut]):
 
     @classmethod
     def load(cls, username: str, name: str, email: str) -> Self:
+        """Load (or create) a user and keep name and username up to date.
+
+        Users are cached per process; a cached user is returned without any
+        DynamoDB read as long as name and username didn't change.
+        """
+        user = _users.get(email)
+        if user and user.username == username and user.name == name:
+            return user  # type: ignore[return-value]
+
         try:
             user = cls.get(email)
-            if user.username == username and user.name == name:
-                # avoid unnecessary updates
-                return user
-            user.update(actions=[cls.name.set(name), cls.username.set(username)])
-            return user
+            if user.username != username or user.name != name:
+                user.update(actions=[cls.name.set(name), cls.username.set(username)])
         except cls.DoesNotExist:
-            return cls.create(UserSchemaIn(name=name, username=username, email=email))
+            user = cls.create(UserSchemaIn(name=name, username=username, email=email))
+        _users.set(email, user)
+        return user
 
     def set_allowed_actions(self, allowed_actions: list[str]) -> None:
+        """Update the allowed actions.
+
+        The update is written behind: it's queued and written by the next
+        `flush_allowed_actions` call, and consecutive updates of the same user
+        are coalesced into one write.
+        """
         if set(allowed_actions) == set(self.allowed_actions):
             # avoid unnecessary update
             return
-        self.update(actions=[User.allowed_actions.set(allowed_actions)])
+        if settings.user_cache_flush_interval_secs <= 0:
+            self.update(actions=[User.allowed_actions.set(allowed_actions)])
+            return
+        self.allowed_actions = list(allowed_actions)
+        with _pending_lock:
+            _pending[self.email] = self
+
+    @classmethod
+    def flush_allowed_actions(cls) -> int:
+        """Write all queued allowed actions updates and return the number of writes."""
+        with _pending_lock:
+            pending = list(_pending.values())
+            _pending.clear()
+
+        written = 0
+        for user in pending:
+            try:
+                user.update(actions=[User.allowed_actions.set(user.allowed_actions)])
+                written += 1
+            except Exception:
+                log.exception(f"Failed to update allowed actions of {user.email}")
+                with _pending_lock:
+                    # retry with the next flush unless superseded in the meantime
+                    _pending.setdefault(user.email, user)
+        return written
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached users and queued updates."""
+        _users.clear()
+        with _pending_lock:
+            _pending.clear()
 
     # We use the user's email as key because it is unique
     # and generally available in the OIDC providers.
@@ -55,3 +105,11 @@ class User(Table[UserSchemaIn, UserSchemaOut]):
     # via the `me` endpoint.
     # It is not used for authorization, which is done via OPA policies.
     allowed_actions: ListAttribute = ListAttribute(default=list)
+
+
+_users = TTLCache[str, User](
+    maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl_secs
+)
+# users with not yet written allowed_actions updates
+_pending: dict[str, User] = {}
+_pending_lock = threading.Lock()
@@ -0,0 +1,29 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from automated_actions.config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Blocking DynamoDB (PynamoDB) and SQS calls of the API run in their own thread
+# pool instead of the default executor of the event loop, which is bounded at
+# min(32, cpus + 4) threads and shared with everything else using
+# asyncio.to_thread.
+_db_executor = ThreadPoolExecutor(
+    max_workers=settings.db_threads, thread_name_prefix="db"
+)
+
+
+async def run_blocking[T](func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call in the database thread pool.
+
+    Like `asyncio.to_thread`, the current context is propagated to the call.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_db_executor, call)
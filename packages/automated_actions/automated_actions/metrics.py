@@ -0,0 +1,25 @@
+from prometheus_client import Counter, Histogram
+
+oidc_userinfo_cache = Counter(
+    name="automated_actions_oidc_userinfo_cache",
+    documentation="OIDC userinfo validation cache lookups.",
+    labelnames=["result"],
+)
+
+authz_capability_token = Counter(
+    name="automated_actions_authz_capability_token",
+    documentation="Capability tokens issued and presented, by result.",
+    labelnames=["result"],
+)
+
+opa_decision_cache = Counter(
+    name="automated_actions_opa_decision_cache",
+    documentation="OPA decision cache lookups.",
+    labelnames=["result"],
+)
+
+opa_query_duration = Histogram(
+    name="automated_actions_opa_query_duration_seconds",
+    documentation="OPA query latency.",
+    labelnames=["rule"],
+)
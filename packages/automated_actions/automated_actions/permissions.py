@@ -0,0 +1,70 @@
+import re
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Permission(BaseModel):
+    """A compiled role permission of the `authz` policy data."""
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
+    obj: str
+    max_ops: Any = None
+    # None means the parameter must not be given at all; a permission without
+    # params (None) authorizes no request, like the Rego `valid_params` rule
+    params: dict[str, re.Pattern[str] | None] | None
+
+    @classmethod
+    def compile(cls, permission: dict[str, Any]) -> Permission:
+        return cls(
+            obj=permission["obj"],
+            max_ops=permission.get("max_ops"),
+            params={
+                key: None if value is None else re.compile(str(value), re.IGNORECASE)
+                for key, value in (permission["params"] or {}).items()
+            }
+            if "params" in permission
+            else None,
+        )
+
+    def valid_params(self, params: dict[str, Any]) -> bool:
+        if self.params is None:
+            return False
+        for key, pattern in self.params.items():
+            if pattern is None:
+                if key in params:
+                    return False
+            else:
+                value = params.get(key)
+                if not isinstance(value, str) or not pattern.search(value):
+                    return False
+        return True
+
+    def within_rate_limit(self, ops_count: int) -> bool:
+        if isinstance(self.max_ops, bool) or not isinstance(self.max_ops, int | float):
+            # no (numeric) limit defined
+            return True
+        return self.max_ops == 0 or ops_count < self.max_ops
+
+    def dump(self) -> dict[str, Any]:
+        """Return the permission in the format of the policy data."""
+        permission: dict[str, Any] = {"obj": self.obj, "max_ops": self.max_ops}
+        if self.params is not None:
+            permission["params"] = {
+                key: None if pattern is None else pattern.pattern
+                for key, pattern in self.params.items()
+            }
+        return permission
+
+
+def decide(
+    permissions: list[Permission], obj: str, params: dict[str, Any], ops_count: int
+) -> dict[str, Any]:
+    """Return the `authz` policy decisions for a list of permissions of a user."""
+    matching = [p for p in permissions if p.obj in {obj, "*"}]
+    return {
+        "authorized": any(p.valid_params(params) for p in matching),
+        "within_rate_limits": any(p.within_rate_limit(ops_count) for p in matching),
+        "objects": sorted({p.obj for p in permissions}),
+    }
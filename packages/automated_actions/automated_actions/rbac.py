@@ -0,0 +1,201 @@
+import logging
+from collections import defaultdict
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import yaml
+
+from automated_actions.auth import Authorizer, UserModelProtocol
+from automated_actions.permissions import Permission
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from automated_actions.auth import CapabilityToken
+
+log = logging.getLogger(__name__)
+
+ROLES_FILE_SUFFIXES = {".yml", ".yaml", ".json"}
+
+
+class RolesIndex:
+    """Permissions of the `users` and `roles` policy data, indexed by user and obj."""
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        users: dict[str, list[str]] = data.get("users") or {}
+        roles: dict[str, list[Permission]] = {
+            name: [Permission.compile(p) for p in permissions or []]
+            for name, permissions in (data.get("roles") or {}).items()
+        }
+        default_roles = users.get("*") or []
+        self.default = self._index(default_roles, roles)
+        self.users = {
+            username: self._index([*user_roles, *default_roles], roles)
+            for username, user_roles in users.items()
+            if username != "*"
+        }
+        self.objects = {
+            username: sorted(index) for username, index in self.users.items()
+        }
+        self.default_objects = sorted(self.default)
+
+    @staticmethod
+    def _index(
+        role_names: Iterable[str], roles: dict[str, list[Permission]]
+    ) -> dict[str, list[Permission]]:
+        index: dict[str, list[Permission]] = defaultdict(list)
+        for role_name in role_names:
+            for permission in roles.get(role_name, []):
+                index[permission.obj].append(permission)
+        return dict(index)
+
+    def permissions(self, username: str, obj: str) -> list[Permission]:
+        """Return the permissions of a user matching the given obj."""
+        index = self.users.get(username, self.default)
+        return [*index.get(obj, []), *(index.get("*", []) if obj != "*" else [])]
+
+    def user_objects(self, username: str) -> list[str]:
+        return self.objects.get(username, self.default_objects)
+
+    def user_permissions(self, username: str) -> list[Permission]:
+        """Return all permissions of a user."""
+        index = self.users.get(username, self.default)
+        return [
+            permission for permissions in index.values() for permission in permissions
+        ]
+
+
+def load_roles_data(paths: Iterable[Path]) -> dict[str, Any]:
+    """Load and merge the `users` and `roles` data of YAML/JSON files and directories."""
+    data: dict[str, dict[str, Any]] = {"users": {}, "roles": {}}
+    for path in roles_files(paths):
+        content = yaml.safe_load(path.read_text()) or {}
+        for key in ("users", "roles"):
+            data[key].update(content.get(key) or {})
+    return data
+
+
+def roles_files(paths: Iterable[Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    file
+                    for file in path.rglob("*")
+                    if file.suffix in ROLES_FILE_SUFFIXES
+                    and not any(
+                        part.startswith(".") for part in file.relative_to(path).parts
+                    )
+                )
+            )
+        else:
+            files.append(path)
+    return files
+
+
+class RBAC[UserModel: UserModelProtocol](Authorizer[UserModel]):
+    """In-process implementation of the `authz` OPA policy.
+
+    Loads the same roles data as OPA and reloads it when the files change.
+    """
+
+    def __init__(
+        self,
+        roles_paths: Iterable[Path | str],
+        skip_endpoints: list[str] | None = None,
+        ops_counter: Callable[[str, str], int] | None = None,
+        rate_limited_tags: Iterable[str] = ("Actions",),
+        reload_interval_secs: float = 10,
+        capability_token: CapabilityToken | None = None,
+    ) -> None:
+        super().__init__(
+            skip_endpoints=skip_endpoints,
+            ops_counter=ops_counter,
+            rate_limited_tags=rate_limited_tags,
+            capability_token=capability_token,
+        )
+        self.roles_paths = [Path(path) for path in roles_paths]
+        self.reload_interval_secs = reload_interval_secs
+        self._files_state = self._roles_files_state()
+        self.index = RolesIndex(load_roles_data(self.roles_paths))
+        self._last_reload_check = monotonic()
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any], **kwargs: Any) -> RBAC[UserModel]:
+        """Create an authorizer for the given `users` and `roles` data."""
+        rbac = cls(roles_paths=[], reload_interval_secs=0, **kwargs)
+        rbac.index = RolesIndex(data)
+        return rbac
+
+    def _roles_files_state(self) -> dict[Path, float]:
+        return {path: path.stat().st_mtime for path in roles_files(self.roles_paths)}
+
+    def reload_if_changed(self) -> None:
+        if (
+            not self.reload_interval_secs
+            or monotonic() - self._last_reload_check < self.reload_interval_secs
+        ):
+            return
+        self._last_reload_check = monotonic()
+        try:
+            if (state := self._roles_files_state()) == self._files_state:
+                return
+            self.index = RolesIndex(load_roles_data(self.roles_paths))
+            self._files_state = state
+            log.info("Roles data reloaded")
+        except Exception:
+            # keep serving the last known good roles data
+            log.exception("Unable to reload the roles data")
+
+    def authorized(self, username: str, obj: str, params: dict[str, Any]) -> bool:
+        return any(
+            permission.valid_params(params)
+            for permission in self.index.permissions(username, obj)
+        )
+
+    def within_rate_limits(self, username: str, obj: str, ops_count: int) -> bool:
+        return any(
+            permission.within_rate_limit(ops_count)
+            for permission in self.index.permissions(username, obj)
+        )
+
+    async def decide(
+        self,
+        user: UserModel,
+        obj: str,
+        params: dict[str, str],
+        ops_count: int | None = None,
+    ) -> dict[str, Any]:
+        self.reload_if_changed()
+        return {
+            "authorized": self.authorized(user.username, obj, params),
+            "within_rate_limits": self.within_rate_limits(
+                user.username, obj, ops_count or 0
+            ),
+            "objects": self.index.user_objects(user.username),
+        }
+
+    async def user_permissions(self, user: UserModel) -> list[dict[str, Any]]:
+        self.reload_if_changed()
+        return [
+            permission.dump()
+            for permission in self.index.user_permissions(user.username)
+        ]
+
+    async def decide_batch(
+        self, user: UserModel, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        self.reload_if_changed()
+        return [
+            {
+                "authorized": self.authorized(
+                    user.username, item["obj"], item.get("params") or {}
+                ),
+                "within_rate_limits": self.within_rate_limits(
+                    user.username, item["obj"], item.get("ops_count") or 0
+                ),
+            }
+            for item in items
+        ]
@@ -0,0 +1,83 @@
+"""Benchmark: per-operation latency of the local action storage backends.
+
+Runs the `ActionManager` operations of an action's life (create, claim,
+finish, list a page of the owner's actions, get) against the `memory` and
+`sqlite` backends (see `AA_ACTION_BACKEND`):
+
+    uv run python benchmarks/action_backends.py [ACTIONS]
+"""
+
+import os
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, NamedTuple
+
+os.environ.setdefault("AA_OIDC_CLIENT_ID", "benchmark")
+os.environ.setdefault("AA_OIDC_CLIENT_SECRET", "benchmark")
+os.environ.setdefault("AA_SESSION_SECRET", "benchmark")
+os.environ.setdefault("AA_TOKEN_SECRET", "benchmark")
+os.environ.setdefault("AA_ENVIRONMENT", "benchmark")
+
+from automated_actions.db.models import (
+    ActionManager,
+    ActionSchemaIn,
+    ActionStatus,
+    SQLiteAction,
+)
+
+OWNERS = 10
+PAGE_SIZE = 20
+
+
+class User(NamedTuple):
+    username: str
+
+
+def run(actions: int) -> dict[str, list[float]]:
+    """Return the latencies of each operation."""
+    action_mgr = ActionManager[Any](SQLiteAction)
+    latencies: dict[str, list[float]] = {}
+
+    def timed(operation: str, func: Any, *args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        result = func(*args, **kwargs)
+        latencies.setdefault(operation, []).append(perf_counter() - start)
+        return result
+
+    for i in range(actions):
+        owner = User(f"user-{i % OWNERS}")
+        action = timed(
+            "create",
+            SQLiteAction.create,
+            ActionSchemaIn(name="no-op", owner=owner.username),
+        )
+        timed("start", action.start)
+        timed("finish", action.set_final_state, ActionStatus.SUCCESS, "ok", {})
+        timed("list page", action_mgr.get_user_actions, owner.username, limit=PAGE_SIZE)
+        timed("get", action_mgr.get_or_404, action.action_id)
+    return latencies
+
+
+def main(actions: int) -> None:
+    with TemporaryDirectory() as tmp:
+        backends = {"memory": ":memory:", "sqlite": str(Path(tmp) / "actions.db")}
+        print(f"{actions} actions of {OWNERS} owners, median latency")
+        print(f"{'operation':>10}" + "".join(f"{b:>12}" for b in backends))
+        results = {}
+        for backend, path in backends.items():
+            SQLiteAction.connect(path)
+            results[backend] = run(actions)
+        for operation in results["memory"]:
+            print(
+                f"{operation:>10}"
+                + "".join(
+                    f"{median(results[b][operation]) * 1e6:>9.0f} us" for b in backends
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
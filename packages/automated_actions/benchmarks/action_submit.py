@@ -0,0 +1,159 @@
+"""Benchmark: API-side latency of submitting an action.
+
+Compares the sequential path (store the action, count it, then enqueue the
+task) to `ActionManager.submit_action`, which runs the DynamoDB writes and the
+SQS send concurrently in the database thread pool (`AA_DB_THREADS`). By
+default, the DynamoDB and SQS calls are simulated with fixed latencies; pass
+other values to match your environment:
+
+    uv run python benchmarks/action_submit.py [PUT_MS] [SEND_MS] [REQUESTS]
+
+With `localstack`, the actions are stored in the DynamoDB tables and their
+tasks sent to the SQS queue of the configured endpoints (`AA_DYNAMODB_URL`,
+`AA_SQS_URL`; e.g., `docker compose up localstack`):
+
+    uv run python benchmarks/action_submit.py localstack [REQUESTS]
+"""
+
+import asyncio
+import os
+import sys
+from statistics import median, quantiles
+from time import perf_counter, sleep
+from typing import Any, Self
+
+os.environ.setdefault("AA_OIDC_CLIENT_ID", "benchmark")
+os.environ.setdefault("AA_OIDC_CLIENT_SECRET", "benchmark")
+os.environ.setdefault("AA_SESSION_SECRET", "benchmark")
+os.environ.setdefault("AA_TOKEN_SECRET", "benchmark")
+os.environ.setdefault("AA_ENVIRONMENT", "benchmark")
+
+import boto3
+
+from automated_actions.config import settings
+from automated_actions.db.models import (
+    Action,
+    ActionManager,
+    ActionSchemaIn,
+    RateLimitCounter,
+)
+
+
+class Latency:
+    put_secs = 0.008
+    send_secs = 0.012
+
+
+class ActionStub:
+    def __init__(self, name: str, owner: str) -> None:
+        self.action_id = "benchmark"
+        self.name = name
+        self.owner = owner
+        self.status = "PENDING"
+        self.created_at = 0.0
+
+    @classmethod
+    def new(cls, params: ActionSchemaIn) -> Self:
+        return cls(params.name, params.owner)
+
+    @classmethod
+    def create(cls, params: ActionSchemaIn) -> Self:
+        action = cls.new(params)
+        action.save()
+        return action
+
+    def save(self) -> None:  # noqa: PLR6301
+        sleep(Latency.put_secs)
+
+
+class CounterStub:
+    @classmethod
+    def increment(cls, username: str, name: str) -> None:  # noqa: ARG003
+        sleep(Latency.put_secs)
+
+
+class User:
+    username = "benchmark"
+
+
+def enqueue() -> None:
+    sleep(Latency.send_secs)
+
+
+def sequential(action_mgr: ActionManager[Any], enqueue: Any) -> None:
+    action_mgr.klass.create(ActionSchemaIn(name="no-op", owner=User.username))
+    if action_mgr.counter:
+        action_mgr.counter.increment(User.username, "no-op")
+    enqueue()
+
+
+async def concurrent(action_mgr: ActionManager[Any], enqueue: Any) -> None:
+    await action_mgr.submit_action(
+        action_mgr.new_action("no-op", User()), enqueue=enqueue
+    )
+
+
+def localstack() -> tuple[ActionManager[Any], Any]:
+    """Return the action manager and enqueue function of the localstack services."""
+    for table in (Action, RateLimitCounter):
+        table.create_table(wait=True)
+    sqs = boto3.client(
+        "sqs",
+        endpoint_url=settings.sqs_url.rsplit("/", 2)[0],
+        region_name=settings.broker_aws_region,
+        aws_access_key_id=settings.broker_aws_access_key_id,
+        aws_secret_access_key=settings.broker_aws_secret_access_key,
+    )
+    queue_url = sqs.create_queue(QueueName=settings.sqs_url.rsplit("/", 1)[1])[
+        "QueueUrl"
+    ]
+
+    def send() -> None:
+        sqs.send_message(QueueUrl=queue_url, MessageBody="{}")
+
+    return ActionManager[Any](Action, counter=RateLimitCounter), send
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    p99 = quantiles(latencies, n=100)[98]
+    print(
+        f"{label:>12} p50 {median(latencies) * 1000:>6.1f} ms"
+        f"  p99 {p99 * 1000:>6.1f} ms"
+    )
+
+
+async def main(requests: int, *, use_localstack: bool = False) -> None:
+    if use_localstack:
+        action_mgr, send = localstack()
+    else:
+        action_mgr = ActionManager[Any](ActionStub, counter=CounterStub)
+        send = enqueue
+    seq, conc = [], []
+    for _ in range(requests):
+        start = perf_counter()
+        await asyncio.to_thread(sequential, action_mgr, send)
+        seq.append(perf_counter() - start)
+        start = perf_counter()
+        await concurrent(action_mgr, send)
+        conc.append(perf_counter() - start)
+    if use_localstack:
+        print(f"localstack {settings.dynamodb_url}, {requests} requests")
+    else:
+        print(
+            f"simulated put {Latency.put_secs * 1000:.0f} ms, "
+            f"send {Latency.send_secs * 1000:.0f} ms, {requests} requests"
+        )
+    _report("sequential", seq)
+    _report("concurrent", conc)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["localstack"]:
+        asyncio.run(main(int(args[1]) if len(args) > 1 else 200, use_localstack=True))
+        sys.exit()
+    if args:
+        Latency.put_secs = float(args[0]) / 1000
+    if len(args) > 1:
+        Latency.send_secs = float(args[1]) / 1000
+    asyncio.run(main(int(args[2]) if len(args) > 2 else 200))  # noqa: PLR2004
@@ -0,0 +1,72 @@
+"""Microbenchmark: added latency of the token revocation check per request.
+
+Compares `BearerTokenAuth.get_user_info` without a revocation list to the
+same call with revocation lists of increasing size.
+
+    uv run python benchmarks/token_revocation.py
+"""
+
+import os
+import timeit
+from datetime import UTC
+from datetime import datetime as dt
+from datetime import timedelta as td
+from typing import Any, Self
+from uuid import uuid4
+
+os.environ.setdefault("AA_OIDC_CLIENT_ID", "benchmark")
+os.environ.setdefault("AA_OIDC_CLIENT_SECRET", "benchmark")
+os.environ.setdefault("AA_SESSION_SECRET", "benchmark")
+os.environ.setdefault("AA_TOKEN_SECRET", "benchmark")
+
+from automated_actions.auth import (
+    BearerTokenAuth,
+    TokenRevocationList,
+)
+
+NUMBER = 20_000
+REPEAT = 5
+SIZES = (0, 1_000, 100_000)
+
+
+class User:
+    def __init__(self, username: str) -> None:
+        self.username = username
+
+    @classmethod
+    def load(cls, username: str, **_: Any) -> Self:
+        return cls(username)
+
+
+def _best_us(stmt: str, **variables: Any) -> float:
+    """Return the best per-call time of the statement in microseconds."""
+    times = timeit.repeat(stmt, number=NUMBER, repeat=REPEAT, globals=variables)
+    return min(times) / NUMBER * 1e6
+
+
+def main() -> None:
+    secret = "benchmark-secret-with-at-least-32-bytes"  # noqa: S105
+    auth = BearerTokenAuth[User](issuer="bench", secret=secret, user_model=User)  # type: ignore[type-var]
+    token = auth.create_token(
+        username="user",
+        name="name",
+        email="user@example.com",
+        expiration=dt.now(UTC) + td(hours=1),
+    )
+    jti = auth.decode_token(token).jti or ""
+
+    baseline = _best_us("auth.get_user_info(token)", auth=auth, token=token)
+    print(f"get_user_info without revocation list: {baseline:.2f} us")
+    print(f"{'revoked IDs':>12} {'check':>10} {'get_user_info':>15}")
+    for size in SIZES:
+        ids = {str(uuid4()) for _ in range(size)}
+        revocations = TokenRevocationList(load=lambda ids=ids: ids, store=print)
+        revocations.refresh()
+        auth.revocations = revocations
+        check = _best_us("jti in revocations", jti=jti, revocations=revocations)
+        with_check = _best_us("auth.get_user_info(token)", auth=auth, token=token)
+        print(f"{size:>12} {check * 1000:>7.0f} ns {with_check:>12.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,35 @@
 # ruff: noqa: ARG003
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING
 
 import pytest
 from fastapi import FastAPI, status
 from pynamodb.attributes import DynamicMapAttribute
 
+from automated_actions.api.v1.views.action import etag_matches, final_actions
+from automated_actions.config import settings
 from automated_actions.db.models import (
+    ActionEvent,
     ActionManager,
+    ActionPage,
+    ActionSchemaIn,
     ActionSchemaOut,
+    ActionSchemaSummary,
     ActionStatus,
+    SQLiteAction,
+    decode_cursor,
+    encode_cursor,
     get_action_manager,
 )
+from automated_actions.db.models._sqlite import ActionDatabase  # noqa: PLC2701
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from fastapi.testclient import TestClient
-
-    from automated_actions.db.models._action import ActionSchemaIn
+    from pytest_mock import MockerFixture
 
 
 class ActionStub(ActionSchemaOut):
@@ -28,15 +38,27 @@ class ActionStub(ActionSchemaOut):
     def dump(self) -> ActionSchemaOut:
         return self
 
+    def dump_summary(self) -> ActionSchemaSummary:
+        return ActionSchemaSummary(**self.model_dump())
+
     @classmethod
     def find_by_owner(
         cls,
         username: str,
         status: ActionStatus | None = None,
         max_age: int | None = None,
-    ) -> list[ActionStub]:
-        """Stub method to return a list of actions."""
-        return [
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[ActionStub]:
+        """Stub method to return a page of actions."""
+        start = (
+            int(decode_cursor(cursor, owner=username)["action_id"]["S"])
+            if cursor
+            else 0
+        )
+        actions = [
             ActionStub(
                 action_id="1",
                 name="test action",
@@ -59,7 +81,17 @@ class ActionStub(ActionSchemaOut):
                     attribute_values={}, key1="value1", key2="value2"
                 ),
             ),
-        ]
+        ][start : start + (limit or 2)]
+        return ActionPage(
+            items=actions,
+            cursor=encode_cursor({
+                "action_id": {"S": actions[-1].action_id},
+                "owner": {"S": username},
+                "updated_at": {"N": "2"},
+            })
+            if actions[-1].action_id == "1"
+            else None,
+        )
 
     @classmethod
     def get_or_404(cls, action_id: str) -> ActionStub:
@@ -74,6 +106,21 @@ class ActionStub(ActionSchemaOut):
                 created_at=1.0,
                 updated_at=2.0,
                 task_args=None,
+                history=[
+                    ActionEvent(event="PENDING", at=1.0),
+                    ActionEvent(event="RUNNING", at=3.0, attempt=0),
+                    ActionEvent(event="RETRY", at=4.0, attempt=0, error="boom"),
+                    ActionEvent(event="RUNNING", at=9.0, attempt=1),
+                ],
+            )
+        if action_id == "2":
+            return ActionStub(
+                action_id=action_id,
+                name="test action 2",
+                status=ActionStatus.SUCCESS,
+                owner="test_user",
+                created_at=1.0,
+                updated_at=3.0,
             )
         raise ValueError("Action not found")
 
@@ -120,6 +167,9 @@ def test_action_list(
             "created_at": 1.0,
             "updated_at": 2.0,
             "task_args": {},
+            "history": None,
+            "queue_wait_secs": None,
+            "run_secs": None,
         },
         {
             "name": "test action 2",
@@ -130,8 +180,176 @@ def test_action_list(
             "created_at": 1.0,
             "updated_at": 2.0,
             "task_args": {"key1": "value1", "key2": "value2"},
+            "history": None,
+            "queue_wait_secs": None,
+            "run_secs": None,
         },
     ]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_action_list_pagination(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    test_client = client(testing_app)
+    url = testing_app.url_path_for("action_list")
+    response = test_client.get(url, params={"limit": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert [action["action_id"] for action in response.json()] == ["1"]
+
+    response = test_client.get(
+        url, params={"limit": 1, "cursor": response.headers["X-Next-Cursor"]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [action["action_id"] for action in response.json()] == ["2"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_action_list_summary(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    response = client(testing_app).get(
+        testing_app.url_path_for("action_list"),
+        params={"fields": "summary", "limit": 1},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {
+            "name": "test action",
+            "owner": "test_user",
+            "status": "SUCCESS",
+            "action_id": "1",
+            "created_at": 1.0,
+            "updated_at": 2.0,
+        }
+    ]
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_action_list_ndjson(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient], mocker: MockerFixture
+) -> None:
+    find_by_owner = mocker.spy(ActionStub, "find_by_owner")
+    with client(testing_app).stream(
+        "GET",
+        testing_app.url_path_for("action_list"),
+        params={"limit": 1},
+        headers={"Accept": "application/x-ndjson"},
+    ) as response:
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        actions = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert [a["action_id"] for a in actions] == ["1", "2"]
+    assert actions[1]["task_args"] == {"key1": "value1", "key2": "value2"}
+    # one page at a time
+    assert [c.kwargs["limit"] for c in find_by_owner.call_args_list] == [1, 1]
+
+
+def test_action_list_ndjson_summary(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    response = client(testing_app).get(
+        testing_app.url_path_for("action_list"),
+        params={"fields": "summary"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    actions = [json.loads(line) for line in response.text.splitlines()]
+    assert [a["action_id"] for a in actions] == ["1", "2"]
+    assert all("task_args" not in a for a in actions)
+
+
+def test_action_list_ndjson_invalid_cursor(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    response = client(testing_app).get(
+        testing_app.url_path_for("action_list"),
+        params={"cursor": "invalid"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_action_list_memory_backend(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], mocker: MockerFixture
+) -> None:
+    mocker.patch.object(settings, "action_backend", "memory")
+    mocker.patch.object(SQLiteAction, "_database", ActionDatabase(":memory:"))
+    actions = [
+        SQLiteAction.create(ActionSchemaIn(name="no-op", owner=owner))
+        for owner in ("test_user", "test_user", "other")
+    ]
+    test_client = client(app)
+    url = app.url_path_for("action_list")
+
+    first = test_client.get(url, params={"limit": 1})
+    second = test_client.get(
+        url, params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]}
+    )
+    cancel = test_client.post(
+        app.url_path_for("action_cancel", action_id=actions[0].action_id)
+    )
+
+    assert [a["action_id"] for a in first.json() + second.json()] == [
+        actions[1].action_id,
+        actions[0].action_id,
+    ]
+    assert "X-Next-Cursor" not in second.headers
+    assert cancel.status_code == status.HTTP_202_ACCEPTED
+    assert SQLiteAction.get_or_404(actions[0].action_id).status == "CANCELLED"
+
+
+def test_action_list_after(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], mocker: MockerFixture
+) -> None:
+    mocker.patch.object(settings, "action_backend", "memory")
+    mocker.patch.object(SQLiteAction, "_database", ActionDatabase(":memory:"))
+    first, *actions = [
+        SQLiteAction.create(ActionSchemaIn(name="no-op", owner="test_user"))
+        for _ in range(3)
+    ]
+    test_client = client(app)
+    url = app.url_path_for("action_list")
+
+    page = test_client.get(url, params={"after": first.action_id, "limit": 1})
+    # the cursor of an ID range page is the ID of its last action
+    assert page.headers["X-Next-Cursor"] == actions[0].action_id
+    last = test_client.get(
+        url,
+        params={
+            "after": first.action_id,
+            "limit": 1,
+            "cursor": page.headers["X-Next-Cursor"],
+        },
+    )
+
+    assert [a["action_id"] for a in page.json() + last.json()] == [
+        a.action_id for a in actions
+    ]
+    assert (
+        test_client.get(url, params={"after": "1"}).status_code
+        == status.HTTP_400_BAD_REQUEST
+    )
+
+
+@pytest.mark.parametrize("limit", [0, 1001])
+def test_action_list_invalid_limit(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient], limit: int
+) -> None:
+    response = client(testing_app).get(
+        testing_app.url_path_for("action_list"), params={"limit": limit}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_action_list_invalid_cursor(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    response = client(testing_app).get(
+        testing_app.url_path_for("action_list"), params={"cursor": "invalid"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor"}
 
 
 def test_action_detail(
@@ -150,7 +368,65 @@ def test_action_detail(
         "created_at": 1.0,
         "updated_at": 2.0,
         "task_args": {},
+        "history": [
+            {"event": "PENDING", "at": 1.0, "attempt": None, "error": None},
+            {"event": "RUNNING", "at": 3.0, "attempt": 0, "error": None},
+            {"event": "RETRY", "at": 4.0, "attempt": 0, "error": "boom"},
+            {"event": "RUNNING", "at": 9.0, "attempt": 1, "error": None},
+        ],
+        "queue_wait_secs": 2.0,
+        "run_secs": None,
     }
+    assert response.headers["ETag"] == '"2.0-RUNNING"'
+
+
+def test_action_detail_not_modified(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    test_client = client(testing_app)
+    url = testing_app.url_path_for("action_detail", action_id="1")
+
+    response = test_client.get(url, headers={"If-None-Match": '"2.0-RUNNING"'})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == '"2.0-RUNNING"'
+    assert not response.content
+
+    response = test_client.get(url, headers={"If-None-Match": '"1.0-PENDING"'})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_action_detail_final_action_cached(
+    testing_app: FastAPI, client: Callable[[FastAPI], TestClient], mocker: MockerFixture
+) -> None:
+    final_actions.clear()
+    get_or_404 = mocker.spy(ActionStub, "get_or_404")
+    test_client = client(testing_app)
+
+    for action_id in ("1", "1", "2", "2"):
+        response = test_client.get(
+            testing_app.url_path_for("action_detail", action_id=action_id)
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["action_id"] == action_id
+
+    # running actions are read every time, finished ones only once
+    assert [c.args[0] for c in get_or_404.call_args_list] == ["1", "1", "2"]
+    assert response.headers["ETag"] == '"3.0-SUCCESS"'
+    final_actions.clear()
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        ('"1.0-SUCCESS"', True),
+        ('W/"1.0-SUCCESS"', True),
+        ('"2.0-RUNNING", "1.0-SUCCESS"', True),
+        ("*", True),
+        ('"2.0-RUNNING"', False),
+    ],
+)
+def test_etag_matches(if_none_match: str, *, expected: bool) -> None:
+    assert etag_matches(if_none_match, '"1.0-SUCCESS"') is expected
 
 
 def test_action_cancel(
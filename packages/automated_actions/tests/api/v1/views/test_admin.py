@@ -1,10 +1,23 @@
-from datetime import UTC
+import json
+from datetime import UTC, date
 from datetime import datetime as dt
 from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
 
 import jwt
 from fastapi import FastAPI, status
 
+from automated_actions.auth import TokenRevocationList
+from automated_actions.db.archive import ActionArchive, get_action_archive
+from automated_actions.db.models import (
+    ActionManager,
+    ActionPage,
+    ActionSchemaOut,
+    ActionSchemaSummary,
+    ActionStatus,
+    get_action_manager,
+)
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
@@ -40,3 +53,181 @@ def test_admin_create_token(
     assert token["exp"] == expiration_timestamp
     assert token["iat"] >= now
     assert token["iss"] == "http://dev.com"
+
+
+def test_admin_revoke_token(
+    app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    store = MagicMock()
+    app.state.token.revocations = TokenRevocationList(load=lambda _: {}, store=store)
+    token = app.state.token.create_token(
+        name="test-token",
+        username="service-account",
+        email="service@example.com",
+        expiration=dt(2100, 1, 1, tzinfo=UTC),
+    )
+
+    response = client(app).post(app.url_path_for("revoke_token"), json={"token": token})
+
+    assert response.status_code == status.HTTP_200_OK
+    jti = response.json()
+    assert jti in app.state.token.revocations
+    store.assert_called_once_with(jti, "service-account", dt(2100, 1, 1, tzinfo=UTC))
+
+
+def test_admin_action_list(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], running_action: dict
+) -> None:
+    action = MagicMock()
+    action.dump.return_value = running_action
+    action_mgr = MagicMock(spec=ActionManager)
+    action_mgr.get_actions_by_status.return_value = ActionPage(
+        items=[action], cursor="next"
+    )
+    app.dependency_overrides[get_action_manager] = lambda: action_mgr
+    test_client = client(app)
+
+    response = test_client.get(
+        app.url_path_for("admin_action_list"),
+        params={"status": "RUNNING", "limit": 1},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["action_id"] for a in response.json()] == [running_action["action_id"]]
+    assert response.headers["X-Next-Cursor"] == "next"
+    action_mgr.get_actions_by_status.assert_called_once_with(
+        ActionStatus.RUNNING, max_age=None, limit=1, cursor=None, summary=False
+    )
+
+
+def test_admin_action_list_summary(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], running_action: dict
+) -> None:
+    action = MagicMock()
+    action.dump_summary.return_value = ActionSchemaSummary(**running_action)
+    action_mgr = MagicMock(spec=ActionManager)
+    action_mgr.get_actions_by_status.return_value = ActionPage(
+        items=[action], cursor=None
+    )
+    app.dependency_overrides[get_action_manager] = lambda: action_mgr
+    test_client = client(app)
+
+    response = test_client.get(
+        app.url_path_for("admin_action_list"),
+        params={"status": "RUNNING", "fields": "summary"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "result" not in response.json()[0]
+    assert "task_args" not in response.json()[0]
+    assert action_mgr.get_actions_by_status.call_args.kwargs["summary"] is True
+
+
+def test_admin_action_list_ndjson(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], running_action: dict
+) -> None:
+    action = MagicMock()
+    action.dump.return_value = ActionSchemaOut(**running_action)
+    action_mgr = MagicMock(spec=ActionManager)
+    action_mgr.get_actions_by_status.side_effect = [
+        ActionPage(items=[action], cursor="next"),
+        ActionPage(items=[action], cursor=None),
+    ]
+    app.dependency_overrides[get_action_manager] = lambda: action_mgr
+    test_client = client(app)
+
+    response = test_client.get(
+        app.url_path_for("admin_action_list"),
+        params={"status": "RUNNING", "limit": 1},
+        headers={"Accept": "application/x-ndjson"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [json.loads(line)["action_id"] for line in response.text.splitlines()] == [
+        running_action["action_id"]
+    ] * 2
+    assert [
+        c.kwargs["cursor"] for c in action_mgr.get_actions_by_status.call_args_list
+    ] == [None, "next"]
+
+
+def test_admin_action_scan(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], running_action: dict
+) -> None:
+    action = MagicMock()
+    action.dump_summary.return_value = ActionSchemaSummary(**running_action)
+    action_mgr = MagicMock(spec=ActionManager)
+    action_mgr.get_all_actions.return_value = iter([action, action])
+    app.dependency_overrides[get_action_manager] = lambda: action_mgr
+    test_client = client(app)
+
+    response = test_client.get(
+        app.url_path_for("admin_action_scan"),
+        params={
+            "status": ["RUNNING", "FAILURE"],
+            "name": "no-op",
+            "max_age_minutes": 60,
+            "segments": 8,
+            "fields": "summary",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    actions = [json.loads(line) for line in response.text.splitlines()]
+    assert [a["action_id"] for a in actions] == [running_action["action_id"]] * 2
+    assert "task_args" not in actions[0]
+    action_mgr.get_all_actions.assert_called_once_with(
+        [ActionStatus.RUNNING, ActionStatus.FAILURE],
+        "no-op",
+        max_age=3600,
+        segments=8,
+        summary=True,
+    )
+
+
+def test_admin_action_scan_too_many_segments(
+    app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    app.dependency_overrides[get_action_manager] = lambda: MagicMock(spec=ActionManager)
+    response = client(app).get(
+        app.url_path_for("admin_action_scan"), params={"segments": 100}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_admin_action_list_invalid_cursor(
+    app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    action_mgr = MagicMock(spec=ActionManager)
+    action_mgr.get_actions_by_status.side_effect = ValueError("Invalid cursor")
+    app.dependency_overrides[get_action_manager] = lambda: action_mgr
+    test_client = client(app)
+
+    response = test_client.get(
+        app.url_path_for("admin_action_list"),
+        params={"status": "RUNNING", "cursor": "invalid"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_admin_archive_action_list(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], running_action: dict
+) -> None:
+    archive = MagicMock(spec=ActionArchive)
+    archive.read.return_value = [
+        ActionSchemaOut(**running_action),
+        ActionSchemaOut(**{**running_action, "action_id": "2", "owner": "other"}),
+    ]
+    app.dependency_overrides[get_action_archive] = lambda: archive
+    test_client = client(app)
+
+    response = test_client.get(
+        app.url_path_for("admin_archive_action_list"),
+        params={"updated": "2026-01-02", "owner": running_action["owner"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["action_id"] for a in response.json()] == [running_action["action_id"]]
+    archive.read.assert_called_once_with(date(2026, 1, 2))
@@ -0,0 +1,72 @@
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI, status
+
+from automated_actions.api.v1.dependencies import get_authorizer
+from automated_actions.rbac import RBAC
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from fastapi.testclient import TestClient
+
+
+def test_authorize(app: FastAPI, client: Callable[[FastAPI], TestClient]) -> None:
+    ops_counter = MagicMock(return_value=1)
+    authorizer = RBAC.from_data(
+        {
+            "users": {"test_user": ["team"]},
+            "roles": {
+                "team": [
+                    {"obj": "no-op", "max_ops": 1, "params": {}},
+                    {"obj": "me", "params": {}},
+                    {"obj": "action-list", "params": {"action_user": None}},
+                ]
+            },
+        },
+        ops_counter=ops_counter,
+    )
+    app.dependency_overrides[get_authorizer] = lambda: authorizer
+
+    response = client(app).post(
+        app.url_path_for("authorize"),
+        json={
+            "items": [
+                {"obj": "me"},
+                {"obj": "action-list", "params": {"action_user": "other-user"}},
+                {"obj": "no-op"},
+                {"obj": "no-op", "params": {"foo": "bar"}},
+            ]
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"obj": "me", "params": {}, "authorized": True, "within_rate_limits": True},
+        {
+            "obj": "action-list",
+            "params": {"action_user": "other-user"},
+            "authorized": False,
+            "within_rate_limits": True,
+        },
+        {"obj": "no-op", "params": {}, "authorized": True, "within_rate_limits": False},
+        {
+            "obj": "no-op",
+            "params": {"foo": "bar"},
+            "authorized": True,
+            "within_rate_limits": False,
+        },
+    ]
+    # only rate limited actions are counted, once per action
+    ops_counter.assert_called_once_with("test_user", "no-op")
+
+
+def test_authorize_too_many_items(
+    app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    app.dependency_overrides[get_authorizer] = lambda: RBAC.from_data({})
+    response = client(app).post(
+        app.url_path_for("authorize"), json={"items": [{"obj": "me"}] * 501}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -8,7 +8,7 @@ from automated_actions.api.v1.views.external_resource import (
     get_action_external_resource_rds_reboot,
     get_action_external_resource_rds_snapshot,
 )
-from automated_actions.db.models import Action
+from automated_actions.db.models import Action, ActionManager, get_action_manager
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -56,6 +56,7 @@ def test_app(app: FastAPI, mocker: MockerFixture, running_action: dict) -> FastA
     app.dependency_overrides[get_action_external_resource_flush_elasticache] = lambda: (
         action_mock
     )
+    app.dependency_overrides[get_action_manager] = lambda: ActionManager(Action)
     return app
 
 
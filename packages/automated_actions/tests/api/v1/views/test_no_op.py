@@ -4,7 +4,7 @@ import pytest
 from fastapi import FastAPI, status
 
 from automated_actions.api.v1.views.no_op import get_action
-from automated_actions.db.models import Action
+from automated_actions.db.models import Action, ActionManager, get_action_manager
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -26,6 +26,7 @@ def test_app(app: FastAPI, mocker: MockerFixture, running_action: dict) -> FastA
     action_mock.action_id = running_action["action_id"]
     action_mock.dump.return_value = running_action
     app.dependency_overrides[get_action] = lambda: action_mock
+    app.dependency_overrides[get_action_manager] = lambda: ActionManager(Action)
     return app
 
 
@@ -8,7 +8,7 @@ from automated_actions.api.v1.views.openshift import (
     get_action_openshift_workload_delete,
     get_action_openshift_workload_restart,
 )
-from automated_actions.db.models import Action
+from automated_actions.db.models import Action, ActionManager, get_action_manager
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -36,6 +36,7 @@ def test_app(app: FastAPI, mocker: MockerFixture, running_action: dict) -> FastA
     )
     app.dependency_overrides[get_action_openshift_workload_delete] = lambda: action_mock
     app.dependency_overrides[get_action_openshift_trigger_cronjob] = lambda: action_mock
+    app.dependency_overrides[get_action_manager] = lambda: ActionManager(Action)
     return app
 
 
@@ -0,0 +1,92 @@
+from collections import Counter
+from datetime import UTC
+from datetime import datetime as dt
+from typing import TYPE_CHECKING
+
+from fastapi import FastAPI, status
+
+from automated_actions.db.models import ActionStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from fastapi.testclient import TestClient
+    from pytest_mock import MockerFixture
+
+
+def test_action_stats(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], mocker: MockerFixture
+) -> None:
+    rollup = mocker.patch.object(
+        ActionStats,
+        "rollup",
+        return_value=Counter({("restart", "FAILURE"): 2, ("no-op", "SUCCESS"): 3}),
+    )
+
+    response = client(app).get(
+        app.url_path_for("action_stats"),
+        params={"since": "2025-01-01T00:00:00", "until": "2025-01-08T00:00:00"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {
+            "name": "no-op",
+            "status": "SUCCESS",
+            "owner": None,
+            "hour": None,
+            "count": 3,
+        },
+        {
+            "name": "restart",
+            "status": "FAILURE",
+            "owner": None,
+            "hour": None,
+            "count": 2,
+        },
+    ]
+    rollup.assert_called_once_with(
+        dt(2025, 1, 1, tzinfo=UTC),
+        dt(2025, 1, 8, tzinfo=UTC),
+        ["name", "status"],
+        name=None,
+        status=None,
+        owner=None,
+    )
+
+
+def test_action_stats_group_by(
+    app: FastAPI, client: Callable[[FastAPI], TestClient], mocker: MockerFixture
+) -> None:
+    rollup = mocker.patch.object(
+        ActionStats, "rollup", return_value=Counter({("alice", 3600): 1})
+    )
+
+    response = client(app).get(
+        app.url_path_for("action_stats"),
+        params={"group_by": ["owner", "hour"], "status": "FAILURE"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"name": None, "status": None, "owner": "alice", "hour": 3600, "count": 1}
+    ]
+    assert rollup.call_args.args[2] == ["owner", "hour"]
+    assert rollup.call_args.kwargs["status"] == "FAILURE"
+
+
+def test_action_stats_invalid_range(
+    app: FastAPI, client: Callable[[FastAPI], TestClient]
+) -> None:
+    test_client = client(app)
+    url = app.url_path_for("action_stats")
+
+    response = test_client.get(
+        url, params={"since": "2025-01-08T00:00:00", "until": "2025-01-01T00:00:00"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = test_client.get(
+        url, params={"since": "2020-01-01T00:00:00", "until": "2025-01-01T00:00:00"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
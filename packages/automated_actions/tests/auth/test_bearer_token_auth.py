@@ -2,14 +2,16 @@ from datetime import UTC
 from datetime import datetime as dt
 from datetime import timedelta as td
 from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
 
+import jwt
 import pytest
 from fastapi import HTTPException, status
 
-from automated_actions.auth import BearerTokenAuth
+from automated_actions.auth import BearerTokenAuth, TokenRevocationList
 
 if TYPE_CHECKING:
-    from unittest.mock import MagicMock
+    from pytest_mock import MockerFixture
 
 
 @pytest.fixture
@@ -95,3 +97,128 @@ async def test_bearer_auth_expired_token(
 
     # Assertions
     assert user is None
+
+
+@pytest.fixture
+def revocations() -> TokenRevocationList:
+    return TokenRevocationList(
+        load=lambda _: {"revoked-jti": 4102444800.0}, store=MagicMock()
+    )
+
+
+def _token(bearer_token_auth: BearerTokenAuth, expiration: dt | None = None) -> str:
+    return bearer_token_auth.create_token(
+        name="test_token",
+        username="test_user",
+        email="test@test.com",
+        expiration=expiration or dt.now(tz=UTC) + td(minutes=5),
+    )
+
+
+def test_bearer_auth_token_id(bearer_token_auth: BearerTokenAuth) -> None:
+    token = _token(bearer_token_auth)
+    assert bearer_token_auth.decode_token(token).jti
+    assert bearer_token_auth.decode_token(token).jti != (
+        bearer_token_auth.decode_token(_token(bearer_token_auth)).jti
+    )
+
+
+@pytest.mark.asyncio
+async def test_bearer_auth_revoked_token(
+    bearer_token_auth: BearerTokenAuth,
+    revocations: TokenRevocationList,
+    mock_request: MagicMock,
+) -> None:
+    bearer_token_auth.revocations = revocations
+    revocations.refresh()
+    token = _token(bearer_token_auth)
+    mock_request.headers["Authorization"] = f"Bearer {token}"
+    assert await bearer_token_auth(mock_request) is not None
+
+    jti = bearer_token_auth.revoke_token(token)
+
+    assert jti == bearer_token_auth.decode_token(token).jti
+    assert jti in revocations
+    assert await bearer_token_auth(mock_request) is None
+    revocations.store.assert_called_once()  # type: ignore[attr-defined]
+
+
+def test_bearer_auth_revocations_refresh(revocations: TokenRevocationList) -> None:
+    assert "revoked-jti" not in revocations
+    revocations.refresh()
+    assert "revoked-jti" in revocations
+    assert len(revocations) == 1
+
+
+def test_bearer_auth_revocations_refresh_incremental(mocker: MockerFixture) -> None:
+    now = mocker.patch("automated_actions.auth.time")
+    now.time.return_value = 1000.0
+    load = MagicMock(
+        side_effect=[
+            {"revoked-jti": 4102444800.0, "expiring-jti": 1500.0},
+            {"new-jti": 4102444800.0},
+        ]
+    )
+    revocations = TokenRevocationList(load=load, store=MagicMock())
+
+    revocations.refresh()
+    now.time.return_value = 2000.0
+    revocations.refresh()
+
+    # all tokens first, then the ones revoked since the previous refresh
+    assert [c.args[0] for c in load.call_args_list] == [
+        None,
+        1000.0 - TokenRevocationList.REFRESH_OVERLAP_SECS,
+    ]
+    assert "revoked-jti" in revocations
+    assert "new-jti" in revocations
+    # expired tokens are dropped
+    assert "expiring-jti" not in revocations
+
+
+def test_bearer_auth_revoke_expired_token(
+    bearer_token_auth: BearerTokenAuth, revocations: TokenRevocationList
+) -> None:
+    bearer_token_auth.revocations = revocations
+    expiration = dt.now(tz=UTC) - td(minutes=5)
+    token = _token(bearer_token_auth, expiration=expiration)
+
+    jti = bearer_token_auth.revoke_token(token)
+
+    revocations.store.assert_called_once_with(  # type: ignore[attr-defined]
+        jti, "test_user", expiration.replace(microsecond=0)
+    )
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "invalid",
+        # no token ID
+        jwt.encode(
+            {
+                "preferred_username": "test_user",
+                "name": "test_token",
+                "email": "test@test.com",
+                "iss": "http://dev.com",
+                "exp": 4102444800,
+                "iat": 0,
+            },
+            "secret",
+            algorithm="HS256",
+        ),
+    ],
+)
+def test_bearer_auth_revoke_invalid_token(
+    bearer_token_auth: BearerTokenAuth, revocations: TokenRevocationList, token: str
+) -> None:
+    bearer_token_auth.revocations = revocations
+    with pytest.raises(HTTPException) as exc_info:
+        bearer_token_auth.revoke_token(token)
+    assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_bearer_auth_revoke_not_available(bearer_token_auth: BearerTokenAuth) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        bearer_token_auth.revoke_token(_token(bearer_token_auth))
+    assert exc_info.value.status_code == status.HTTP_501_NOT_IMPLEMENTED
@@ -0,0 +1,227 @@
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException, Response, status
+from prometheus_client import REGISTRY
+
+from automated_actions.auth import OPA, CapabilityToken
+
+if TYPE_CHECKING:
+    from pytest_httpx import HTTPXMock
+
+    from tests.conftest import MockUserModel
+
+PERMISSIONS = [
+    {"obj": "endpoint", "max_ops": 2, "params": {"foo": "^bar$"}},
+    {"obj": "action-list", "max_ops": None, "params": {"action_user": None}},
+]
+
+
+@pytest.fixture
+def capability_token() -> CapabilityToken:
+    return CapabilityToken(secret="secret", ttl_secs=60)  # noqa: S106
+
+
+@pytest.fixture
+def opa(usermodel: MockUserModel, capability_token: CapabilityToken) -> OPA:
+    return OPA[usermodel](  # type: ignore[valid-type]
+        opa_host="http://dev.com", capability_token=capability_token
+    )
+
+
+@pytest.fixture
+def endpoint_request(mock_request: MagicMock) -> MagicMock:
+    route_mock = MagicMock()
+    route_mock.operation_id = "endpoint"
+    route_mock.tags = []
+    mock_request.__getitem__.return_value = route_mock
+    mock_request.path_params = {"foo": "bar"}
+    mock_request.url = MagicMock()
+    mock_request.url.path = "/endpoint"
+    mock_request.cookies = {}
+    return mock_request
+
+
+def _capability_metric(result: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "automated_actions_authz_capability_token_total", {"result": result}
+        )
+        or 0
+    )
+
+
+def test_capability_token_loads(capability_token: CapabilityToken) -> None:
+    token = capability_token.dumps("test_user", PERMISSIONS)
+    permissions = capability_token.loads(token, "test_user")
+    assert permissions is not None
+    assert [permission.dump() for permission in permissions] == PERMISSIONS
+    # cached
+    assert capability_token.loads(token, "test_user") is permissions
+
+
+def test_capability_token_loads_other_user(capability_token: CapabilityToken) -> None:
+    token = capability_token.dumps("test_user", PERMISSIONS)
+    assert capability_token.loads(token, "other_user") is None
+
+
+def test_capability_token_loads_invalid(capability_token: CapabilityToken) -> None:
+    token = CapabilityToken(secret="other", ttl_secs=60).dumps(  # noqa: S106
+        "test_user", PERMISSIONS
+    )
+    assert capability_token.loads(token, "test_user") is None
+    assert capability_token.loads("garbage", "test_user") is None
+
+
+def test_capability_token_loads_expired() -> None:
+    capability_token = CapabilityToken(secret="secret", ttl_secs=-1)  # noqa: S106
+    token = capability_token.dumps("test_user", PERMISSIONS)
+    assert capability_token.loads(token, "test_user") is None
+
+
+@pytest.mark.asyncio
+async def test_opa_call_issues_capability_token(
+    opa: OPA,
+    usermodel: MockUserModel,
+    endpoint_request: MagicMock,
+    capability_token: CapabilityToken,
+    httpx_mock: HTTPXMock,
+) -> None:
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        json={
+            "result": {
+                "authorized": True,
+                "within_rate_limits": True,
+                "permissions": PERMISSIONS,
+            }
+        },
+    )
+    response = Response()
+    issued = _capability_metric("issued")
+
+    await opa(
+        request=endpoint_request, user=usermodel.load("test_user"), response=response
+    )
+
+    # the permissions come with the decisions, no extra query
+    assert len(httpx_mock.get_requests()) == 1
+
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{CapabilityToken.cookie}=")
+    assert "HttpOnly" in cookie
+    assert "Max-Age=60" in cookie
+    token = cookie.split(";")[0].split("=", 1)[1]
+    assert capability_token.loads(token, "test_user") is not None
+    assert _capability_metric("issued") == issued + 1
+
+
+@pytest.mark.asyncio
+async def test_opa_call_issues_capability_token_from_cached_decision(
+    usermodel: MockUserModel,
+    endpoint_request: MagicMock,
+    capability_token: CapabilityToken,
+    httpx_mock: HTTPXMock,
+) -> None:
+    opa = OPA[usermodel](  # type: ignore[valid-type]
+        opa_host="http://dev.com",
+        capability_token=capability_token,
+        decision_cache_ttl_secs=60,
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        json={
+            "result": {
+                "authorized": True,
+                "within_rate_limits": True,
+                "permissions": PERMISSIONS,
+            }
+        },
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz/within_rate_limits",
+        json={"result": True},
+    )
+    user = usermodel.load("test_user")
+    await opa(request=endpoint_request, user=user, response=Response())
+    response = Response()
+
+    # e.g., a bearer token client that never sends the cookie back
+    await opa(request=endpoint_request, user=user, response=response)
+
+    assert [r.url.path for r in httpx_mock.get_requests()] == [
+        "/v1/data/authz",
+        "/v1/data/authz/within_rate_limits",
+    ]
+    token = response.headers["set-cookie"].split(";")[0].split("=", 1)[1]
+    assert capability_token.loads(token, "test_user") is not None
+
+
+@pytest.mark.asyncio
+async def test_opa_call_with_capability_token(
+    opa: OPA,
+    usermodel: MockUserModel,
+    endpoint_request: MagicMock,
+    capability_token: CapabilityToken,
+    httpx_mock: HTTPXMock,
+) -> None:
+    user = usermodel.load("test_user")
+    endpoint_request.cookies = {
+        CapabilityToken.cookie: capability_token.dumps("test_user", PERMISSIONS)
+    }
+    authorized = _capability_metric("authorized")
+
+    await opa(request=endpoint_request, user=user, response=Response())
+
+    # authorized locally
+    assert not httpx_mock.get_requests()
+    assert user.allowed_actions == ["action-list", "endpoint"]
+    assert _capability_metric("authorized") == authorized + 1
+
+
+@pytest.mark.asyncio
+async def test_opa_call_with_capability_token_rate_limited(
+    usermodel: MockUserModel,
+    endpoint_request: MagicMock,
+    capability_token: CapabilityToken,
+) -> None:
+    opa = OPA[usermodel](  # type: ignore[valid-type]
+        opa_host="http://dev.com",
+        capability_token=capability_token,
+        ops_counter=MagicMock(return_value=2),
+    )
+    endpoint_request["route"].tags = ["Actions"]
+    endpoint_request.cookies = {
+        CapabilityToken.cookie: capability_token.dumps("test_user", PERMISSIONS)
+    }
+
+    with pytest.raises(HTTPException) as excinfo:
+        await opa(request=endpoint_request, user=usermodel.load("test_user"))
+    assert excinfo.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_opa_call_with_capability_token_denied(
+    opa: OPA,
+    usermodel: MockUserModel,
+    endpoint_request: MagicMock,
+    capability_token: CapabilityToken,
+    httpx_mock: HTTPXMock,
+) -> None:
+    # the permissions have changed since the token has been issued
+    endpoint_request.cookies = {
+        CapabilityToken.cookie: capability_token.dumps("test_user", PERMISSIONS[1:])
+    }
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        json={"result": {"authorized": True, "within_rate_limits": True}},
+    )
+
+    await opa(request=endpoint_request, user=usermodel.load("test_user"))
+
+    assert len(httpx_mock.get_requests()) == 1
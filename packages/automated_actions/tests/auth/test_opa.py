@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException, status
+from prometheus_client import REGISTRY
 
 from automated_actions.auth import OPA
 
@@ -216,3 +217,239 @@ async def test_opa_call_rate_limit_exceeded(
 
     assert excinfo.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
     assert user.allowed_actions == []
+
+
+OPA_INPUT = {
+    "username": "test_user",
+    "name": "test user",
+    "email": "test@example.com",
+    "created_at": 1,
+    "updated_at": 2,
+    "obj": "endpoint",
+    "params": {"foo": "bar"},
+}
+
+
+@pytest.fixture
+def opa_cached(usermodel: MockUserModel) -> OPA:
+    return OPA[usermodel](opa_host="http://dev.com", decision_cache_ttl_secs=60)  # type: ignore[valid-type]
+
+
+def _cache_count(result: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "automated_actions_opa_decision_cache_total", {"result": result}
+        )
+        or 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_opa_decide_cached(
+    opa_cached: OPA, usermodel: MockUserModel, httpx_mock: HTTPXMock
+) -> None:
+    user = usermodel.load("test_user")
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        match_json={"input": OPA_INPUT},
+        json={
+            "result": {
+                "authorized": True,
+                "within_rate_limits": True,
+                "objects": ["action-1"],
+            }
+        },
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz/within_rate_limits",
+        match_json={"input": OPA_INPUT},
+        json={"result": False},
+    )
+    hits = _cache_count("hit")
+
+    first = await opa_cached.decide(user, obj="endpoint", params={"foo": "bar"})
+    second = await opa_cached.decide(user, obj="endpoint", params={"foo": "bar"})
+
+    assert first == {
+        "authorized": True,
+        "within_rate_limits": True,
+        "objects": ["action-1"],
+    }
+    # within_rate_limits is never served from the cache
+    assert second == {
+        "authorized": True,
+        "within_rate_limits": False,
+        "objects": ["action-1"],
+    }
+    assert _cache_count("hit") == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_opa_decide_cached_not_authorized(
+    opa_cached: OPA, usermodel: MockUserModel, httpx_mock: HTTPXMock
+) -> None:
+    user = usermodel.load("test_user")
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        json={"result": {"authorized": False, "within_rate_limits": True}},
+    )
+
+    for _ in range(2):
+        opa_data = await opa_cached.decide(user, obj="endpoint", params={"foo": "bar"})
+        assert not opa_data["authorized"]
+
+    # no within_rate_limits query for unauthorized users
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_opa_decide_cache_keyed_by_input(
+    opa_cached: OPA, usermodel: MockUserModel, httpx_mock: HTTPXMock
+) -> None:
+    user = usermodel.load("test_user")
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        json={"result": {"authorized": True, "within_rate_limits": True}},
+        is_reusable=True,
+    )
+
+    await opa_cached.decide(user, obj="endpoint", params={"foo": "bar"})
+    await opa_cached.decide(user, obj="endpoint", params={"foo": "baz"})
+    await opa_cached.decide(user, obj="other-endpoint", params={"foo": "bar"})
+
+    assert len(httpx_mock.get_requests()) == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_opa_decide_cache_ignores_volatile_user_attributes(
+    opa_cached: OPA, usermodel: MockUserModel, httpx_mock: HTTPXMock
+) -> None:
+    user = usermodel.load("test_user")
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        json={"result": {"authorized": False}},
+    )
+
+    await opa_cached.decide(user, obj="endpoint", params={"foo": "bar"})
+    user.updated_at += 1
+    user.set_allowed_actions(["endpoint"])
+    await opa_cached.decide(user, obj="endpoint", params={"foo": "bar"})
+
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_opa_decide_cache_disabled(
+    opa: OPA, usermodel: MockUserModel, httpx_mock: HTTPXMock
+) -> None:
+    user = usermodel.load("test_user")
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz",
+        json={"result": {"authorized": True, "within_rate_limits": True}},
+        is_reusable=True,
+    )
+
+    for _ in range(2):
+        await opa.decide(user, obj="endpoint", params={"foo": "bar"})
+
+    assert len(httpx_mock.get_requests()) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_opa_aclose(opa: OPA) -> None:
+    await opa.aclose()
+    assert opa.client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_opa_call_ops_count(
+    usermodel: MockUserModel, mock_request: MagicMock, httpx_mock: HTTPXMock
+) -> None:
+    ops_counter = MagicMock(return_value=3)
+    opa = OPA[usermodel](opa_host="http://dev.com", ops_counter=ops_counter)  # type: ignore[valid-type]
+    user = usermodel.load("test_user")
+    route_mock = MagicMock()
+    route_mock.operation_id = "endpoint"
+    route_mock.tags = ["Actions"]
+    mock_request.__getitem__.return_value = route_mock
+    mock_request.path_params = {"foo": "bar"}
+    mock_request.url = MagicMock()
+    mock_request.url.path = "/endpoint"
+
+    httpx_mock.add_response(
+        method="POST",
+        match_json={"input": OPA_INPUT | {"ops_count": 3}},
+        json={"result": {"authorized": True, "within_rate_limits": True}},
+    )
+    await opa(request=mock_request, user=user)
+    ops_counter.assert_called_once_with("test_user", "endpoint")
+
+
+@pytest.mark.asyncio
+async def test_opa_call_ops_count_not_rate_limited_route(
+    usermodel: MockUserModel, mock_request: MagicMock, httpx_mock: HTTPXMock
+) -> None:
+    ops_counter = MagicMock(return_value=3)
+    opa = OPA[usermodel](opa_host="http://dev.com", ops_counter=ops_counter)  # type: ignore[valid-type]
+    user = usermodel.load("test_user")
+    route_mock = MagicMock()
+    route_mock.operation_id = "endpoint"
+    route_mock.tags = ["General"]
+    mock_request.__getitem__.return_value = route_mock
+    mock_request.path_params = {"foo": "bar"}
+    mock_request.url = MagicMock()
+    mock_request.url.path = "/endpoint"
+
+    httpx_mock.add_response(
+        method="POST",
+        match_json={"input": OPA_INPUT},
+        json={"result": {"authorized": True, "within_rate_limits": True}},
+    )
+    await opa(request=mock_request, user=user)
+    ops_counter.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_opa_authorize_batch(
+    usermodel: type[MockUserModel], httpx_mock: HTTPXMock
+) -> None:
+    ops_counter = MagicMock(return_value=3)
+    opa = OPA[usermodel](opa_host="http://dev.com", ops_counter=ops_counter)  # type: ignore[valid-type]
+    decisions = [
+        {"authorized": True, "within_rate_limits": True},
+        {"authorized": False, "within_rate_limits": True},
+    ]
+    httpx_mock.add_response(
+        method="POST",
+        url="http://dev.com/v1/data/authz/batch",
+        match_json={
+            "input": {
+                "username": "test_user",
+                "name": "test user",
+                "email": "test@example.com",
+                "created_at": 1,
+                "updated_at": 2,
+                "items": [
+                    {"obj": "me", "params": {}},
+                    {"obj": "restart", "params": {"name": "foo"}, "ops_count": 3},
+                ],
+            }
+        },
+        json={"result": decisions},
+    )
+
+    assert (
+        await opa.authorize_batch(
+            usermodel.load("test_user"),
+            [("me", {}), ("restart", {"name": "foo"})],
+            rate_limited_objects={"restart"},
+        )
+        == decisions
+    )
+    ops_counter.assert_called_once_with("test_user", "restart")
@@ -1,6 +1,7 @@
 # ruff: noqa: S106
 
 
+import asyncio
 from datetime import UTC
 from datetime import datetime as dt
 from datetime import timedelta as td
@@ -9,15 +10,20 @@ from unittest.mock import MagicMock
 
 import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
 from fastapi import FastAPI, HTTPException, status
 from fastapi.routing import APIRoute
 from httpx import HTTPStatusError
+from jwt import PyJWKSet
+from jwt.algorithms import RSAAlgorithm
+from prometheus_client import REGISTRY
 
-from automated_actions.auth import OpenIDConnect
+from automated_actions.auth import JWKS, OpenIDConnect
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
     from fastapi.testclient import TestClient
     from pytest_httpx import HTTPXMock
     from pytest_mock import MockerFixture
@@ -226,34 +232,283 @@ def test_openid_connect_logout_endpoint(
     assert not response.cookies
 
 
-def test_openid_connect_get_user_info(
-    openid_connect: OpenIDConnect, httpx_mock: HTTPXMock
-) -> None:
-    access_token = jwt.encode(
+def _access_token(expires_in: td = td(minutes=5)) -> str:
+    return jwt.encode(
         {
             "preferred_username": "username",
             "name": "name",
             "email": "email",
             "iss": "issuer",
-            "exp": dt.now(tz=UTC) + td(minutes=5),
+            "exp": dt.now(tz=UTC) + expires_in,
             "iat": dt.now(tz=UTC),
         },
         "not-a-secret",
         algorithm="HS256",
     )
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_get_user_info(
+    openid_connect: OpenIDConnect, httpx_mock: HTTPXMock
+) -> None:
+    access_token = _access_token()
     httpx_mock.add_response(
         url=openid_connect.userinfo_endpoint,
         match_headers={"Authorization": f"Bearer {access_token}"},
     )
-    user_info = openid_connect.get_user_info(access_token)
+    user_info = await openid_connect.get_user_info(access_token)
     assert user_info.username == "username"
 
 
-def test_openid_connect_get_user_info_error(
+@pytest.mark.asyncio
+async def test_openid_connect_get_user_info_error(
     openid_connect: OpenIDConnect, httpx_mock: HTTPXMock
 ) -> None:
     httpx_mock.add_response(
         url=openid_connect.userinfo_endpoint, status_code=status.HTTP_400_BAD_REQUEST
     )
     with pytest.raises(HTTPStatusError):
-        openid_connect.get_user_info("access_token")
+        await openid_connect.get_user_info("access_token")
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_get_user_info_cached(
+    openid_connect: OpenIDConnect, httpx_mock: HTTPXMock
+) -> None:
+    access_token = _access_token()
+    # only one userinfo response available
+    httpx_mock.add_response(url=openid_connect.userinfo_endpoint)
+    hits_before = REGISTRY.get_sample_value(
+        "automated_actions_oidc_userinfo_cache_total", {"result": "hit"}
+    )
+
+    await openid_connect.get_user_info(access_token)
+    user_info = await openid_connect.get_user_info(access_token)
+
+    assert user_info.username == "username"
+    assert len(httpx_mock.get_requests()) == 1
+    assert (
+        REGISTRY.get_sample_value(
+            "automated_actions_oidc_userinfo_cache_total", {"result": "hit"}
+        )
+        == (hits_before or 0) + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_get_user_info_concurrent_lookups_coalesced(
+    openid_connect: OpenIDConnect, httpx_mock: HTTPXMock
+) -> None:
+    access_token = _access_token()
+    httpx_mock.add_response(url=openid_connect.userinfo_endpoint)
+
+    users = await asyncio.gather(*[
+        openid_connect.get_user_info(access_token) for _ in range(5)
+    ])
+
+    assert {user.username for user in users} == {"username"}
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_get_user_info_expired_token_not_cached(
+    openid_connect: OpenIDConnect, httpx_mock: HTTPXMock
+) -> None:
+    access_token = _access_token(expires_in=td(minutes=-1))
+    httpx_mock.add_response(url=openid_connect.userinfo_endpoint, is_reusable=True)
+
+    await openid_connect.get_user_info(access_token)
+    await openid_connect.get_user_info(access_token)
+
+    assert len(httpx_mock.get_requests()) == 2  # noqa: PLR2004
+    assert not openid_connect.userinfo_cache
+
+
+@pytest.fixture(scope="module")
+def rsa_key() -> RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwks(rsa_key: RSAPrivateKey, kid: str) -> dict:
+    jwk = RSAAlgorithm.to_jwk(rsa_key.public_key(), as_dict=True)
+    return {"keys": [jwk | {"kid": kid, "alg": "RS256", "use": "sig"}]}
+
+
+def _signed_access_token(
+    rsa_key: RSAPrivateKey, kid: str, issuer: str = "http://dev.com"
+) -> str:
+    return jwt.encode(
+        {
+            "preferred_username": "username",
+            "name": "name",
+            "email": "email",
+            "iss": issuer,
+            "exp": dt.now(tz=UTC) + td(minutes=5),
+            "iat": dt.now(tz=UTC),
+        },
+        rsa_key,
+        algorithm="RS256",
+        headers={"kid": kid},
+    )
+
+
+@pytest.fixture
+def openid_connect_jwks(usermodel: type, rsa_key: RSAPrivateKey) -> OpenIDConnect:
+    jwks = JWKS("http://dev.com/certs")
+    jwks.keys = {
+        key.key_id: key for key in PyJWKSet.from_dict(_jwks(rsa_key, "kid-1")).keys
+    }
+    return OpenIDConnect[usermodel](  # type: ignore[valid-type]
+        issuer="http://dev.com",
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        session_secret="test_session_secret",
+        session_timeout_secs=60,
+        authorization_endpoint="http://dev.com/authorize",
+        token_endpoint="http://dev.com/token",
+        userinfo_endpoint="http://dev.com/userinfo",
+        user_model=usermodel,
+        jwks=jwks,
+    )
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_create_verify_tokens_locally(
+    httpx_mock: HTTPXMock, usermodel: type, rsa_key: RSAPrivateKey
+) -> None:
+    httpx_mock.add_response(
+        url="http://dev.com/.well-known/openid-configuration",
+        json={
+            "authorization_endpoint": "http://dev.com/authorize",
+            "token_endpoint": "http://dev.com/token",
+            "userinfo_endpoint": "http://dev.com/userinfo",
+            "jwks_uri": "http://dev.com/certs",
+        },
+    )
+    httpx_mock.add_response(url="http://dev.com/certs", json=_jwks(rsa_key, "kid-1"))
+    openid_connect = await OpenIDConnect[usermodel].create(  # type: ignore[valid-type]
+        issuer="http://dev.com",
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        session_secret="test_session_secret",
+        session_timeout_secs=60,
+        user_model=usermodel,
+        verify_tokens_locally=True,
+    )
+    assert openid_connect.jwks
+    assert set(openid_connect.jwks.keys) == {"kid-1"}
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_verify_tokens_locally(
+    openid_connect_jwks: OpenIDConnect, rsa_key: RSAPrivateKey, httpx_mock: HTTPXMock
+) -> None:
+    user_info = await openid_connect_jwks.get_user_info(
+        _signed_access_token(rsa_key, "kid-1")
+    )
+    assert user_info.username == "username"
+    # no userinfo or JWKS call
+    assert not httpx_mock.get_requests()
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_verify_tokens_locally_wrong_issuer(
+    openid_connect_jwks: OpenIDConnect, rsa_key: RSAPrivateKey
+) -> None:
+    with pytest.raises(jwt.InvalidIssuerError):
+        await openid_connect_jwks.get_user_info(
+            _signed_access_token(rsa_key, "kid-1", issuer="http://evil.com")
+        )
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_verify_tokens_locally_bad_signature(
+    openid_connect_jwks: OpenIDConnect,
+) -> None:
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with pytest.raises(jwt.InvalidSignatureError):
+        await openid_connect_jwks.get_user_info(
+            _signed_access_token(other_key, "kid-1")
+        )
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_verify_tokens_locally_key_rotation(
+    openid_connect_jwks: OpenIDConnect, httpx_mock: HTTPXMock
+) -> None:
+    new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    httpx_mock.add_response(url="http://dev.com/certs", json=_jwks(new_key, "kid-2"))
+
+    users = await asyncio.gather(*[
+        openid_connect_jwks.get_user_info(_signed_access_token(new_key, "kid-2"))
+        for _ in range(3)
+    ])
+
+    assert {user.username for user in users} == {"username"}
+    # all requests share one key set refresh
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_verify_tokens_locally_unknown_kid_rate_limited(
+    openid_connect_jwks: OpenIDConnect, rsa_key: RSAPrivateKey, httpx_mock: HTTPXMock
+) -> None:
+    assert openid_connect_jwks.jwks
+    httpx_mock.add_response(url="http://dev.com/certs", json=_jwks(rsa_key, "kid-1"))
+
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidKeyError):
+            await openid_connect_jwks.get_user_info(
+                _signed_access_token(rsa_key, "unknown-kid")
+            )
+
+    # the second unknown key ID doesn't trigger another refresh
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_verify_tokens_locally_slow_key_refresh(
+    openid_connect_jwks: OpenIDConnect, mocker: MockerFixture
+) -> None:
+    assert openid_connect_jwks.jwks
+    openid_connect_jwks.jwks.max_wait_secs = 0.01
+    new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    released = asyncio.Event()
+
+    async def refresh() -> None:
+        await released.wait()
+        openid_connect_jwks.jwks.keys = {  # type: ignore[union-attr]
+            key.key_id: key for key in PyJWKSet.from_dict(_jwks(new_key, "kid-2")).keys
+        }
+
+    mocker.patch.object(openid_connect_jwks.jwks, "refresh", side_effect=refresh)
+
+    # rejected after the short wait instead of waiting for the provider
+    with pytest.raises(jwt.InvalidKeyError):
+        await openid_connect_jwks.get_user_info(_signed_access_token(new_key, "kid-2"))
+
+    # the refresh continues in the background and serves the next requests
+    released.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    user_info = await openid_connect_jwks.get_user_info(
+        _signed_access_token(new_key, "kid-2")
+    )
+    assert user_info.username == "username"
+
+
+@pytest.mark.asyncio
+async def test_openid_connect_verify_tokens_locally_failed_key_refresh(
+    openid_connect_jwks: OpenIDConnect, rsa_key: RSAPrivateKey, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(url="http://dev.com/certs", status_code=500)
+
+    with pytest.raises(jwt.InvalidKeyError):
+        await openid_connect_jwks.get_user_info(
+            _signed_access_token(rsa_key, "unknown-kid")
+        )
+    # the cached keys still verify the known key IDs
+    user_info = await openid_connect_jwks.get_user_info(
+        _signed_access_token(rsa_key, "kid-1")
+    )
+    assert user_info.username == "username"
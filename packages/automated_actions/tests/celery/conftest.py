@@ -20,6 +20,11 @@ def mock_oc(mocker: MockerFixture) -> Mock:
     return mocker.Mock(spec=OpenshiftClient)
 
 
+@pytest.fixture(autouse=True)
+def mock_action_stats(mocker: MockerFixture) -> Mock:
+    return mocker.patch("automated_actions.db.models.ActionStats")
+
+
 @pytest.fixture
 def mock_action(mocker: MockerFixture) -> Mock:
     return mocker.Mock(spec=Action, created_at=time())
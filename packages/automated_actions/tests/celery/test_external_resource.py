@@ -89,7 +89,7 @@ def test_external_resource_rds_reboot_task(
     ).apply()
 
     mock_rds_reboot_run.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.SUCCESS, result="ok", task_args=task_args
     )
@@ -128,7 +128,7 @@ def test_external_resource_rds_reboot_task_non_retryable_failure(
     ).apply()
 
     mock_rds_reboot_run.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.FAILURE,
         result="what a failure!",
@@ -188,7 +188,7 @@ def test_external_resource_flush_elasticache_task(
     ).apply()
 
     mock_flush_elasticache_run.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.SUCCESS, result="ok", task_args=task_args
     )
@@ -228,7 +228,7 @@ def test_external_resource_flush_elasticache_task_non_retryable_failure(
     ).apply()
 
     mock_flush_elasticache_run.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.FAILURE,
         result="what a failure!",
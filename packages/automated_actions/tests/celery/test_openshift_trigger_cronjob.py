@@ -2,11 +2,15 @@ import uuid
 from typing import TYPE_CHECKING
 from unittest.mock import ANY, Mock
 
+from botocore.exceptions import ClientError
+from kubernetes.client.exceptions import ApiException
+from pynamodb.exceptions import UpdateError
+
 from automated_actions.celery.openshift.tasks import (
     OpenshiftTriggerCronjob,
     openshift_trigger_cronjob,
 )
-from automated_actions.db.models import ActionStatus
+from automated_actions.db.models import ActionStatus, StatusTransitionError
 
 if TYPE_CHECKING:
     from automated_actions_utils.cluster_connection import ClusterConnectionData
@@ -34,6 +38,7 @@ def test_openshift_trigger_cronjob(
 def test_openshift_trigger_cronjob_task(
     mocker: MockerFixture,
     mock_action: Mock,
+    mock_action_stats: Mock,
     cluster_connection_data: ClusterConnectionData,
 ) -> None:
     patched_oc = mocker.patch(
@@ -59,7 +64,181 @@ def test_openshift_trigger_cronjob_task(
         server_url=cluster_connection_data.url, token=cluster_connection_data.token
     )
     mock_owd.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
+    mock_action.set_final_state.assert_called_once_with(
+        status=ActionStatus.SUCCESS, result="ok", task_args=task_args
+    )
+    mock_action_stats.increment.assert_called_once_with(
+        mock_action.name, "SUCCESS", mock_action.owner
+    )
+
+
+def test_openshift_trigger_cronjob_task_stats_error(
+    mocker: MockerFixture,
+    mock_action: Mock,
+    mock_action_stats: Mock,
+    cluster_connection_data: ClusterConnectionData,
+) -> None:
+    mocker.patch("automated_actions.celery.openshift.tasks.OpenshiftClient")
+    mocker.patch(
+        "automated_actions.celery.openshift.tasks.get_cluster_connection_data",
+        return_value=cluster_connection_data,
+    )
+    mocker.patch.object(OpenshiftTriggerCronjob, "run")
+    mock_action_stats.increment.side_effect = UpdateError("boom")
+    result = openshift_trigger_cronjob.signature(
+        kwargs={
+            "cluster": "cluster",
+            "namespace": "namespace",
+            "cronjob": "cronjob-xxx",
+            "action": mock_action,
+        },
+        task_id=str(uuid.uuid4()),
+    ).apply()
+
+    # statistics are best effort
+    assert result.successful()
+    mock_action.set_final_state.assert_called_once()
+
+
+def _action_not_found() -> UpdateError:
+    return UpdateError(
+        cause=ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+    )
+
+
+def test_openshift_trigger_cronjob_task_waits_for_action(
+    mocker: MockerFixture,
+    mock_action: Mock,
+    cluster_connection_data: ClusterConnectionData,
+) -> None:
+    mocker.patch("automated_actions.celery.openshift.tasks.OpenshiftClient")
+    mocker.patch(
+        "automated_actions.celery.openshift.tasks.get_cluster_connection_data",
+        return_value=cluster_connection_data,
+    )
+    mock_owd = mocker.patch.object(OpenshiftTriggerCronjob, "run")
+    # the API server hasn't stored the action yet
+    mock_action.start.side_effect = [_action_not_found(), None]
+    task_args = {
+        "cluster": "cluster",
+        "namespace": "namespace",
+        "cronjob": "cronjob-xxx",
+    }
+    openshift_trigger_cronjob.signature(
+        kwargs={**task_args, "action": mock_action},
+        task_id=str(uuid.uuid4()),
+    ).apply()
+
+    assert mock_action.start.call_count == 2  # noqa: PLR2004
+    mock_action.start.assert_called_with(attempt=1)
+    mock_owd.assert_called_once()
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.SUCCESS, result="ok", task_args=task_args
     )
+
+
+def test_openshift_trigger_cronjob_task_action_not_stored(
+    mocker: MockerFixture,
+    mock_action: Mock,
+) -> None:
+    mock_owd = mocker.patch.object(OpenshiftTriggerCronjob, "run")
+    mock_action.start.side_effect = _action_not_found()
+    openshift_trigger_cronjob.signature(
+        kwargs={
+            "cluster": "cluster",
+            "namespace": "namespace",
+            "cronjob": "cronjob-xxx",
+            "action": mock_action,
+        },
+        task_id=str(uuid.uuid4()),
+    ).apply()
+
+    assert mock_action.start.call_count == openshift_trigger_cronjob.max_retries + 1
+    mock_owd.assert_not_called()
+    mock_action.set_final_state.assert_not_called()
+
+
+def test_openshift_trigger_cronjob_task_duplicate(
+    mocker: MockerFixture,
+    mock_action: Mock,
+) -> None:
+    mock_owd = mocker.patch.object(OpenshiftTriggerCronjob, "run")
+    # another run of the task has claimed the action or it has been cancelled
+    mock_action.start.side_effect = StatusTransitionError(
+        "1", ActionStatus.RUNNING, ActionStatus.RUNNING
+    )
+    openshift_trigger_cronjob.signature(
+        kwargs={
+            "cluster": "cluster",
+            "namespace": "namespace",
+            "cronjob": "cronjob-xxx",
+            "action": mock_action,
+        },
+        task_id=str(uuid.uuid4()),
+    ).apply()
+
+    mock_action.start.assert_called_once_with(attempt=0)
+    mock_owd.assert_not_called()
+    mock_action.set_final_state.assert_not_called()
+
+
+def test_openshift_trigger_cronjob_task_cancelled_while_running(
+    mocker: MockerFixture,
+    mock_action: Mock,
+    mock_action_stats: Mock,
+    cluster_connection_data: ClusterConnectionData,
+) -> None:
+    mocker.patch("automated_actions.celery.openshift.tasks.OpenshiftClient")
+    mocker.patch(
+        "automated_actions.celery.openshift.tasks.get_cluster_connection_data",
+        return_value=cluster_connection_data,
+    )
+    mocker.patch.object(OpenshiftTriggerCronjob, "run")
+    mock_action.set_final_state.side_effect = StatusTransitionError(
+        "1", ActionStatus.CANCELLED, ActionStatus.SUCCESS
+    )
+    result = openshift_trigger_cronjob.signature(
+        kwargs={
+            "cluster": "cluster",
+            "namespace": "namespace",
+            "cronjob": "cronjob-xxx",
+            "action": mock_action,
+        },
+        task_id=str(uuid.uuid4()),
+    ).apply()
+
+    # the action stays cancelled
+    assert result.successful()
+    mock_action.set_final_state.assert_called_once()
+    mock_action_stats.increment.assert_not_called()
+
+
+def test_openshift_trigger_cronjob_task_records_retry(
+    mocker: MockerFixture,
+    mock_action: Mock,
+    cluster_connection_data: ClusterConnectionData,
+) -> None:
+    mocker.patch("automated_actions.celery.openshift.tasks.OpenshiftClient")
+    mocker.patch(
+        "automated_actions.celery.openshift.tasks.get_cluster_connection_data",
+        return_value=cluster_connection_data,
+    )
+    mocker.patch.object(
+        OpenshiftTriggerCronjob, "run", side_effect=[ApiException(reason="boom"), None]
+    )
+    openshift_trigger_cronjob.signature(
+        kwargs={
+            "cluster": "cluster",
+            "namespace": "namespace",
+            "cronjob": "cronjob-xxx",
+            "action": mock_action,
+        },
+        task_id=str(uuid.uuid4()),
+    ).apply()
+
+    mock_action.record_retry.assert_called_once_with(attempt=0, error=ANY)
+    assert "boom" in mock_action.record_retry.call_args.kwargs["error"]
+    mock_action.set_final_state.assert_called_once()
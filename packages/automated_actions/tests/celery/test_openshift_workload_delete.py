@@ -61,7 +61,7 @@ def test_openshift_workload_delete_task(
         server_url=cluster_connection_data.url, token=cluster_connection_data.token
     )
     mock_owd.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.SUCCESS, result="ok", task_args=task_args
     )
@@ -89,7 +89,7 @@ def test_openshift_workload_restart_task(
         server_url=cluster_connection_data.url, token=cluster_connection_data.token
     )
     mock_owr.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.SUCCESS, result="ok", task_args=task_args
     )
@@ -127,7 +127,7 @@ def test_openshift_workload_restart_task_non_retryable_failure(
         server_url=cluster_connection_data.url, token=cluster_connection_data.token
     )
     mock_owr.assert_called_once()
-    mock_action.set_status.assert_called_once_with(ActionStatus.RUNNING)
+    mock_action.start.assert_called_once_with(attempt=0)
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.FAILURE,
         result="pod pod-name does not exist",
@@ -174,7 +174,7 @@ def test_openshift_workload_restart_task_retryable_failure(
         * call_count
     )
     assert mock_owr.call_count == call_count
-    mock_action.set_status.assert_has_calls([call(ActionStatus.RUNNING)] * call_count)
+    assert mock_action.start.call_count == call_count
     mock_action.set_final_state.assert_called_once_with(
         status=ActionStatus.FAILURE,
         result="(Cannot connect to cluster)\nReason: None\n",
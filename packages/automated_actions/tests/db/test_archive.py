@@ -0,0 +1,137 @@
+# ruff: noqa: ARG002, N803
+from datetime import UTC, date, timedelta
+from datetime import datetime as dt
+from io import BytesIO
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from botocore.exceptions import ClientError
+
+from automated_actions.db.archive import (
+    ActionArchive,
+    archive_expiring_actions,
+    archive_key,
+)
+from automated_actions.db.models import Action, ActionSchemaOut, ActionStatus
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+TODAY = date(2026, 3, 10)
+
+
+class S3Stub:
+    """In-memory S3 client stub."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def head_object(self, Bucket: str, Key: str) -> None:
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **_: Any) -> None:
+        self.objects[Key] = Body
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        return {"Body": BytesIO(self.objects[Key])}
+
+    def get_paginator(self, name: str) -> S3Stub:
+        assert name == "list_objects_v2"
+        return self
+
+    def paginate(self, Bucket: str, Prefix: str) -> list[dict]:
+        return [
+            {"Contents": [{"Key": k} for k in self.objects if k.startswith(Prefix)]}
+        ]
+
+
+@pytest.fixture
+def archive() -> ActionArchive:
+    return ActionArchive(S3Stub(), "bucket")
+
+
+def _action(action_id: str, updated: date, expires: date) -> Action:
+    return Action(
+        action_id,
+        name="no-op",
+        owner="owner",
+        status=ActionStatus.SUCCESS,
+        created_at=1.0,
+        updated_at=dt.combine(updated, dt.min.time(), tzinfo=UTC).timestamp(),
+        expires_at=dt.combine(expires, dt.min.time(), tzinfo=UTC) + timedelta(hours=1),
+    )
+
+
+def test_archive_key() -> None:
+    assert (
+        archive_key(date(2026, 1, 2), date(2026, 2, 1))
+        == "actions/date=2026-01-02/expires-2026-02-01.jsonl.gz"
+    )
+
+
+def test_archive_write_read(archive: ActionArchive) -> None:
+    action = ActionSchemaOut(
+        action_id="1",
+        name="no-op",
+        owner="owner",
+        task_args={"key": "value"},
+        created_at=1.0,
+        updated_at=2.0,
+    )
+    archive.write(archive_key(date(2026, 1, 2), date(2026, 2, 1)), [action])
+
+    assert archive.read(date(2026, 1, 2)) == [action]
+    assert archive.read(date(2026, 1, 3)) == []
+
+
+def test_archive_exists_error(mocker: MockerFixture, archive: ActionArchive) -> None:
+    mocker.patch.object(
+        archive.client,
+        "head_object",
+        side_effect=ClientError({"Error": {"Code": "403"}}, "HeadObject"),
+    )
+    with pytest.raises(ClientError):
+        archive.exists("key")
+
+
+def test_archive_expiring_actions(
+    mocker: MockerFixture, archive: ActionArchive
+) -> None:
+    updated = TODAY - timedelta(days=29)
+    tomorrow = TODAY + timedelta(days=1)
+    scan = mocker.patch.object(
+        Action,
+        "scan",
+        return_value=[
+            _action("1", updated, tomorrow),
+            _action("2", updated, tomorrow),
+            _action("3", updated + timedelta(days=1), tomorrow + timedelta(days=1)),
+        ],
+    )
+    # the 2nd expiry date has been archived by a previous run
+    archive.write(
+        archive_key(updated + timedelta(days=1), tomorrow + timedelta(days=1)), []
+    )
+
+    assert archive_expiring_actions(archive, TODAY, lead_days=2, retention_days=30) == 2  # noqa: PLR2004
+
+    assert [a.action_id for a in archive.read(updated)] == ["1", "2"]
+    assert archive.read(updated + timedelta(days=1)) == []
+    scan.assert_called_once()
+
+
+def test_archive_expiring_actions_skips_end(
+    mocker: MockerFixture, archive: ActionArchive
+) -> None:
+    mocker.patch.object(
+        Action,
+        "scan",
+        return_value=[_action("1", TODAY, TODAY + timedelta(days=3))],
+    )
+    assert archive_expiring_actions(archive, TODAY, lead_days=2, retention_days=30) == 0
+
+
+def test_archive_expiring_actions_lead_too_long(archive: ActionArchive) -> None:
+    with pytest.raises(ValueError, match="retention period"):
+        archive_expiring_actions(archive, TODAY, lead_days=30, retention_days=30)
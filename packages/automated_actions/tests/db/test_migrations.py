@@ -0,0 +1,244 @@
+from datetime import UTC, timedelta
+from datetime import datetime as dt
+from functools import partial
+from threading import Barrier
+from typing import TYPE_CHECKING
+
+import pytest
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import UpdateError
+
+from automated_actions.api import create_db_tables
+from automated_actions.config import settings
+from automated_actions.db import migrations
+from automated_actions.db.migrations import (
+    backfill_action_expires_at,
+    backfill_action_owner_shard,
+    backfill_action_owner_status,
+    backfill_action_status_shard,
+    create_missing_indexes,
+    create_tables,
+    enable_ttl,
+)
+from automated_actions.db.models import ALL_TABLES, Action, RevokedToken, User
+from automated_actions.db.models._action import (  # noqa: PLC2701
+    owner_shard_key,
+    status_shard_key,
+)
+
+if TYPE_CHECKING:
+    from pynamodb.models import Model
+    from pytest_mock import MockerFixture
+
+
+def test_create_tables(mocker: MockerFixture) -> None:
+    # every check waits for all others: the tables are checked concurrently
+    barrier = Barrier(len(ALL_TABLES), timeout=5)
+
+    def exists(model: type[Model]) -> bool:
+        barrier.wait()
+        return model is not Action
+
+    for model in ALL_TABLES:
+        mocker.patch.object(model, "exists", side_effect=partial(exists, model))
+        mocker.patch.object(model, "create_table")
+
+    assert create_tables() == [Action.Meta.table_name]
+
+    Action.create_table.assert_called_once_with(wait=True)  # type: ignore[attr-defined]
+    User.create_table.assert_not_called()  # type: ignore[attr-defined]
+
+
+def test_create_db_tables_skipped(mocker: MockerFixture) -> None:
+    mocker.patch.object(settings, "db_create_tables", False)  # noqa: FBT003
+    tables = mocker.patch("automated_actions.api.create_tables")
+    create_db_tables()
+    tables.assert_not_called()
+
+
+def test_create_db_tables_sqlite(mocker: MockerFixture) -> None:
+    mocker.patch.object(settings, "db_create_tables", True)  # noqa: FBT003
+    mocker.patch.object(settings, "action_backend", "sqlite")
+    tables = mocker.patch("automated_actions.api.create_tables", return_value=[])
+    create_db_tables()
+    tables.assert_called_once_with([User, RevokedToken])
+
+
+def _index(name: str, status: str = "ACTIVE") -> dict:
+    return {"IndexName": name, "IndexStatus": status}
+
+
+def test_create_missing_indexes(mocker: MockerFixture) -> None:
+    mocker.patch.object(migrations, "sleep")
+    mocker.patch.object(
+        Action,
+        "describe_table",
+        side_effect=[
+            # owner-id-index exists
+            {"GlobalSecondaryIndexes": [_index("owner-id-index")]},
+            # owner-index exists
+            {"GlobalSecondaryIndexes": [_index("owner-index")]},
+            # owner-shard-id-index exists
+            {"GlobalSecondaryIndexes": [_index("owner-shard-id-index")]},
+            # owner-shard-index exists
+            {"GlobalSecondaryIndexes": [_index("owner-shard-index")]},
+            # owner-status-index is missing, created, and eventually active
+            {"GlobalSecondaryIndexes": [_index("owner-index")]},
+            {"GlobalSecondaryIndexes": [_index("owner-status-index", "CREATING")]},
+            {"GlobalSecondaryIndexes": [_index("owner-status-index")]},
+            # status-shard-index exists
+            {"GlobalSecondaryIndexes": [_index("status-shard-index")]},
+        ],
+    )
+    dispatch = mocker.patch.object(Action._get_connection().connection, "dispatch")  # noqa: SLF001
+
+    assert create_missing_indexes(Action) == ["owner-status-index"]
+
+    dispatch.assert_called_once()
+    operation, kwargs = dispatch.call_args.args
+    assert operation == "UpdateTable"
+    assert kwargs["GlobalSecondaryIndexUpdates"] == [
+        {
+            "Create": {
+                "IndexName": "owner-status-index",
+                "KeySchema": [
+                    {"AttributeName": "owner_status", "KeyType": "HASH"},
+                    {"AttributeName": "updated_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        }
+    ]
+    assert kwargs["AttributeDefinitions"] == [
+        {"AttributeName": "owner_status", "AttributeType": "S"},
+        {"AttributeName": "updated_at", "AttributeType": "N"},
+    ]
+
+
+def _action(action_id: str, status: str, owner_status: str | None) -> Action:
+    return Action(action_id, owner="owner", status=status, owner_status=owner_status)
+
+
+def test_backfill_action_owner_status(mocker: MockerFixture) -> None:
+    mocker.patch.object(
+        Action,
+        "scan",
+        return_value=[
+            _action("stored-by-previous-version", "SUCCESS", None),
+            _action("updated-by-previous-version", "SUCCESS", "owner#RUNNING"),
+            _action("up-to-date", "RUNNING", "owner#RUNNING"),
+        ],
+    )
+    update = mocker.patch.object(Action, "update")
+
+    assert backfill_action_owner_status() == 2  # noqa: PLR2004
+    assert update.call_count == 2  # noqa: PLR2004
+    assert update.call_args.kwargs["touch"] is False
+
+
+def test_backfill_action_owner_status_sharded(mocker: MockerFixture) -> None:
+    mocker.patch.object(
+        Action,
+        "scan",
+        return_value=[
+            _action("stored-unsharded", "SUCCESS", "owner#SUCCESS"),
+            _action("stored-sharded", "SUCCESS", None),
+        ],
+    )
+    update = mocker.patch.object(Action, "update")
+
+    assert backfill_action_owner_status(shards=2) == 1
+    assert update.call_args.kwargs["actions"] == [Action.owner_status.remove()]
+
+
+def test_backfill_action_owner_shard(mocker: MockerFixture) -> None:
+    actions = [Action(str(i), owner="owner", status="SUCCESS") for i in range(10)]
+    actions[0].owner_shard = owner_shard_key("owner", "0", 2)
+    actions[1].owner_shard = "owner#2"  # stored with 3 shards
+    mocker.patch.object(Action, "scan", return_value=actions)
+    update = mocker.patch.object(Action, "update")
+
+    assert backfill_action_owner_shard(2) == 9  # noqa: PLR2004
+    assert {str(c.kwargs["actions"][0]) for c in update.call_args_list} == {
+        str(Action.owner_shard.set(key)) for key in ("owner#0", "owner#1")
+    }
+
+
+def test_backfill_action_status_shard(mocker: MockerFixture) -> None:
+    actions = [Action(str(i), status="SUCCESS") for i in range(3)]
+    actions[0].status_shard = status_shard_key("SUCCESS", "0")
+    actions[1].status_shard = status_shard_key("RUNNING", "1")
+    mocker.patch.object(Action, "scan", return_value=actions)
+    update = mocker.patch.object(Action, "update")
+
+    assert backfill_action_status_shard() == 2  # noqa: PLR2004
+    assert [str(c.kwargs["actions"][0]) for c in update.call_args_list] == [
+        str(Action.status_shard.set(status_shard_key("SUCCESS", str(i))))
+        for i in (1, 2)
+    ]
+
+
+def test_backfill_action_owner_status_concurrent_update(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(Action, "scan", return_value=[_action("1", "RUNNING", None)])
+    mocker.patch.object(
+        Action,
+        "update",
+        side_effect=UpdateError(
+            cause=ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+            )
+        ),
+    )
+    assert backfill_action_owner_status() == 0
+
+
+def test_backfill_action_owner_status_error(mocker: MockerFixture) -> None:
+    mocker.patch.object(Action, "scan", return_value=[_action("1", "RUNNING", None)])
+    mocker.patch.object(Action, "update", side_effect=UpdateError())
+    with pytest.raises(UpdateError):
+        backfill_action_owner_status()
+
+
+@pytest.mark.parametrize(
+    ("status", "enabled"), [("DISABLED", True), ("ENABLED", False)]
+)
+def test_enable_ttl(mocker: MockerFixture, status: str, enabled: bool) -> None:  # noqa: FBT001
+    mocker.patch.object(
+        Action._get_connection().connection,  # noqa: SLF001
+        "dispatch",
+        return_value={"TimeToLiveDescription": {"TimeToLiveStatus": status}},
+    )
+    update_ttl = mocker.patch.object(Action, "update_ttl")
+
+    assert enable_ttl(Action) is enabled
+    assert update_ttl.called is enabled
+
+
+def test_enable_ttl_without_ttl_attribute(mocker: MockerFixture) -> None:
+    dispatch = mocker.patch.object(User._get_connection().connection, "dispatch")  # noqa: SLF001
+    assert enable_ttl(User) is False
+    dispatch.assert_not_called()
+
+
+def test_backfill_action_expires_at(mocker: MockerFixture) -> None:
+    now = dt.now(UTC)
+    old = Action(
+        "old", status="SUCCESS", updated_at=(now - timedelta(days=90)).timestamp()
+    )
+    recent = Action(
+        "recent", status="FAILURE", updated_at=(now - timedelta(days=1)).timestamp()
+    )
+    running = Action("running", status="RUNNING", updated_at=now.timestamp())
+    mocker.patch.object(Action, "scan", return_value=[old, recent, running])
+    update = mocker.patch.object(Action, "update")
+
+    assert backfill_action_expires_at(retention_days=30, lead_days=2) == 2  # noqa: PLR2004
+
+    expiries = [
+        call.kwargs["actions"][0].values[1].value for call in update.call_args_list
+    ]
+    # not before the archiver has archived the old action
+    assert Action.expires_at.deserialize(expiries[0]["N"]) > now + timedelta(days=2)
+    assert Action.expires_at.deserialize(expiries[1]["N"]) > now + timedelta(days=28)
@@ -1,15 +1,43 @@
-# ruff: noqa: ARG003
+# ruff: noqa: ARG001, ARG002, ARG003
 from __future__ import annotations
 
+import time
+import uuid
+from itertools import islice
+from typing import TYPE_CHECKING, Any, ClassVar
+
 import pytest
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from pynamodb.exceptions import DoesNotExist, ScanError, UpdateError
 
 from automated_actions.db.models import (
+    Action,
     ActionManager,
+    ActionPage,
     ActionSchemaIn,
     ActionSchemaOut,
+    ActionSchemaSummary,
     ActionStatus,
+    StatusTransitionError,
+    decode_cursor,
+    encode_cursor,
     get_action_manager,
 )
+from automated_actions.db.models._action import (  # noqa: PLC2701
+    SUMMARY_ATTRIBUTES,
+    ActionEventAttribute,
+    action_id_bound,
+    is_time_ordered,
+    new_action_id,
+    status_shard_key,
+    status_shard_keys,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from pytest_mock import MockerFixture
 
 
 class ActionStub(ActionSchemaOut):
@@ -24,9 +52,53 @@ class ActionStub(ActionSchemaOut):
         username: str,
         status: ActionStatus | None,
         max_age: int | None = None,
-    ) -> list[ActionStub]:
-        """Stub method to return a list of actions."""
-        return [ACTION]
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[ActionStub]:
+        """Stub method to return a page of actions."""
+        return ActionPage(items=[ACTION], cursor=None)
+
+    @classmethod
+    def find_by_status(
+        cls,
+        status: ActionStatus,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> ActionPage[ActionStub]:
+        """Stub method to return a page of actions."""
+        return ActionPage(items=[ACTION], cursor=None)
+
+    @classmethod
+    def find_all(
+        cls,
+        statuses: Sequence[ActionStatus] = (),
+        name: str | None = None,
+        max_age: int | None = None,
+        *,
+        segments: int,
+        summary: bool = False,
+    ) -> Iterator[ActionStub]:
+        """Stub method to return all actions."""
+        return iter([ACTION])
+
+    @classmethod
+    def find_by_owner_after(
+        cls,
+        username: str,
+        after: str,
+        status: ActionStatus | None = None,
+        max_age: int | None = None,
+        *,
+        limit: int | None = None,
+        summary: bool = False,
+    ) -> ActionPage[ActionStub]:
+        """Stub method to return a page of actions."""
+        return ActionPage(items=[ACTION], cursor=ACTION.action_id)
 
     @classmethod
     def get_or_404(cls, action_id: str) -> ActionStub:
@@ -40,6 +112,19 @@ class ActionStub(ActionSchemaOut):
     def create(cls, params: ActionSchemaIn) -> ActionStub:
         return ACTION
 
+    @classmethod
+    def new(cls, params: ActionSchemaIn) -> ActionStub:
+        return ACTION.model_copy()
+
+    def save(self) -> None:
+        """Stub method to store an action."""
+
+    def set_final_state(
+        self, status: ActionStatus, result: str, task_args: dict
+    ) -> None:
+        self.status = status
+        self.result = result
+
 
 ACTION = ActionStub(
     action_id="1",
@@ -70,16 +155,965 @@ def test_model_action_action_manager(action_mgr: ActionManager) -> None:
 def test_model_action_action_manager_get_user_actions(
     action_mgr: ActionManager,
 ) -> None:
-    assert action_mgr.get_user_actions("fake", ActionStatus.RUNNING) == [ACTION]
+    assert action_mgr.get_user_actions("fake", ActionStatus.RUNNING).items == [ACTION]
 
 
 def test_model_action_action_manager_get_or_404(action_mgr: ActionManager) -> None:
     assert action_mgr.get_or_404("fake") == ACTION
 
 
-def test_model_action_action_manager_create_action(action_mgr: ActionManager) -> None:
+class CounterStub:
+    """Stub for the rate limit counter model."""
+
+    ops: ClassVar[dict[str, int]] = {}
+
+    @classmethod
+    def increment(cls, username: str, name: str) -> None:
+        cls.ops[f"{username}#{name}"] = cls.ops.get(f"{username}#{name}", 0) + 1
+
+    @classmethod
+    def decrement(cls, username: str, name: str, created_at: float) -> None:
+        cls.ops[f"{username}#{name}"] -= 1
+
+
+@pytest.mark.asyncio
+async def test_model_action_action_manager_rate_limit_counter() -> None:
     class User:
         username = "owner_email"
 
-    owner = User()
-    assert action_mgr.create_action("fake", owner) == ACTION
+    CounterStub.ops.clear()
+    action_mgr = ActionManager[ActionStub](ActionStub, counter=CounterStub)
+    action = await action_mgr.submit_action(
+        action_mgr.new_action("test action", User()), enqueue=lambda: None
+    )
+    assert CounterStub.ops == {"owner_email#test action": 1}
+
+    action_mgr.cancel_action(action)
+    assert CounterStub.ops == {"owner_email#test action": 0}
+
+    # cancelling twice doesn't decrement twice
+    action.status = ActionStatus.CANCELLED
+    action_mgr.cancel_action(action)
+    assert CounterStub.ops == {"owner_email#test action": 0}
+
+
+@pytest.mark.parametrize(
+    ("current", "status_code"), [(ActionStatus.CANCELLED, None), ("SUCCESS", 409)]
+)
+def test_model_action_action_manager_cancel_action_conflict(
+    mocker: MockerFixture, current: str, status_code: int | None
+) -> None:
+    CounterStub.ops.clear()
+    action_mgr = ActionManager[ActionStub](ActionStub, counter=CounterStub)
+    action = ACTION.model_copy(update={"status": ActionStatus.RUNNING})
+    mocker.patch.object(
+        ActionStub,
+        "set_status",
+        side_effect=StatusTransitionError("1", current, ActionStatus.CANCELLED),
+    )
+
+    if status_code:
+        with pytest.raises(HTTPException) as exc_info:
+            action_mgr.cancel_action(action)
+        assert exc_info.value.status_code == status_code
+    else:
+        # cancelled concurrently
+        action_mgr.cancel_action(action)
+    # the other request has decremented the counter or it doesn't count anymore
+    assert CounterStub.ops == {}
+
+
+def test_model_action_action_manager_new_action(action_mgr: ActionManager) -> None:
+    class User:
+        username = "owner_email"
+
+    assert action_mgr.new_action("test action", User()) == ACTION
+
+
+@pytest.mark.asyncio
+async def test_model_action_action_manager_submit_action(mocker: MockerFixture) -> None:
+    CounterStub.ops.clear()
+    action_mgr = ActionManager[ActionStub](ActionStub, counter=CounterStub)
+    action = ACTION.model_copy()
+    enqueue = mocker.Mock()
+
+    assert await action_mgr.submit_action(action, enqueue=enqueue) is action
+    enqueue.assert_called_once_with()
+    assert CounterStub.ops == {"owner_email#test action": 1}
+
+
+@pytest.mark.asyncio
+async def test_model_action_action_manager_submit_action_enqueue_failure(
+    mocker: MockerFixture,
+) -> None:
+    CounterStub.ops.clear()
+    action_mgr = ActionManager[ActionStub](ActionStub, counter=CounterStub)
+    action = ACTION.model_copy()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await action_mgr.submit_action(
+            action, enqueue=mocker.Mock(side_effect=ConnectionError("queue down"))
+        )
+
+    assert exc_info.value.status_code == 503  # noqa: PLR2004
+    # the stored action is marked as failed and doesn't count against rate limits
+    assert action.status == ActionStatus.FAILURE
+    assert action.result == "Unable to enqueue the action: queue down"
+    assert CounterStub.ops == {"owner_email#test action": 0}
+
+
+@pytest.mark.asyncio
+async def test_model_action_action_manager_submit_action_save_failure(
+    mocker: MockerFixture,
+) -> None:
+    CounterStub.ops.clear()
+    action_mgr = ActionManager[ActionStub](ActionStub, counter=CounterStub)
+    action = ACTION.model_copy()
+    mocker.patch.object(ActionStub, "save", side_effect=ConnectionError("db down"))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await action_mgr.submit_action(action, enqueue=mocker.Mock())
+
+    assert exc_info.value.status_code == 503  # noqa: PLR2004
+    # the enqueued task skips the action because it has never been stored
+    assert action.status != ActionStatus.FAILURE
+    assert CounterStub.ops == {"owner_email#test action": 0}
+
+
+def test_model_action_action_manager_stats(mocker: MockerFixture) -> None:
+    stats = mocker.Mock()
+    action_mgr = ActionManager[ActionStub](ActionStub, stats=stats)
+    action = ACTION.model_copy(update={"status": ActionStatus.RUNNING})
+
+    action_mgr.cancel_action(action)
+    action.status = ActionStatus.CANCELLED
+    action_mgr.cancel_action(action)
+
+    stats.increment.assert_called_once_with("test action", "CANCELLED", "owner_email")
+
+
+@pytest.mark.asyncio
+async def test_model_action_action_manager_stats_enqueue_failure(
+    mocker: MockerFixture,
+) -> None:
+    stats = mocker.Mock()
+    stats.increment.side_effect = UpdateError("boom")
+    action_mgr = ActionManager[ActionStub](ActionStub, stats=stats)
+    action = ACTION.model_copy()
+
+    with pytest.raises(HTTPException):
+        await action_mgr.submit_action(
+            action, enqueue=mocker.Mock(side_effect=ConnectionError("queue down"))
+        )
+
+    # counting is best effort
+    stats.increment.assert_called_once_with("test action", "FAILURE", "owner_email")
+
+
+LAST_EVALUATED_KEY = {
+    "action_id": {"S": "1"},
+    "owner": {"S": "owner_email"},
+    "updated_at": {"N": "2"},
+}
+
+
+def test_model_action_find_by_owner(mocker: MockerFixture) -> None:
+    results = mocker.MagicMock()
+    results.__iter__.return_value = iter([ACTION])
+    results.last_evaluated_key = LAST_EVALUATED_KEY
+    query = mocker.patch.object(Action.owner_index, "query", return_value=results)
+
+    page = Action.find_by_owner(
+        "owner_email", limit=1, cursor=encode_cursor(LAST_EVALUATED_KEY)
+    )
+
+    assert page.items == [ACTION]
+    assert decode_cursor(page.cursor or "", owner="owner_email") == LAST_EVALUATED_KEY
+    query.assert_called_once_with(
+        "owner_email",
+        range_key_condition=None,
+        filter_condition=None,
+        scan_index_forward=False,
+        limit=1,
+        last_evaluated_key=LAST_EVALUATED_KEY,
+        attributes_to_get=None,
+    )
+
+
+def test_model_action_time_ordered_ids() -> None:
+    ids = [
+        Action.new(ActionSchemaIn(name="no-op", owner="o")).action_id for _ in range(3)
+    ]
+    assert all(is_time_ordered(action_id) for action_id in ids)
+    assert sorted(ids) == ids
+    assert not is_time_ordered(str(uuid.uuid4()))
+    assert not is_time_ordered("1")
+    # the bound sorts after the IDs created until then, but not after later ones
+    assert action_id_bound(time.time() - 1) < min(ids)
+    assert max(ids) < action_id_bound(time.time())
+
+
+def test_model_action_find_by_owner_after(mocker: MockerFixture) -> None:
+    results = mocker.MagicMock()
+    results.__iter__.return_value = iter([ACTION])
+    results.last_evaluated_key = {"action_id": {"S": "next"}, "owner": {"S": "o"}}
+    query = mocker.patch.object(Action.owner_id_index, "query", return_value=results)
+    after = new_action_id()
+
+    page = Action.find_by_owner_after("o", after, ActionStatus.RUNNING, limit=1)
+
+    assert page == ActionPage(items=[ACTION], cursor="next")
+    kwargs = query.call_args.kwargs
+    assert kwargs["last_evaluated_key"] == {
+        "owner": {"S": "o"},
+        "action_id": {"S": after},
+    }
+    assert kwargs["limit"] == 1
+    assert kwargs["filter_condition"] is not None
+    assert kwargs["range_key_condition"].values[1].value["S"] > after
+
+
+def test_model_action_find_by_owner_after_uuid4() -> None:
+    with pytest.raises(ValueError, match="not a time-ordered action ID"):
+        Action.find_by_owner_after("o", str(uuid.uuid4()))
+
+
+def test_model_action_find_by_owner_summary(mocker: MockerFixture) -> None:
+    query = mocker.patch.object(Action.owner_index, "query")
+    query.return_value.last_evaluated_key = None
+
+    Action.find_by_owner("owner_email", summary=True)
+
+    assert query.call_args.kwargs["attributes_to_get"] == [
+        "name",
+        "owner",
+        "status",
+        "action_id",
+        "created_at",
+        "updated_at",
+        # the index keys, see SUMMARY_QUERY_ATTRIBUTES
+        "owner_status",
+        "owner_shard",
+        "status_shard",
+    ]
+
+
+def test_model_action_dump_summary() -> None:
+    action = Action(
+        action_id="1",
+        name="action",
+        owner="owner_email",
+        status=ActionStatus.SUCCESS,
+        result="result",
+        task_args={"key": "value"},
+        created_at=1.0,
+        updated_at=2.0,
+    )
+
+    assert action.dump_summary() == ActionSchemaSummary(
+        action_id="1",
+        name="action",
+        owner="owner_email",
+        status=ActionStatus.SUCCESS,
+        created_at=1.0,
+        updated_at=2.0,
+    )
+
+
+def test_model_action_find_by_owner_last_page(mocker: MockerFixture) -> None:
+    results = mocker.MagicMock()
+    results.__iter__.return_value = iter([])
+    results.last_evaluated_key = None
+    mocker.patch.object(Action.owner_index, "query", return_value=results)
+
+    assert Action.find_by_owner("owner_email") == ActionPage(items=[], cursor=None)
+
+
+def test_model_action_find_by_owner_status_index(mocker: MockerFixture) -> None:
+    settings = mocker.patch("automated_actions.db.models._action.settings")
+    settings.action_status_index_enabled = True
+    settings.action_owner_shards = 0
+    results = mocker.MagicMock()
+    results.__iter__.return_value = iter([ACTION])
+    results.last_evaluated_key = None
+    owner_query = mocker.patch.object(Action.owner_index, "query")
+    query = mocker.patch.object(
+        Action.owner_status_index, "query", return_value=results
+    )
+    key = {**LAST_EVALUATED_KEY, "owner_status": {"S": "owner_email#RUNNING"}}
+    del key["owner"]
+
+    page = Action.find_by_owner(
+        "owner_email", ActionStatus.RUNNING, limit=1, cursor=encode_cursor(key)
+    )
+
+    assert page == ActionPage(items=[ACTION], cursor=None)
+    owner_query.assert_not_called()
+    query.assert_called_once_with(
+        "owner_email#RUNNING",
+        range_key_condition=None,
+        scan_index_forward=False,
+        limit=1,
+        last_evaluated_key=key,
+        attributes_to_get=None,
+    )
+
+
+def test_model_action_find_by_owner_status_filter(mocker: MockerFixture) -> None:
+    # the owner-status index isn't enabled by default
+    query = mocker.patch.object(Action.owner_index, "query")
+    query.return_value.last_evaluated_key = None
+
+    Action.find_by_owner("owner_email", ActionStatus.RUNNING)
+
+    assert query.call_args.kwargs["filter_condition"] is not None
+
+
+def _shard_key(
+    shard: str, action_id: str, updated_at: int, attribute: str = "owner_shard"
+) -> dict:
+    return {
+        "action_id": {"S": action_id},
+        attribute: {"S": shard},
+        "updated_at": {"N": str(updated_at)},
+    }
+
+
+def _shard_query(
+    mocker: MockerFixture,
+    shards: dict[str, list[Action]],
+    page_size: int = 3,
+    attribute: str = "owner_shard",
+) -> Any:
+    """Fake a query of the owner-shard index, newest first, in pages."""
+
+    def query(
+        key: str,
+        last_evaluated_key: dict | None = None,
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        items = [
+            a
+            for a in shards[key]
+            if last_evaluated_key is None
+            or a.updated_at < int(last_evaluated_key["updated_at"]["N"])
+        ]
+        size = min(page_size, limit or page_size)
+        page = items[:size]
+        results = mocker.MagicMock()
+        results.__iter__.return_value = iter(page)
+        results.last_evaluated_key = (
+            _shard_key(key, page[-1].action_id, page[-1].updated_at, attribute)
+            if len(page) == size
+            else None
+        )
+        return results
+
+    return query
+
+
+def test_model_action_find_by_owner_shards(mocker: MockerFixture) -> None:
+    mocker.patch("automated_actions.db.models._action.settings").action_owner_shards = 2
+    shards = {
+        "owner_email#0": [
+            Action(str(t), owner="owner_email", updated_at=t) for t in (5, 3, 1)
+        ],
+        "owner_email#1": [
+            Action(str(t), owner="owner_email", updated_at=t) for t in (4, 2)
+        ],
+    }
+    owner_query = mocker.patch.object(Action.owner_index, "query")
+    shard_query = mocker.patch.object(
+        Action.owner_shard_index, "query", side_effect=_shard_query(mocker, shards)
+    )
+
+    page = Action.find_by_owner("owner_email", limit=3)
+
+    # the newest actions of all shards
+    assert [a.action_id for a in page.items] == ["5", "4", "3"]
+    owner_query.assert_not_called()
+    assert {c.args[0] for c in shard_query.call_args_list} == set(shards)
+    assert all(
+        c.kwargs["last_evaluated_key"] is None
+        for c in shard_query.call_args_list[: len(shards)]
+    )
+
+    # the next page continues each shard after its last action on the page
+    shard_query.reset_mock()
+    first_cursor = page.cursor
+    Action.find_by_owner("owner_email", limit=3, cursor=first_cursor)
+    assert {
+        c.args[0]: c.kwargs["last_evaluated_key"]
+        for c in shard_query.call_args_list[: len(shards)]
+    } == {
+        "owner_email#0": _shard_key("owner_email#0", "3", 3),
+        "owner_email#1": _shard_key("owner_email#1", "4", 4),
+    }
+
+    # exhausted shards aren't queried again
+    page = Action.find_by_owner("owner_email", limit=4)
+    assert [a.action_id for a in page.items] == ["5", "4", "3", "2"]
+    shard_query.reset_mock()
+    page = Action.find_by_owner("owner_email", limit=4, cursor=page.cursor)
+    assert [a.action_id for a in page.items] == ["1"]
+    assert [c.args[0] for c in shard_query.call_args_list] == ["owner_email#0"]
+    assert page.cursor is None
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Action.find_by_owner("other_owner", cursor=first_cursor)
+
+
+def test_model_action_find_by_owner_shards_reads(mocker: MockerFixture) -> None:
+    mocker.patch("automated_actions.db.models._action.settings").action_owner_shards = 4
+    shards = {
+        f"owner_email#{shard}": [
+            Action(str(t), owner="owner_email", updated_at=t)
+            for t in range(40 + shard, 0, -4)
+        ]
+        for shard in range(4)
+    }
+    query = _shard_query(mocker, shards)
+    read = []
+
+    def counting_query(key: str, **kwargs: Any) -> Any:
+        results = query(key, **kwargs)
+        items = list(results.__iter__.return_value)
+        read.extend(items)
+        results.__iter__.return_value = iter(items)
+        return results
+
+    mocker.patch.object(Action.owner_shard_index, "query", side_effect=counting_query)
+    page = Action.find_by_owner("owner_email", limit=8)
+
+    assert [a.updated_at for a in page.items] == list(range(43, 35, -1))
+    # two chunks of 8 / 4 actions per shard instead of 8 actions per shard
+    assert len(read) == 16  # noqa: PLR2004
+
+
+def test_model_action_find_by_owner_shards_short_page(mocker: MockerFixture) -> None:
+    mocker.patch("automated_actions.db.models._action.settings").action_owner_shards = 2
+    running = {
+        "owner_email#0": [
+            Action(str(t), owner="owner_email", status="RUNNING", updated_at=t)
+            for t in (10, 8)
+        ],
+        "owner_email#1": [
+            Action(str(t), owner="owner_email", status="RUNNING", updated_at=t)
+            for t in (7, 6)
+        ],
+    }
+    # a query of shard 0 after 10 reads 9, which the filter discards
+    pages = {
+        ("owner_email#0", None): ([running["owner_email#0"][0]], 10),
+        ("owner_email#0", 10): ([], 9),
+        ("owner_email#0", 9): ([running["owner_email#0"][1]], 8),
+        ("owner_email#0", 8): ([], None),
+        ("owner_email#1", None): ([running["owner_email#1"][0]], 7),
+        ("owner_email#1", 7): ([running["owner_email#1"][1]], 6),
+        ("owner_email#1", 6): ([], None),
+    }
+
+    def query(key: str, last_evaluated_key: dict | None = None, **kwargs: Any) -> Any:
+        start = (
+            int(last_evaluated_key["updated_at"]["N"]) if last_evaluated_key else None
+        )
+        items, last = pages[key, start]
+        results = mocker.MagicMock()
+        results.__iter__.return_value = iter(items)
+        results.last_evaluated_key = (
+            _shard_key(key, str(last), last) if last is not None else None
+        )
+        return results
+
+    shard_query = mocker.patch.object(
+        Action.owner_shard_index, "query", side_effect=query
+    )
+
+    page = Action.find_by_owner("owner_email", ActionStatus.RUNNING, limit=2)
+
+    # shard 0 is read past its short page: 8 is newer than 7
+    assert [a.action_id for a in page.items] == ["10", "8"]
+    continued = [
+        c.kwargs
+        for c in shard_query.call_args_list
+        if c.kwargs["last_evaluated_key"] == _shard_key("owner_email#0", "9", 9)
+    ]
+    assert len(continued) == 1
+    assert continued[0]["limit"] == 1
+    assert continued[0]["filter_condition"] is not None
+
+    # the next page reads shard 1 from its start
+    page = Action.find_by_owner(
+        "owner_email", ActionStatus.RUNNING, limit=2, cursor=page.cursor
+    )
+    assert [a.action_id for a in page.items] == ["7", "6"]
+    assert page.cursor is None
+
+
+def test_model_action_find_by_owner_shards_summary(mocker: MockerFixture) -> None:
+    mocker.patch("automated_actions.db.models._action.settings").action_owner_shards = 2
+
+    def item(t: int) -> dict:
+        return Action(
+            str(t),
+            name="no-op",
+            owner="owner_email",
+            status="RUNNING" if t % 2 == 0 else "SUCCESS",
+            owner_shard="owner_email#0",
+            created_at=t,
+            updated_at=t,
+        ).serialize()
+
+    def key(t: int) -> dict:
+        return {k: v for k, v in item(t).items() if k in _shard_key("", "", 0)}
+
+    def query(
+        hash_key: str,
+        exclusive_start_key: dict | None = None,
+        attributes_to_get: list[str] | None = None,
+        **kwargs: Any,
+    ) -> dict:
+        if hash_key == "owner_email#1":
+            items, last = [], None
+        elif exclusive_start_key is None:
+            # the filter discards 9 of the page of two actions
+            items, last = [item(10)], key(9)
+        elif exclusive_start_key == key(9):
+            items, last = [item(8), item(6)], key(6)
+        else:
+            assert exclusive_start_key == key(8)
+            items, last = [item(6)], None
+        return {
+            "Count": len(items),
+            "ScannedCount": len(items),
+            "Items": [
+                {k: v for k, v in i.items() if k in (attributes_to_get or i)}
+                for i in items
+            ],
+            **({"LastEvaluatedKey": last} if last else {}),
+        }
+
+    mocker.patch.object(Action._get_connection(), "query", side_effect=query)  # noqa: SLF001
+
+    # the page of shard 0 ends within the second DynamoDB page; it continues
+    # after the key of 8, built from its projected attributes
+    page = Action.find_by_owner(
+        "owner_email", ActionStatus.RUNNING, limit=4, summary=True
+    )
+
+    assert [a.action_id for a in page.items] == ["10", "8", "6"]
+    assert page.cursor is None
+
+
+def test_model_action_find_by_owner_after_shards(mocker: MockerFixture) -> None:
+    mocker.patch("automated_actions.db.models._action.settings").action_owner_shards = 2
+    after = new_action_id()
+    ids = sorted(new_action_id() for _ in range(4))
+    shards = {"owner_email#0": [ids[0], ids[3]], "owner_email#1": [ids[1], ids[2]]}
+
+    def query(
+        key: str, last_evaluated_key: dict, limit: int | None = None, **kwargs: Any
+    ) -> Any:
+        items = [i for i in shards[key] if i > last_evaluated_key["action_id"]["S"]]
+        results = mocker.MagicMock()
+        results.__iter__.return_value = iter([
+            Action(action_id, owner="owner_email") for action_id in items[:limit]
+        ])
+        results.last_evaluated_key = (
+            {"owner_shard": {"S": key}, "action_id": {"S": items[limit - 1]}}
+            if limit and len(items) > limit
+            else None
+        )
+        return results
+
+    owner_query = mocker.patch.object(Action.owner_id_index, "query")
+    shard_query = mocker.patch.object(
+        Action.owner_shard_id_index, "query", side_effect=query
+    )
+
+    page = Action.find_by_owner_after("owner_email", after, limit=2)
+
+    # the oldest actions of all shards after `after`
+    assert [a.action_id for a in page.items] == ids[:2]
+    assert page.cursor == ids[1]
+    owner_query.assert_not_called()
+    assert {
+        c.args[0]: c.kwargs["last_evaluated_key"]
+        for c in shard_query.call_args_list[: len(shards)]
+    } == {key: {"owner_shard": {"S": key}, "action_id": {"S": after}} for key in shards}
+
+    page = Action.find_by_owner_after("owner_email", after, limit=10)
+    assert [a.action_id for a in page.items] == ids
+    assert page.cursor is None
+
+
+def test_model_action_sharded_write_skips_owner_indexes(mocker: MockerFixture) -> None:
+    settings = mocker.patch("automated_actions.db.models._action.settings")
+    settings.action_owner_shards = 4
+    settings.action_retention_days = 0
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+    item = action.serialize()
+    indexes = Action._get_schema()["global_secondary_indexes"]  # noqa: SLF001
+
+    # no index is keyed by the owner or the status alone, so the writes
+    # spread over the shards
+    assert item["owner"] == {"S": "owner_email"}
+    assert item["status"] == {"S": "PENDING"}
+    assert "owner_status" not in item
+    for index in indexes:
+        for key in index["key_schema"]:
+            if key["KeyType"] == "HASH" and key["AttributeName"] in item:
+                assert item[key["AttributeName"]]["S"] not in {
+                    "owner_email",
+                    "owner_email#PENDING",
+                    "PENDING",
+                }
+    assert {i["index_name"] for i in indexes} == {
+        "owner-shard-index",
+        "owner-shard-id-index",
+        "status-shard-index",
+    }
+
+    action.set_status(ActionStatus.CANCELLED)
+    assert str(update.call_args.args[0][2]) == str(Action.owner_status.remove())
+
+
+def test_model_action_owner_shard(mocker: MockerFixture) -> None:
+    assert (
+        Action.new(ActionSchemaIn(name="no-op", owner="owner_email")).owner_shard
+        is None
+    )
+
+    mocker.patch("automated_actions.db.models._action.settings").action_owner_shards = 4
+    shards = {
+        Action.new(ActionSchemaIn(name="no-op", owner="owner_email")).owner_shard
+        for _ in range(100)
+    }
+    assert shards == {f"owner_email#{shard}" for shard in range(4)}
+
+
+def test_model_action_find_by_status(mocker: MockerFixture) -> None:
+    shards = {key: [] for key in status_shard_keys("RUNNING")}
+    shards["RUNNING#0"] = [Action(str(t), updated_at=t) for t in (5, 3)]
+    shards["RUNNING#7"] = [Action(str(t), updated_at=t) for t in (4, 2)]
+    query = mocker.patch.object(
+        Action.status_shard_index,
+        "query",
+        side_effect=_shard_query(mocker, shards, attribute="status_shard"),
+    )
+
+    page = Action.find_by_status(ActionStatus.RUNNING, limit=3)
+
+    # the newest actions of all shards of the status
+    assert [a.action_id for a in page.items] == ["5", "4", "3"]
+    assert {c.args[0] for c in query.call_args_list} == set(shards)
+    page = Action.find_by_status(ActionStatus.RUNNING, limit=3, cursor=page.cursor)
+    assert [a.action_id for a in page.items] == ["2"]
+    assert page.cursor is None
+    # cursors of other indexes are invalid
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Action.find_by_status(
+            ActionStatus.RUNNING, cursor=encode_cursor(LAST_EVALUATED_KEY)
+        )
+
+
+def test_model_action_status_shard(mocker: MockerFixture) -> None:
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    actions = [
+        Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+        for _ in range(100)
+    ]
+    # the actions with a status don't share a single index partition
+    assert {a.status_shard for a in actions} == set(status_shard_keys("PENDING"))
+
+    actions[0].set_status(ActionStatus.CANCELLED)
+    assert str(update.call_args.args[0][1]) == str(
+        Action.status_shard.set(status_shard_key("CANCELLED", actions[0].action_id))
+    )
+
+
+def _segment_scan(
+    filter_condition: object,
+    segment: int,
+    total_segments: int,
+    attributes_to_get: object,
+) -> Iterator[Action]:
+    for i in range(3):
+        yield Action(f"{segment}-{i}")
+
+
+def test_model_action_find_all(mocker: MockerFixture) -> None:
+    scan = mocker.patch.object(Action, "scan", side_effect=_segment_scan)
+
+    actions = Action.find_all(
+        [ActionStatus.RUNNING, ActionStatus.FAILURE],
+        "no-op",
+        segments=4,
+        summary=True,
+    )
+
+    assert sorted(a.action_id for a in actions) == [
+        f"{segment}-{i}" for segment in range(4) for i in range(3)
+    ]
+    assert sorted(c.kwargs["segment"] for c in scan.call_args_list) == [0, 1, 2, 3]
+    assert {c.kwargs["total_segments"] for c in scan.call_args_list} == {4}
+    assert str(scan.call_args.args[0]) == str(
+        Action.status.is_in("FAILURE", "RUNNING") & (Action.name == "no-op")
+    )
+    assert scan.call_args.kwargs["attributes_to_get"] == SUMMARY_ATTRIBUTES
+
+
+def test_model_action_find_all_segment_error(mocker: MockerFixture) -> None:
+    def _scan(*args: object, segment: int, **kwargs: object) -> Iterator[Action]:
+        if segment == 1:
+            raise ScanError("boom")
+        yield from _segment_scan(*args, segment=segment, **kwargs)
+
+    mocker.patch.object(Action, "scan", side_effect=_scan)
+
+    with pytest.raises(ScanError):
+        list(Action.find_all(segments=2))
+
+
+def test_model_action_parallel_scan_stops(mocker: MockerFixture) -> None:
+    def _scan(*args: object, segment: int, **kwargs: object) -> Iterator[Action]:
+        while True:
+            yield Action(str(segment))
+
+    mocker.patch.object(Action, "scan", side_effect=_scan)
+
+    actions = Action.parallel_scan(segments=2, buffer_size=1)
+    assert len(list(islice(actions, 5))) == 5  # noqa: PLR2004
+    # stops the endless scans
+    actions.close()
+
+
+def test_model_action_action_manager_get_all_actions(
+    action_mgr: ActionManager,
+) -> None:
+    assert list(action_mgr.get_all_actions(segments=2)) == [ACTION]
+
+
+def test_model_action_action_manager_get_user_actions_after(
+    action_mgr: ActionManager,
+) -> None:
+    page = action_mgr.get_user_actions_after("owner_email", "after", limit=1)
+    assert page == ActionPage(items=[ACTION], cursor=ACTION.action_id)
+
+
+def test_model_action_action_manager_get_actions_by_status(
+    action_mgr: ActionManager,
+) -> None:
+    assert action_mgr.get_actions_by_status(ActionStatus.RUNNING).items == [ACTION]
+
+
+def test_model_action_owner_status() -> None:
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+    assert action.owner_status == "owner_email#PENDING"
+
+
+def test_model_action_set_status_updates_owner_status(mocker: MockerFixture) -> None:
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+
+    action.set_status(ActionStatus.CANCELLED)
+
+    actions = update.call_args.args[0]
+    assert [str(a) for a in actions[:3:2]] == [
+        str(Action.status.set("CANCELLED")),
+        str(Action.owner_status.set("owner_email#CANCELLED")),
+    ]
+
+
+def test_model_action_final_status_expires(mocker: MockerFixture) -> None:
+    settings = mocker.patch("automated_actions.db.models._action.settings")
+    settings.action_retention_days = 30
+    settings.action_owner_shards = 0
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+
+    action.start()
+    assert "expires_at" not in str(update.call_args.args[0])
+
+    action.set_final_state(ActionStatus.SUCCESS, result="ok", task_args={})
+    assert "expires_at" in str(update.call_args.args[0])
+
+
+def test_model_action_final_status_without_retention(mocker: MockerFixture) -> None:
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+
+    action.set_final_state(ActionStatus.SUCCESS, result="ok", task_args={})
+
+    assert "expires_at" not in str(update.call_args.args[0])
+
+
+def test_model_action_schema_out_plain_task_args() -> None:
+    # e.g., read from the archive
+    action = ActionSchemaOut.model_validate_json(
+        '{"name": "no-op", "owner": "owner_email", "action_id": "1",'
+        ' "task_args": {"key": "value"}, "created_at": 1.0, "updated_at": 2.0}'
+    )
+    assert action.task_args == {"key": "value"}
+
+
+def test_model_action_history(mocker: MockerFixture) -> None:
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+    assert [e.as_dict() for e in action.history] == [
+        {"event": "PENDING", "at": action.created_at}
+    ]
+
+    action.start(attempt=2)
+    assert "history = list_append (if_not_exists (history" in str(
+        update.call_args.args[0]
+    )
+    assert "'event': {'S': 'RUNNING'}" in str(update.call_args.args[0])
+    assert "'attempt': {'N': '2'}" in str(update.call_args.args[0])
+
+    action.record_retry(attempt=2, error="x" * 2000)
+    assert "'event': {'S': 'RETRY'}" in str(update.call_args.args[0])
+    assert f"'error': {{'S': '{'x' * 1000}'}}" in str(update.call_args.args[0])
+    assert str(update.call_args.args[1]) == str(Action.action_id.exists())
+
+
+def test_model_action_history_dump() -> None:
+    action = Action.from_raw_data(
+        Action(
+            "1",
+            name="no-op",
+            owner="owner_email",
+            status=ActionStatus.SUCCESS,
+            created_at=1.0,
+            updated_at=20.0,
+            history=[
+                ActionEventAttribute(event="PENDING", at=1.0),
+                ActionEventAttribute(event="RUNNING", at=3.5, attempt=0),
+                ActionEventAttribute(event="RETRY", at=5.0, attempt=0, error="boom"),
+                ActionEventAttribute(event="RUNNING", at=10.0, attempt=1),
+                ActionEventAttribute(event="SUCCESS", at=20.0),
+            ],
+        ).serialize()
+    )
+
+    dump = action.dump()
+
+    assert [e.event for e in dump.history or []] == [
+        "PENDING",
+        "RUNNING",
+        "RETRY",
+        "RUNNING",
+        "SUCCESS",
+    ]
+    assert dump.queue_wait_secs == pytest.approx(2.5)
+    assert dump.run_secs == pytest.approx(16.5)
+
+
+def test_model_action_history_dump_without_history() -> None:
+    dump = Action(
+        "1", name="no-op", owner="owner_email", created_at=1.0, updated_at=2.0
+    ).dump()
+    assert dump.history is None
+    assert dump.queue_wait_secs is None
+    assert dump.run_secs is None
+
+
+def _condition_check_failed() -> UpdateError:
+    return UpdateError(
+        cause=ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+    )
+
+
+def test_model_action_start(mocker: MockerFixture) -> None:
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+
+    action.start(attempt=1)
+
+    condition = update.call_args.args[1]
+    assert str(condition) == str(
+        (Action.status == "PENDING")
+        | ((Action.status == "RUNNING") & (Action.attempt < 1))
+    )
+    assert str(Action.attempt.set(1)) in [str(a) for a in update.call_args.args[0]]
+
+
+@pytest.mark.parametrize(
+    ("status", "allowed"),
+    [
+        (ActionStatus.SUCCESS, ["RUNNING"]),
+        (ActionStatus.FAILURE, ["PENDING", "RUNNING"]),
+        (ActionStatus.CANCELLED, ["PENDING", "RUNNING"]),
+    ],
+)
+def test_model_action_transition_condition(
+    mocker: MockerFixture, status: ActionStatus, allowed: list[str]
+) -> None:
+    update = mocker.patch("automated_actions.db.models._base.PynamoModel.update")
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+
+    action.set_status(status)
+
+    assert str(update.call_args.args[1]) == str(Action.status.is_in(*allowed))
+
+
+def test_model_action_transition_conflict(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "automated_actions.db.models._base.PynamoModel.update",
+        side_effect=_condition_check_failed(),
+    )
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+
+    def refresh() -> None:
+        action.status = ActionStatus.CANCELLED
+
+    mocker.patch.object(action, "refresh", side_effect=refresh)
+
+    with pytest.raises(StatusTransitionError) as exc_info:
+        action.start()
+    assert exc_info.value.current == ActionStatus.CANCELLED
+    assert exc_info.value.status == ActionStatus.RUNNING
+
+
+def test_model_action_transition_not_stored(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "automated_actions.db.models._base.PynamoModel.update",
+        side_effect=_condition_check_failed(),
+    )
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+    mocker.patch.object(action, "refresh", side_effect=DoesNotExist())
+
+    with pytest.raises(UpdateError):
+        action.start()
+
+
+def test_model_action_transition_error(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "automated_actions.db.models._base.PynamoModel.update",
+        side_effect=UpdateError(),
+    )
+    action = Action.new(ActionSchemaIn(name="no-op", owner="owner_email"))
+    refresh = mocker.patch.object(action, "refresh")
+
+    with pytest.raises(UpdateError):
+        action.set_status(ActionStatus.CANCELLED)
+    refresh.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        encode_cursor({"action_id": {"S": "1"}}),  # type: ignore[dict-item]
+        encode_cursor({**LAST_EVALUATED_KEY, "owner": {"S": "other_owner"}}),
+        encode_cursor({**LAST_EVALUATED_KEY, "updated_at": {"N": 2}}),  # type: ignore[dict-item]
+        "W10=",  # []
+    ],
+)
+def test_model_action_decode_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, owner="owner_email")
@@ -0,0 +1,68 @@
+from datetime import UTC
+from datetime import datetime as dt
+from typing import TYPE_CHECKING
+
+import pytest
+from pynamodb.exceptions import UpdateError
+
+from automated_actions.db.models import RateLimitCounter
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+# 15 minutes into the 10:00 window of the default 1h rate limit window
+NOW = dt(2025, 1, 1, 10, 15, tzinfo=UTC)
+WINDOW_START = dt(2025, 1, 1, 10, 0, tzinfo=UTC).timestamp()
+
+
+@pytest.fixture(autouse=True)
+def now(mocker: MockerFixture) -> None:
+    mock_dt = mocker.patch("automated_actions.db.models._rate_limit.dt")
+    mock_dt.now.return_value = NOW
+    mock_dt.fromtimestamp = dt.fromtimestamp
+
+
+def _counter(window: float, ops: int) -> RateLimitCounter:
+    return RateLimitCounter("user#action", window, ops=ops)
+
+
+def test_rate_limit_counter_get_ops_count(mocker: MockerFixture) -> None:
+    query = mocker.patch.object(
+        RateLimitCounter,
+        "query",
+        return_value=[_counter(WINDOW_START - 3600, 4), _counter(WINDOW_START, 2)],
+    )
+    # 2 + 4 * 0.75
+    assert RateLimitCounter.get_ops_count("user", "action") == 5  # noqa: PLR2004
+    assert query.call_args.args[0] == "user#action"
+
+
+def test_rate_limit_counter_get_ops_count_rounds_up(mocker: MockerFixture) -> None:
+    mocker.patch.object(
+        RateLimitCounter, "query", return_value=[_counter(WINDOW_START - 3600, 1)]
+    )
+    assert RateLimitCounter.get_ops_count("user", "action") == 1
+
+
+def test_rate_limit_counter_get_ops_count_empty(mocker: MockerFixture) -> None:
+    mocker.patch.object(RateLimitCounter, "query", return_value=[])
+    assert RateLimitCounter.get_ops_count("user", "action") == 0
+
+
+def test_rate_limit_counter_increment(mocker: MockerFixture) -> None:
+    instances = []
+
+    def _update(self: RateLimitCounter, actions: list) -> None:
+        instances.append((self.key, self.window, len(actions)))
+
+    mocker.patch.object(RateLimitCounter, "update", _update)
+    RateLimitCounter.increment("user", "action")
+    assert instances == [("user#action", WINDOW_START, 2)]
+
+
+def test_rate_limit_counter_decrement_expired_window(mocker: MockerFixture) -> None:
+    update = mocker.patch.object(
+        RateLimitCounter, "update", side_effect=UpdateError("condition failed")
+    )
+    RateLimitCounter.decrement("user", "action", created_at=WINDOW_START - 7200)
+    update.assert_called_once()
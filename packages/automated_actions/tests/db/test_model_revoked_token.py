@@ -0,0 +1,45 @@
+from datetime import UTC
+from datetime import datetime as dt
+from datetime import timedelta as td
+from typing import TYPE_CHECKING
+
+from automated_actions.db.models import RevokedToken
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+def test_revoked_token_revoke(mocker: MockerFixture) -> None:
+    save = mocker.patch.object(RevokedToken, "save")
+    expires_at = dt(2100, 1, 1, tzinfo=UTC)
+    RevokedToken.revoke("jti", "username", expires_at)
+    save.assert_called_once_with()
+
+
+def _token(jti: str, expires_at: dt) -> RevokedToken:
+    return RevokedToken(jti, username="u", revoked_at=1, expires_at=expires_at)
+
+
+def test_revoked_token_revoked_since(mocker: MockerFixture) -> None:
+    now = dt.now(UTC)
+    revoked = _token("revoked", now + td(days=1))
+    mocker.patch.object(
+        RevokedToken,
+        "scan",
+        return_value=[
+            revoked,
+            # expired, but not yet deleted by DynamoDB
+            _token("expired", now - td(days=1)),
+        ],
+    )
+    query = mocker.patch.object(
+        RevokedToken.revoked_at_index, "query", return_value=[revoked]
+    )
+
+    expires_at = revoked.expires_at.timestamp()
+    assert RevokedToken.revoked_since() == {"revoked": expires_at}
+    query.assert_not_called()
+
+    assert RevokedToken.revoked_since(1000.0) == {"revoked": expires_at}
+    RevokedToken.scan.assert_called_once()  # type: ignore[attr-defined]
+    assert query.call_args.args[0] == "revoked"
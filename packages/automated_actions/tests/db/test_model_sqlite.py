@@ -0,0 +1,243 @@
+from datetime import UTC
+from datetime import datetime as dt
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import HTTPException
+from pynamodb.exceptions import UpdateError
+
+from automated_actions.config import settings
+from automated_actions.db.models import (
+    ActionSchemaIn,
+    ActionStatus,
+    SQLiteAction,
+    SQLiteActionStats,
+    SQLiteRateLimitCounter,
+    StatusTransitionError,
+    get_action_manager,
+    get_action_stats,
+    get_rate_limit_counter,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture(autouse=True)
+def memory_db() -> Iterator[None]:
+    SQLiteAction.connect(":memory:")
+    yield
+    SQLiteAction._database = None  # noqa: SLF001
+
+
+def _create(owner: str = "user", name: str = "no-op") -> SQLiteAction:
+    return SQLiteAction.create(ActionSchemaIn(name=name, owner=owner))
+
+
+def test_sqlite_action_create_get() -> None:
+    action = _create()
+    stored = SQLiteAction.get_or_404(action.action_id)
+    assert stored == action
+    assert stored.dump().history[0].event == ActionStatus.PENDING  # type: ignore[index]
+
+    with pytest.raises(HTTPException) as exc:
+        SQLiteAction.get_or_404("missing")
+    assert exc.value.status_code == 404  # noqa: PLR2004
+
+
+def test_sqlite_action_file_db(tmp_path: Path) -> None:
+    SQLiteAction.connect(str(tmp_path / "actions.db"))
+    action = _create()
+    assert SQLiteAction.database().execute("PRAGMA journal_mode")[0][0] == "wal"
+    assert SQLiteAction.get_or_404(action.action_id) == action
+
+
+def test_sqlite_action_transitions() -> None:
+    action = _create()
+    action.start(attempt=0)
+    # a duplicate task run doesn't claim the action again, a retry does
+    with pytest.raises(StatusTransitionError):
+        action.start(attempt=0)
+    action.record_retry(attempt=1, error="boom")
+    action.start(attempt=1)
+    action.set_final_state(ActionStatus.SUCCESS, "ok", {"key": "value"})
+
+    stored = SQLiteAction.get_or_404(action.action_id).dump()
+    assert stored.status == ActionStatus.SUCCESS
+    assert stored.result == "ok"
+    assert stored.task_args == {"key": "value"}
+    assert [e.event for e in stored.history or []] == [
+        "PENDING",
+        "RUNNING",
+        "RETRY",
+        "RUNNING",
+        "SUCCESS",
+    ]
+    assert stored.run_secs is not None
+    assert action.updated_at == stored.updated_at
+
+    with pytest.raises(StatusTransitionError) as exc:
+        action.set_status(ActionStatus.CANCELLED)
+    assert exc.value.current == ActionStatus.SUCCESS
+
+
+def test_sqlite_action_not_stored() -> None:
+    action = SQLiteAction.new(ActionSchemaIn(name="no-op", owner="user"))
+    with pytest.raises(UpdateError) as exc:
+        action.start()
+    assert exc.value.cause_response_code == "ConditionalCheckFailedException"
+
+
+def test_sqlite_action_find_by_owner_pages(mocker: MockerFixture) -> None:
+    now = mocker.patch("automated_actions.db.models._sqlite.dt")
+    for timestamp in (1.0, 2.0, 2.0, 3.0, 4.0):
+        now.now.return_value.timestamp.return_value = timestamp
+        _create()
+    _create(owner="other")
+
+    pages = [SQLiteAction.find_by_owner("user", limit=2)]
+    while pages[-1].cursor:
+        pages.append(
+            SQLiteAction.find_by_owner("user", limit=2, cursor=pages[-1].cursor)
+        )
+
+    updated = [[a.updated_at for a in page.items] for page in pages]
+    assert updated == [[4.0, 3.0], [2.0, 2.0], [1.0]]
+    assert SQLiteAction.find_by_owner("user").cursor is None
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        SQLiteAction.find_by_owner("other", limit=2, cursor=pages[0].cursor)
+
+
+def test_sqlite_action_find_by_owner_filters() -> None:
+    running = _create()
+    running.start()
+    _create()
+
+    page = SQLiteAction.find_by_owner("user", ActionStatus.RUNNING, summary=True)
+    assert [a.action_id for a in page.items] == [running.action_id]
+    assert page.items[0].history is None
+    assert len(SQLiteAction.find_by_owner("user", max_age=60).items) == 2  # noqa: PLR2004
+
+
+def test_sqlite_action_find_by_status_and_all() -> None:
+    running = _create(owner="a")
+    running.start()
+    _create(owner="b", name="other")
+
+    page = SQLiteAction.find_by_status(ActionStatus.RUNNING)
+    assert [a.action_id for a in page.items] == [running.action_id]
+    assert [
+        a.action_id
+        for a in SQLiteAction.find_all([ActionStatus.RUNNING], "no-op", segments=4)
+    ] == [running.action_id]
+    assert len(list(SQLiteAction.find_all(segments=1))) == 2  # noqa: PLR2004
+
+
+def test_sqlite_action_find_all_streams() -> None:
+    created = [_create() for _ in range(3)]
+    actions = SQLiteAction.find_all(segments=1)
+    first = next(actions)
+    # the database isn't locked while the actions are consumed
+    created.append(_create(owner="other"))
+    rest = list(actions)
+
+    assert {a.action_id for a in [first, *rest]} <= {a.action_id for a in created}
+    assert len(rest) >= 2  # noqa: PLR2004
+    assert not SQLiteAction.database().lock.locked()
+
+
+def test_sqlite_action_manager(mocker: MockerFixture) -> None:
+    mocker.patch.object(settings, "action_backend", "memory")
+    action_mgr = get_action_manager()
+    assert action_mgr.klass is SQLiteAction
+    assert action_mgr.counter is SQLiteRateLimitCounter
+    assert action_mgr.stats is SQLiteActionStats
+    assert get_rate_limit_counter() is SQLiteRateLimitCounter
+    assert get_action_stats() is SQLiteActionStats
+
+    action = _create()
+    action_mgr.cancel_action(action)
+    assert SQLiteAction.get_or_404(action.action_id).status == ActionStatus.CANCELLED
+
+
+def test_sqlite_action_find_by_owner_after() -> None:
+    first = _create()
+    actions = [_create() for _ in range(3)]
+    _create(owner="other")
+
+    page = SQLiteAction.find_by_owner_after("user", first.action_id, limit=2)
+    assert page.items == actions[:2]
+    assert page.cursor == actions[1].action_id
+    last = SQLiteAction.find_by_owner_after("user", page.cursor, limit=2)
+    assert last.items == actions[2:]
+    assert last.cursor is None
+    with pytest.raises(ValueError, match="not a time-ordered action ID"):
+        SQLiteAction.find_by_owner_after("user", "invalid")
+
+
+def test_sqlite_rate_limit_counter(mocker: MockerFixture) -> None:
+    now = mocker.patch("automated_actions.db.models._sqlite.dt")
+    # the previous and, 15 minutes in, the current window of the default 1h window
+    now.now.return_value = dt(2025, 1, 1, 9, 30, tzinfo=UTC)
+    for _ in range(4):
+        SQLiteRateLimitCounter.increment("user", "no-op")
+    now.now.return_value = dt(2025, 1, 1, 10, 15, tzinfo=UTC)
+    SQLiteRateLimitCounter.increment("user", "no-op")
+    SQLiteRateLimitCounter.increment("user", "no-op")
+    SQLiteRateLimitCounter.increment("other", "no-op")
+    # 2 + 4 * 0.75
+    assert SQLiteRateLimitCounter.get_ops_count("user", "no-op") == 5  # noqa: PLR2004
+
+    SQLiteRateLimitCounter.decrement(
+        "user", "no-op", dt(2025, 1, 1, 10, 5, tzinfo=UTC).timestamp()
+    )
+    assert SQLiteRateLimitCounter.get_ops_count("user", "no-op") == 4  # noqa: PLR2004
+    # never below 0, and windows never counted are ignored
+    SQLiteRateLimitCounter.decrement("other", "no-op", now.now().timestamp())
+    SQLiteRateLimitCounter.decrement("other", "no-op", now.now().timestamp())
+    SQLiteRateLimitCounter.decrement("user", "no-op", 0)
+    assert SQLiteRateLimitCounter.get_ops_count("other", "no-op") == 0
+
+    # the 9:00 window expires with the next increment two windows later
+    now.now.return_value = dt(2025, 1, 1, 11, 0, tzinfo=UTC)
+    SQLiteRateLimitCounter.increment("user", "no-op")
+    assert [
+        row["window"]
+        for row in SQLiteAction.database().execute(
+            "SELECT window FROM rate_limit WHERE key = 'user#no-op' ORDER BY window"
+        )
+    ] == [
+        dt(2025, 1, 1, 10, 0, tzinfo=UTC).timestamp(),
+        dt(2025, 1, 1, 11, 0, tzinfo=UTC).timestamp(),
+    ]
+
+
+def test_sqlite_action_stats(mocker: MockerFixture) -> None:
+    now = mocker.patch("automated_actions.db.models._sqlite.dt")
+    hour = dt(2025, 1, 1, 10, 0, tzinfo=UTC)
+    now.now.return_value = dt(2025, 1, 1, 10, 30, tzinfo=UTC)
+    SQLiteActionStats.increment("no-op", "SUCCESS", "alice")
+    SQLiteActionStats.increment("no-op", "SUCCESS", "alice")
+    SQLiteActionStats.increment("no-op", "FAILURE", "bob")
+    now.now.return_value = dt(2025, 1, 1, 11, 30, tzinfo=UTC)
+    SQLiteActionStats.increment("restart", "SUCCESS", "alice")
+
+    since, until = hour, dt(2025, 1, 1, 12, 0, tzinfo=UTC)
+    assert SQLiteActionStats.rollup(since, until, ["name", "status"]) == {
+        ("no-op", "SUCCESS"): 2,
+        ("no-op", "FAILURE"): 1,
+        ("restart", "SUCCESS"): 1,
+    }
+    assert SQLiteActionStats.rollup(
+        since, until, ["owner", "hour"], status="SUCCESS"
+    ) == {
+        ("alice", hour.timestamp()): 2,
+        ("alice", hour.timestamp() + 3600): 1,
+    }
+    assert SQLiteActionStats.rollup(since, hour, [], owner="bob") == {(): 1}
+    assert not SQLiteActionStats.rollup(until, until, ["name"])
+    with pytest.raises(ValueError, match="Unknown statistics fields"):
+        SQLiteActionStats.rollup(since, until, ["total; DROP TABLE actions"])
@@ -0,0 +1,108 @@
+from collections import Counter
+from datetime import UTC
+from datetime import datetime as dt
+from typing import TYPE_CHECKING
+
+import pytest
+
+from automated_actions.db.models import ActionStats
+from automated_actions.db.models._stats import STATS_SHARDS  # noqa: PLC2701
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+NOW = dt(2025, 1, 1, 10, 15, tzinfo=UTC)
+HOUR = int(dt(2025, 1, 1, 10, 0, tzinfo=UTC).timestamp())
+
+
+@pytest.fixture(autouse=True)
+def now(mocker: MockerFixture) -> None:
+    mock_dt = mocker.patch("automated_actions.db.models._stats.dt")
+    mock_dt.now.return_value = NOW
+    mock_dt.fromtimestamp = dt.fromtimestamp
+
+
+def _stats(hour: int, name: str, status: str, owner: str, total: int) -> ActionStats:
+    return ActionStats(hour=hour, name=name, status=status, owner=owner, total=total)
+
+
+def test_action_stats_increment(mocker: MockerFixture) -> None:
+    instances = []
+
+    def _update(self: ActionStats, actions: list) -> None:
+        instances.append((self.day, self.bucket, len(actions)))
+
+    mocker.patch.object(ActionStats, "update", _update)
+    ActionStats.increment("no-op", "SUCCESS", "owner")
+    shard = ActionStats._shard("no-op", "SUCCESS", "owner")  # noqa: SLF001
+    assert instances == [(f"2025-01-01#{shard}", f"{HOUR}#no-op#SUCCESS#owner", 6)]
+
+
+def test_action_stats_increment_spreads_partitions(mocker: MockerFixture) -> None:
+    partitions = set()
+
+    def _update(self: ActionStats, actions: list) -> None:  # noqa: ARG001
+        partitions.add(self.day)
+
+    mocker.patch.object(ActionStats, "update", _update)
+    for owner in range(100):
+        ActionStats.increment("no-op", "SUCCESS", f"owner-{owner}")
+    # the counters of a day don't share a single hot partition
+    assert len(partitions) == STATS_SHARDS
+    assert all(p.startswith("2025-01-01#") for p in partitions)
+
+
+def test_action_stats_rollup(mocker: MockerFixture) -> None:
+    partitions = {
+        "2025-01-01#0": [
+            _stats(HOUR - 7200, "no-op", "SUCCESS", "alice", 2),
+            _stats(HOUR - 7200, "no-op", "FAILURE", "alice", 1),
+        ],
+        "2025-01-01#3": [_stats(HOUR - 3600, "restart", "SUCCESS", "bob", 5)],
+        "2025-01-02#1": [_stats(HOUR + 86400, "no-op", "SUCCESS", "bob", 3)],
+    }
+    query = mocker.patch.object(
+        ActionStats,
+        "query",
+        side_effect=lambda partition, _: partitions.get(partition, []),
+    )
+
+    totals = ActionStats.rollup(
+        dt(2025, 1, 1, 8, 30, tzinfo=UTC),
+        dt(2025, 1, 2, 10, 30, tzinfo=UTC),
+        ["name", "status"],
+    )
+
+    assert totals == Counter({
+        ("no-op", "SUCCESS"): 5,
+        ("no-op", "FAILURE"): 1,
+        ("restart", "SUCCESS"): 5,
+    })
+    # one query per partition and day
+    assert sorted(c.args[0] for c in query.call_args_list) == [
+        f"{day}#{shard}"
+        for day in ("2025-01-01", "2025-01-02")
+        for shard in range(STATS_SHARDS)
+    ]
+    assert str(query.call_args.args[1]) == str(
+        ActionStats.bucket.between(f"{HOUR - 7200}#", f"{HOUR + 86400}$")
+    )
+
+
+def test_action_stats_rollup_filters(mocker: MockerFixture) -> None:
+    partitions = {
+        "2025-01-01#0": [
+            _stats(HOUR, "no-op", "SUCCESS", "alice", 2),
+            _stats(HOUR, "no-op", "FAILURE", "alice", 1),
+            _stats(HOUR, "no-op", "SUCCESS", "bob", 5),
+        ]
+    }
+    mocker.patch.object(
+        ActionStats,
+        "query",
+        side_effect=lambda partition, _: partitions.get(partition, []),
+    )
+
+    totals = ActionStats.rollup(NOW, NOW, ["owner"], status="SUCCESS")
+
+    assert totals == Counter({("alice",): 2, ("bob",): 5})
@@ -0,0 +1,91 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from automated_actions.config import settings
+from automated_actions.db.models import User
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache() -> Iterator[None]:
+    yield
+    User.clear_cache()
+
+
+def _user(name: str = "name", username: str = "username") -> User:
+    return User(
+        email="user@example.com",
+        name=name,
+        username=username,
+        created_at=1.0,
+        updated_at=2.0,
+    )
+
+
+def test_model_user_load_cached(mocker: MockerFixture) -> None:
+    get = mocker.patch.object(User, "get", return_value=_user())
+    for _ in range(3):
+        user = User.load(username="username", name="name", email="user@example.com")
+    assert user.username == "username"
+    get.assert_called_once_with("user@example.com")
+
+
+def test_model_user_load_changed_name(mocker: MockerFixture) -> None:
+    user = _user()
+    get = mocker.patch.object(User, "get", return_value=user)
+    update = mocker.patch.object(User, "update")
+    User.load(username="username", name="name", email="user@example.com")
+    User.load(username="username", name="new name", email="user@example.com")
+    assert get.call_count == 2  # noqa: PLR2004
+    update.assert_called_once()
+
+
+def test_model_user_load_create(mocker: MockerFixture) -> None:
+    mocker.patch.object(User, "get", side_effect=User.DoesNotExist)
+    create = mocker.patch.object(User, "create", return_value=_user())
+    User.load(username="username", name="name", email="user@example.com")
+    User.load(username="username", name="name", email="user@example.com")
+    create.assert_called_once()
+
+
+def test_model_user_set_allowed_actions_write_behind(mocker: MockerFixture) -> None:
+    update = mocker.patch.object(User, "update")
+    user = _user()
+    user.set_allowed_actions(["action1"])
+    user.set_allowed_actions(["action1", "action2"])
+    user.set_allowed_actions(["action2", "action1"])
+    assert user.allowed_actions == ["action1", "action2"]
+    update.assert_not_called()
+
+    assert User.flush_allowed_actions() == 1
+    update.assert_called_once()
+    assert User.flush_allowed_actions() == 0
+
+
+def test_model_user_set_allowed_actions_unchanged(mocker: MockerFixture) -> None:
+    mocker.patch.object(User, "update")
+    user = _user()
+    user.allowed_actions = ["action1"]
+    user.set_allowed_actions(["action1"])
+    assert User.flush_allowed_actions() == 0
+
+
+def test_model_user_flush_allowed_actions_retry(mocker: MockerFixture) -> None:
+    update = mocker.patch.object(User, "update", side_effect=[Exception("boom"), None])
+    _user().set_allowed_actions(["action1"])
+    assert User.flush_allowed_actions() == 0
+    assert User.flush_allowed_actions() == 1
+    assert update.call_count == 2  # noqa: PLR2004
+
+
+def test_model_user_set_allowed_actions_write_through(mocker: MockerFixture) -> None:
+    mocker.patch.object(settings, "user_cache_flush_interval_secs", 0)
+    update = mocker.patch.object(User, "update")
+    _user().set_allowed_actions(["action1"])
+    update.assert_called_once()
+    assert User.flush_allowed_actions() == 0
@@ -0,0 +1,64 @@
+from typing import TYPE_CHECKING
+
+from automated_actions.cache import TTLCache
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+def test_ttl_cache_get_set() -> None:
+    cache = TTLCache[str, int](maxsize=2, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache[str, int](maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3  # noqa: PLR2004
+
+
+def test_ttl_cache_expires(mocker: MockerFixture) -> None:
+    monotonic = mocker.patch("automated_actions.cache.monotonic", return_value=100)
+    cache = TTLCache[str, int](maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=10)
+    monotonic.return_value = 120
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    monotonic.return_value = 160
+    assert cache.get("a") is None
+    assert not cache
+
+
+def test_ttl_cache_ttl_cannot_extend_default(mocker: MockerFixture) -> None:
+    monotonic = mocker.patch("automated_actions.cache.monotonic", return_value=100)
+    cache = TTLCache[str, int](maxsize=2, ttl=60)
+    cache.set("a", 1, ttl=3600)
+    monotonic.return_value = 161
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_disabled() -> None:
+    cache = TTLCache[str, int](maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    cache = TTLCache[str, int](maxsize=10, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_pop_clear() -> None:
+    cache = TTLCache[str, int](maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert not cache
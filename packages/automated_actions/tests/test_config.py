@@ -1,5 +1,18 @@
+import pytest
+from pydantic import ValidationError
+
+from automated_actions.config import Settings
+
+
 def test_config_import_settings() -> None:
     from automated_actions.config import settings  # noqa: PLC0415
 
     # we don't need to test all settings because ruff and mypy will do that for us
     assert settings.environment == "unit_tests"
+
+
+def test_config_memory_backend_requires_eager_tasks() -> None:
+    with pytest.raises(ValidationError, match="AA_TASK_ALWAYS_EAGER"):
+        Settings(action_backend="memory")
+    assert Settings(action_backend="memory", task_always_eager=True)
+    assert Settings(action_backend="sqlite")
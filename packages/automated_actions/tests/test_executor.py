@@ -0,0 +1,20 @@
+import contextvars
+import threading
+
+import pytest
+
+from automated_actions.executor import run_blocking
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+
+
+@pytest.mark.asyncio
+async def test_run_blocking() -> None:
+    def call(value: int, *, offset: int) -> tuple[str, str, int]:
+        return threading.current_thread().name, request_id.get(), value + offset
+
+    request_id.set("abc")
+    thread, rid, result = await run_blocking(call, 1, offset=2)
+    assert thread.startswith("db_")
+    assert rid == "abc"
+    assert result == 3  # noqa: PLR2004
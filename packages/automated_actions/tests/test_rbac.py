@@ -0,0 +1,160 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import yaml
+
+from automated_actions.permissions import Permission, decide
+from automated_actions.rbac import RBAC, RolesIndex, load_roles_data
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+    from tests.conftest import MockUserModel
+
+CONFORMANCE_FILE = Path(__file__).parents[2] / "opa" / "conformance" / "conformance.yml"
+DEFAULT_ROLES_FILE = Path(__file__).parents[2] / "opa" / "authz" / "default_roles.yml"
+
+
+def _conformance_cases() -> list[Any]:
+    suites = yaml.safe_load(CONFORMANCE_FILE.read_text())["conformance"]["suites"]
+    return [
+        pytest.param(suite, case, id=f"{suite['name']}/{case['name']}")
+        for suite in suites
+        for case in suite["cases"]
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("suite", "case"), _conformance_cases())
+async def test_rbac_conformance(
+    usermodel: type[MockUserModel], suite: dict, case: dict
+) -> None:
+    rbac = RBAC[usermodel].from_data(suite)  # type: ignore[valid-type]
+    decision = await rbac.decide(
+        usermodel.load(case["input"]["username"]),
+        obj=case["input"]["obj"],
+        params=case["input"]["params"],
+        ops_count=case["input"].get("ops_count"),
+    )
+    assert decision == case["expected"]
+
+    # capability tokens carry all permissions of the user
+    permissions = [
+        Permission.compile(permission)
+        for permission in await rbac.user_permissions(
+            usermodel.load(case["input"]["username"])
+        )
+    ]
+    assert (
+        decide(
+            permissions,
+            case["input"]["obj"],
+            case["input"]["params"],
+            case["input"].get("ops_count") or 0,
+        )
+        == case["expected"]
+    )
+
+    batch = await rbac.decide_batch(
+        usermodel.load(case["input"]["username"]), items=[case["input"]]
+    )
+    assert batch == [
+        {
+            "authorized": case["expected"]["authorized"],
+            "within_rate_limits": case["expected"]["within_rate_limits"],
+        }
+    ]
+
+
+def test_rbac_default_roles() -> None:
+    rbac = RBAC.from_data(load_roles_data([DEFAULT_ROLES_FILE]))
+    assert rbac.authorized("random-user", "me", {})
+    assert rbac.authorized("random-user", "action-list", {})
+    assert not rbac.authorized("random-user", "action-list", {"action_user": "x"})
+    assert rbac.authorized("open-policy-agent", "action-list", {"action_user": "x"})
+    assert rbac.authorized("random-user", "authorize", {})
+
+
+def test_rbac_load_roles_data(tmp_path: Path) -> None:
+    (tmp_path / "roles").mkdir()
+    (tmp_path / "default.yml").write_text(
+        yaml.safe_dump({"users": {"*": ["default"]}, "roles": {"default": []}})
+    )
+    (tmp_path / "roles" / "team.yaml").write_text(
+        yaml.safe_dump({
+            "users": {"user1": ["team"]},
+            "roles": {"team": [{"obj": "restart", "params": {}}]},
+        })
+    )
+    (tmp_path / "roles" / "README.md").write_text("ignored")
+
+    assert load_roles_data([tmp_path / "default.yml", tmp_path / "roles"]) == {
+        "users": {"*": ["default"], "user1": ["team"]},
+        "roles": {"default": [], "team": [{"obj": "restart", "params": {}}]},
+    }
+
+
+def test_rbac_roles_index() -> None:
+    index = RolesIndex({
+        "users": {"*": ["default"], "user1": ["team"]},
+        "roles": {
+            "default": [{"obj": "me", "params": {}}],
+            "team": [
+                {"obj": "restart", "params": {"name": "^foo"}},
+                {"obj": "restart", "params": {"name": "^bar"}},
+            ],
+        },
+    })
+    assert len(index.permissions("user1", "restart")) == 2  # noqa: PLR2004
+    assert index.permissions("user2", "restart") == []
+    assert index.user_objects("user1") == ["me", "restart"]
+    assert index.user_objects("user2") == ["me"]
+
+
+@pytest.mark.asyncio
+async def test_rbac_reload(
+    usermodel: type[MockUserModel], tmp_path: Path, mocker: MockerFixture
+) -> None:
+    monotonic = mocker.patch("automated_actions.rbac.monotonic", return_value=100)
+    roles_file = tmp_path / "roles.yml"
+    roles_file.write_text(
+        yaml.safe_dump({"users": {"user1": ["team"]}, "roles": {"team": []}})
+    )
+    rbac = RBAC[usermodel](roles_paths=[roles_file], reload_interval_secs=10)  # type: ignore[valid-type]
+    user = usermodel.load("user1")
+    assert not (await rbac.decide(user, obj="restart", params={}))["authorized"]
+
+    roles_file.write_text(
+        yaml.safe_dump({
+            "users": {"user1": ["team"]},
+            "roles": {"team": [{"obj": "restart", "params": {}}]},
+        })
+    )
+    mocker.patch.object(rbac, "_roles_files_state", return_value={roles_file: 1.0})
+    # not reloaded within the reload interval
+    assert not (await rbac.decide(user, obj="restart", params={}))["authorized"]
+
+    monotonic.return_value = 111
+    assert (await rbac.decide(user, obj="restart", params={}))["authorized"]
+
+
+@pytest.mark.asyncio
+async def test_rbac_reload_invalid_data_keeps_roles(
+    usermodel: type[MockUserModel], tmp_path: Path, mocker: MockerFixture
+) -> None:
+    monotonic = mocker.patch("automated_actions.rbac.monotonic", return_value=100)
+    roles_file = tmp_path / "roles.yml"
+    roles_file.write_text(
+        yaml.safe_dump({
+            "users": {"user1": ["team"]},
+            "roles": {"team": [{"obj": "restart", "params": {}}]},
+        })
+    )
+    rbac = RBAC[usermodel](roles_paths=[roles_file], reload_interval_secs=10)  # type: ignore[valid-type]
+
+    roles_file.write_text("users: [")
+    mocker.patch.object(rbac, "_roles_files_state", return_value={roles_file: 1.0})
+    monotonic.return_value = 111
+    user = usermodel.load("user1")
+    assert (await rbac.decide(user, obj="restart", params={}))["authorized"]
@@ -9,16 +9,23 @@ import textwrap
 import typing
 from http.cookiejar import MozillaCookieJar
 from importlib.metadata import version
+from itertools import islice
 from pathlib import Path
 from typing import TYPE_CHECKING, Annotated, Any
 
 import pydantic
 import typer
+import yaml
 from automated_actions_client import client as client_module
 from automated_actions_client import schemas as client_schemas
 from automated_actions_client.client import client as aa_client
 from automated_actions_client.client import me
 from automated_actions_client.config import Config
+from automated_actions_client.pagination import (
+    iter_action_list,
+    iter_admin_action_list,
+    stream_admin_action_scan,
+)
 from clientele.http import httpx_backend
 from packaging.version import parse as parse_version
 from rich import print as rich_print
@@ -218,7 +225,7 @@ def _get_help_panel(name: str) -> str:
     """Map function name to help panel group, matching FastAPI endpoint tags."""
     if name.startswith(("external_resource_", "openshift_")) or name == "no_op":
         return "Actions"
-    if name == "create_token":
+    if name.startswith("admin_") or name in {"create_token", "revoke_token"}:
         return "Admin"
     return "General"
 
@@ -287,6 +294,18 @@ def _build_typer_params(
     return new_params, new_annotations
 
 
+def _call_client(ctx: typer.Context, func: Callable[..., Any], **kwargs: Any) -> None:
+    """Call a client function and print its result."""
+    try:
+        result = func(**kwargs)
+    except Exception as e:
+        if hasattr(e, "response"):
+            rich_print(e.response.text, file=sys.stderr)
+            raise typer.Exit(1) from None
+        raise
+    ctx.obj["formatter"](_serialize_result(result))
+
+
 def _register_client_command(
     name: str,
     func: Callable[..., Any],
@@ -318,14 +337,7 @@ def _register_client_command(
                 if f in call_kwargs
             }
             call_kwargs["data"] = data_model(**data_fields)
-        try:
-            result = func(**call_kwargs)
-        except Exception as e:
-            if hasattr(e, "response"):
-                rich_print(e.response.text, file=sys.stderr)
-                raise typer.Exit(1) from None
-            raise
-        ctx.obj["formatter"](_serialize_result(result))
+        _call_client(ctx, func, **call_kwargs)
 
     wrapper.__signature__ = new_sig  # type: ignore[attr-defined]
     wrapper.__annotations__ = new_annotations
@@ -336,12 +348,242 @@ def _register_client_command(
     app.command(rich_help_panel=_get_help_panel(name))(wrapper)
 
 
+def _parse_authorize_item(item: str) -> client_schemas.AuthorizeItem:
+    """Parse an `OBJ[:KEY=VALUE,...]` authorize item."""
+    obj, _, params = item.partition(":")
+    try:
+        return client_schemas.AuthorizeItem(
+            obj=obj,
+            params=dict(param.split("=", 1) for param in params.split(",") if param),
+        )
+    except ValueError:
+        raise typer.BadParameter(
+            f"Invalid item {item!r}, expected OBJ[:KEY=VALUE,...]"
+        ) from None
+
+
+@app.command(rich_help_panel="General")
+def authorize(
+    ctx: typer.Context,
+    *,
+    item: Annotated[
+        list[str] | None,
+        typer.Option(
+            help="Action and its parameters to check, e.g. "
+            "openshift-workload-restart:cluster=c1,namespace=ns,kind=Pod,name=foo"
+        ),
+    ] = None,
+    file: Annotated[
+        Path | None,
+        typer.Option(
+            help="YAML or JSON file with a list of {obj: ..., params: {...}} items",
+            exists=True,
+            dir_okay=False,
+        ),
+    ] = None,
+) -> None:
+    """Authorize
+
+    Check multiple actions and their parameters at once.
+
+    Returns whether you are authorized to run each action with the given
+    parameters and whether the action is still within its rate limits.
+    Nothing is executed.
+    """
+    items = [_parse_authorize_item(i) for i in item or []]
+    if file:
+        items.extend(
+            client_schemas.AuthorizeItem.model_validate(i)
+            for i in yaml.safe_load(file.read_text()) or []
+        )
+    if not items:
+        raise typer.BadParameter("Provide at least one --item or a --file")
+    _call_client(
+        ctx, client_module.authorize, data=client_schemas.AuthorizeRequest(items=items)
+    )
+
+
+# maximum page size of the action-list endpoint
+MAX_PAGE_SIZE = 1000
+
+
+def _list_actions(
+    limit: int | None, *, admin: bool = False, **filters: Any
+) -> list[client_schemas.ActionSchemaOut]:
+    """Return up to `limit` actions, fetching only the pages needed."""
+    page_size = min(limit or MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+    pages = iter_admin_action_list if admin else iter_action_list
+    return list(islice(pages(page_size=page_size, **filters), limit))
+
+
+@app.command(rich_help_panel="General")
+def action_list(
+    ctx: typer.Context,
+    *,
+    status: Annotated[
+        client_schemas.ActionStatus | None,
+        typer.Option(help="Filter actions by their status"),
+    ] = None,
+    action_user: Annotated[
+        str | None,
+        typer.Option(
+            help="Filter actions by username instead of the current authenticated user"
+        ),
+    ] = None,
+    max_age_minutes: Annotated[
+        int | None,
+        typer.Option(
+            help="Filter actions by their age in minutes. Actions updated more than this many minutes ago will be excluded.",
+            min=0,
+        ),
+    ] = None,
+    limit: Annotated[
+        int | None,
+        typer.Option(help="Maximum number of actions to show [default: all]", min=1),
+    ] = None,
+    fields: Annotated[
+        client_schemas.ActionFields | None,
+        typer.Option(
+            help="Fields of the shown actions. 'summary' omits the result and task arguments; use action-detail to get them."
+        ),
+    ] = None,
+    after: Annotated[
+        str | None,
+        typer.Option(
+            help="Show the actions created after the action with this ID instead, oldest first"
+        ),
+    ] = None,
+) -> None:
+    """Action List
+
+    Lists actions, newest first, optionally filtered by status, user, or age.
+    """
+    _call_client(
+        ctx,
+        _list_actions,
+        limit=limit,
+        status=status,
+        action_user=action_user,
+        max_age_minutes=max_age_minutes,
+        fields=fields,
+        after=after,
+    )
+
+
+@app.command(rich_help_panel="Admin")
+def admin_action_list(
+    ctx: typer.Context,
+    *,
+    status: Annotated[
+        client_schemas.ActionStatus,
+        typer.Option(help="Filter actions by their status"),
+    ],
+    max_age_minutes: Annotated[
+        int | None,
+        typer.Option(
+            help="Filter actions by their age in minutes. Actions updated more than this many minutes ago will be excluded.",
+            min=0,
+        ),
+    ] = None,
+    limit: Annotated[
+        int | None,
+        typer.Option(help="Maximum number of actions to show [default: all]", min=1),
+    ] = None,
+    fields: Annotated[
+        client_schemas.ActionFields | None,
+        typer.Option(
+            help="Fields of the shown actions. 'summary' omits the result and task arguments; use action-detail to get them."
+        ),
+    ] = None,
+) -> None:
+    """Admin Action List
+
+    Lists the actions of all users with the given status, newest first.
+    """
+    _call_client(
+        ctx,
+        _list_actions,
+        limit=limit,
+        admin=True,
+        status=status,
+        max_age_minutes=max_age_minutes,
+        fields=fields,
+    )
+
+
+def _scan_actions(
+    limit: int | None, **filters: Any
+) -> list[client_schemas.ActionSchemaOut]:
+    """Return up to `limit` actions of a scan, closing the stream afterwards."""
+    actions = stream_admin_action_scan(**filters)
+    try:
+        return list(islice(actions, limit))
+    finally:
+        close = getattr(actions, "close", None)
+        if close:
+            close()
+
+
+@app.command(rich_help_panel="Admin")
+def admin_action_scan(
+    ctx: typer.Context,
+    *,
+    status: Annotated[
+        list[client_schemas.ActionStatus] | None,
+        typer.Option(help="Filter actions by their status; may be given repeatedly"),
+    ] = None,
+    name: Annotated[
+        str | None, typer.Option(help="Filter actions by their name")
+    ] = None,
+    max_age_minutes: Annotated[
+        int | None,
+        typer.Option(
+            help="Filter actions by their age in minutes. Actions updated more than this many minutes ago will be excluded.",
+            min=0,
+        ),
+    ] = None,
+    segments: Annotated[
+        int | None,
+        typer.Option(help="Number of table segments the server reads concurrently"),
+    ] = None,
+    limit: Annotated[
+        int | None,
+        typer.Option(help="Maximum number of actions to show [default: all]", min=1),
+    ] = None,
+    fields: Annotated[
+        client_schemas.ActionFields | None,
+        typer.Option(
+            help="Fields of the shown actions. 'summary' omits the result and task arguments; use action-detail to get them."
+        ),
+    ] = None,
+) -> None:
+    """Admin Action Scan
+
+    Lists the actions of all users, in no particular order, optionally
+    filtered by status, name, or age. Reads the whole actions table.
+    """
+    _call_client(
+        ctx,
+        _scan_actions,
+        limit=limit,
+        status=status,
+        name=name,
+        max_age_minutes=max_age_minutes,
+        segments=segments,
+        fields=fields,
+    )
+
+
+# client functions with a hand-written command
+CUSTOM_COMMANDS = {"action_list", "admin_action_list", "authorize"}
+
+
 def initialize_client_actions() -> None:
     """Initialize typer commands from all available automated-actions-client actions."""
     ns = vars(client_schemas)
 
     for name, func in inspect.getmembers(client_module, inspect.isfunction):
-        if name.startswith("_"):
+        if name.startswith("_") or name in CUSTOM_COMMANDS:
             continue
         _register_client_command(name, func, ns)
 
@@ -1,20 +1,39 @@
+from typing import TYPE_CHECKING
+
 import click
 import pytest
-from automated_actions_client.schemas import ActionSchemaOut, ActionStatus
+import typer
+from automated_actions_client.schemas import (
+    ActionSchemaOut,
+    ActionStatus,
+    AuthorizeItem,
+)
 from typer.main import get_command
 
+from automated_actions_cli import cli
 from automated_actions_cli.cli import (
     _get_help_panel,  # noqa: PLC2701
+    _list_actions,  # noqa: PLC2701
+    _parse_authorize_item,  # noqa: PLC2701
+    _scan_actions,  # noqa: PLC2701
     _serialize_result,  # noqa: PLC2701
     app,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 click_app = get_command(app)
 
 EXPECTED_COMMANDS = {
     "action-cancel",
     "action-detail",
     "action-list",
+    "action-stats",
+    "admin-action-list",
+    "admin-action-scan",
+    "admin-archive-action-list",
+    "authorize",
     "create-token",
     "external-resource-flush-elasticache",
     "external-resource-rds-reboot",
@@ -24,6 +43,7 @@ EXPECTED_COMMANDS = {
     "openshift-trigger-cronjob",
     "openshift-workload-delete",
     "openshift-workload-restart",
+    "revoke-token",
 }
 
 # Params added by typer itself, not by our registration logic
@@ -48,6 +68,9 @@ TYPER_INTERNAL_PARAMS = {"help", "install_completion", "show_completion"}
         ("action_cancel", "General"),
         ("me", "General"),
         ("create_token", "Admin"),
+        ("revoke_token", "Admin"),
+        ("admin_action_list", "Admin"),
+        ("admin_archive_action_list", "Admin"),
         ("unknown_function", "General"),
     ],
 )
@@ -143,8 +166,12 @@ def test_all_params_are_options() -> None:
         ("openshift-workload-restart", "Actions"),
         ("no-op", "Actions"),
         ("action-list", "General"),
+        ("action-stats", "General"),
         ("me", "General"),
+        ("authorize", "General"),
         ("create-token", "Admin"),
+        ("admin-action-list", "Admin"),
+        ("admin-action-scan", "Admin"),
     ],
 )
 def test_help_panel(cmd_name: str, expected_panel: str) -> None:
@@ -165,6 +192,9 @@ def test_action_list_params() -> None:
         "status",
         "action_user",
         "max_age_minutes",
+        "limit",
+        "fields",
+        "after",
     }
 
 
@@ -181,6 +211,96 @@ def test_action_list_status_choices() -> None:
     }
 
 
+def _action(action_id: str) -> ActionSchemaOut:
+    return ActionSchemaOut(
+        name="no-op",
+        owner="user",
+        action_id=action_id,
+        created_at=1.0,
+        updated_at=1.0,
+    )
+
+
+@pytest.mark.parametrize(
+    ("limit", "page_size", "expected"),
+    [(None, 1000, ["1", "2", "3"]), (2, 2, ["1", "2"]), (5000, 1000, ["1", "2", "3"])],
+)
+def test_list_actions(
+    monkeypatch: pytest.MonkeyPatch,
+    limit: int | None,
+    page_size: int,
+    expected: list[str],
+) -> None:
+    calls: list[dict] = []
+    consumed: list[str] = []
+
+    def iter_action_list(**kwargs: object) -> Iterator[ActionSchemaOut]:
+        calls.append(kwargs)
+        for action_id in ("1", "2", "3"):
+            consumed.append(action_id)
+            yield _action(action_id)
+
+    monkeypatch.setattr(cli, "iter_action_list", iter_action_list)
+    actions = _list_actions(limit, status=ActionStatus.SUCCESS)
+
+    assert [action.action_id for action in actions] == expected
+    # stops consuming (i.e. fetching pages) once the limit is reached
+    assert consumed == expected
+    assert calls == [{"page_size": page_size, "status": ActionStatus.SUCCESS}]
+
+
+def test_admin_action_list_params() -> None:
+    assert _get_param_names("admin-action-list") == {
+        "status",
+        "max_age_minutes",
+        "limit",
+        "fields",
+    }
+
+
+def test_list_actions_admin(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict] = []
+
+    def iter_admin_action_list(**kwargs: object) -> Iterator[ActionSchemaOut]:
+        calls.append(kwargs)
+        yield _action("1")
+
+    monkeypatch.setattr(cli, "iter_admin_action_list", iter_admin_action_list)
+    actions = _list_actions(None, admin=True, status=ActionStatus.RUNNING)
+
+    assert [action.action_id for action in actions] == ["1"]
+    assert calls == [{"page_size": 1000, "status": ActionStatus.RUNNING}]
+
+
+def test_scan_actions(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict] = []
+    closed: list[bool] = []
+
+    def stream_admin_action_scan(**kwargs: object) -> Iterator[ActionSchemaOut]:
+        calls.append(kwargs)
+        try:
+            for action_id in ("1", "2", "3"):
+                yield _action(action_id)
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(cli, "stream_admin_action_scan", stream_admin_action_scan)
+    actions = _scan_actions(2, status=[ActionStatus.RUNNING], segments=4)
+
+    assert [action.action_id for action in actions] == ["1", "2"]
+    assert calls == [{"status": [ActionStatus.RUNNING], "segments": 4}]
+    # the stream is closed once the limit is reached
+    assert closed == [True]
+
+
+def test_admin_archive_action_list_params() -> None:
+    assert _get_param_names("admin-archive-action-list") == {
+        "updated",
+        "owner",
+        "status",
+    }
+
+
 def test_external_resource_rds_reboot_params() -> None:
     assert _get_param_names("external-resource-rds-reboot") == {
         "account",
@@ -198,6 +318,10 @@ def test_create_token_params() -> None:
     }
 
 
+def test_revoke_token_params() -> None:
+    assert _get_param_names("revoke-token") == {"token"}
+
+
 def test_me_has_no_params() -> None:
     assert _get_param_names("me") == set()
 
@@ -210,3 +334,29 @@ def test_openshift_workload_delete_params() -> None:
         "name",
         "api_version",
     }
+
+
+def test_authorize_params() -> None:
+    assert _get_param_names("authorize") == {"item", "file"}
+
+
+@pytest.mark.parametrize(
+    ("item", "expected"),
+    [
+        ("no-op", AuthorizeItem(obj="no-op", params={})),
+        (
+            "openshift-workload-restart:cluster=c1,name=a=b",
+            AuthorizeItem(
+                obj="openshift-workload-restart",
+                params={"cluster": "c1", "name": "a=b"},
+            ),
+        ),
+    ],
+)
+def test_parse_authorize_item(item: str, expected: AuthorizeItem) -> None:
+    assert _parse_authorize_item(item) == expected
+
+
+def test_parse_authorize_item_invalid() -> None:
+    with pytest.raises(typer.BadParameter):
+        _parse_authorize_item("no-op:cluster")
@@ -18,6 +18,56 @@ def create_token(
     return result
 
 
+@client.post("/api/v1/admin/token/revoke")
+def revoke_token(
+    result: schemas.ResponseRevokeToken, data: schemas.RevokeTokenParam
+) -> schemas.ResponseRevokeToken:
+    """Revoke Token
+
+        Revoke a service account token.
+
+    Returns the ID of the revoked token. All API instances reject the token
+    after their next revocation list refresh at the latest.
+    """
+    return result
+
+
+@client.get("/api/v1/admin/actions")
+def admin_action_list(
+    result: schemas.ResponseAdminActionList,
+    status: schemas.ActionStatus,
+    max_age_minutes: int | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: schemas.ActionFields | None = None,
+) -> schemas.ResponseAdminActionList:
+    """Admin Action List
+
+        Lists the actions of all users with the given status, newest first.
+
+    Returns at most `limit` actions. If there are more, the cursor of the
+    next page is returned in the `X-Next-Cursor` response header.
+    """
+    return result
+
+
+@client.get("/api/v1/admin/archive/actions")
+def admin_archive_action_list(
+    result: schemas.ResponseAdminArchiveActionList,
+    updated: str,
+    owner: str | None = None,
+    status: schemas.ActionStatus | None = None,
+) -> schemas.ResponseAdminArchiveActionList:
+    """Admin Archive Action List
+
+        Lists archived actions last updated on the given date.
+
+    Finished actions are deleted after the configured retention period and
+    kept in the archive.
+    """
+    return result
+
+
 @client.post("/api/v1/external-resource/rds-reboot/{account}/{identifier}")
 def external_resource_rds_reboot(
     result: schemas.ActionSchemaOut,
@@ -115,10 +165,21 @@ def action_list(
     status: schemas.ActionStatus | None = None,
     action_user: str | None = None,
     max_age_minutes: int | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: schemas.ActionFields | None = None,
+    after: str | None = None,
 ) -> schemas.ResponseActionList:
     """Action List
 
-    Lists actions, optionally filtered by status, user, or age.
+        Lists actions, newest first, optionally filtered by status, user, or age.
+
+    Returns at most `limit` actions. If there are more, the cursor of the
+    next page is returned in the `X-Next-Cursor` response header.
+
+    With `after`, lists the actions created after the given action instead,
+    oldest first. Actions created before the action IDs became time-ordered
+    aren't included.
     """
     return result
 
@@ -145,6 +206,41 @@ def action_cancel(
     return result
 
 
+@client.post("/api/v1/authorize")
+def authorize(
+    result: schemas.ResponseAuthorize, data: schemas.AuthorizeRequest
+) -> schemas.ResponseAuthorize:
+    """Authorize
+
+        Check multiple actions and their parameters at once.
+
+    Returns whether the current user is authorized to run each action with the
+    given parameters and whether the action is still within its rate limits.
+    Nothing is executed.
+    """
+    return result
+
+
+@client.get("/api/v1/stats")
+def action_stats(
+    result: schemas.ResponseActionStats,
+    since: str | None = None,
+    until: str | None = None,
+    group_by: list[schemas.StatsField] | None = None,
+    name: str | None = None,
+    status: schemas.ActionStatus | None = None,
+    owner: str | None = None,
+) -> schemas.ResponseActionStats:
+    """Action Stats
+
+        Counts the actions that finished in a time range, in hourly resolution.
+
+    The counts are maintained while the actions finish, so this reads one
+    counter per hour and group instead of all actions.
+    """
+    return result
+
+
 @client.get("/api/v1/me")
 def me(result: schemas.UserSchemaOut) -> schemas.UserSchemaOut:
     """Me
@@ -0,0 +1,209 @@
+"""Follow the cursors of paginated endpoints or stream all their items.
+
+This module is maintained by hand; `make generate-client` doesn't touch it.
+"""
+
+from __future__ import annotations
+
+# clientele resolves the annotations of the decorated functions at runtime
+from collections.abc import Iterator  # noqa: TC003
+from typing import TYPE_CHECKING, Any
+
+# clientele resolves the annotations of the decorated functions at runtime
+from clientele.http.response import Response  # noqa: TC002
+
+from . import schemas
+from .client import client
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+NEXT_CURSOR_HEADER = "x-next-cursor"
+NDJSON_HEADERS = {"Accept": "application/x-ndjson"}
+
+
+@client.get("/api/v1/actions")
+def _action_list_page(
+    result: schemas.ResponseActionList,
+    response: Response,
+    status: schemas.ActionStatus | None = None,
+    action_user: str | None = None,
+    max_age_minutes: int | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: schemas.ActionFields | None = None,
+    after: str | None = None,
+) -> tuple[list[schemas.ActionSchemaOut], str | None]:
+    return result.root, response.headers.get(NEXT_CURSOR_HEADER)
+
+
+@client.get("/api/v1/admin/actions")
+def _admin_action_list_page(
+    result: schemas.ResponseAdminActionList,
+    response: Response,
+    status: schemas.ActionStatus,
+    max_age_minutes: int | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: schemas.ActionFields | None = None,
+) -> tuple[list[schemas.ActionSchemaOut], str | None]:
+    return result.root, response.headers.get(NEXT_CURSOR_HEADER)
+
+
+@client.get("/api/v1/actions", streaming_response=True)
+def _action_list_stream(
+    result: Iterator[schemas.ActionSchemaOut],
+    status: schemas.ActionStatus | None = None,
+    action_user: str | None = None,
+    max_age_minutes: int | None = None,
+    limit: int | None = None,
+    fields: schemas.ActionFields | None = None,
+    after: str | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    return result
+
+
+@client.get("/api/v1/admin/actions", streaming_response=True)
+def _admin_action_list_stream(
+    result: Iterator[schemas.ActionSchemaOut],
+    status: schemas.ActionStatus,
+    max_age_minutes: int | None = None,
+    limit: int | None = None,
+    fields: schemas.ActionFields | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    return result
+
+
+@client.get("/api/v1/admin/actions/scan", streaming_response=True)
+def _admin_action_scan_stream(
+    result: Iterator[schemas.ActionSchemaOut],
+    status: list[schemas.ActionStatus] | None = None,
+    name: str | None = None,
+    max_age_minutes: int | None = None,
+    segments: int | None = None,
+    fields: schemas.ActionFields | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    return result
+
+
+def _iter_pages(
+    page: Callable[..., tuple[list[schemas.ActionSchemaOut], str | None]],
+    **params: Any,
+) -> Iterator[schemas.ActionSchemaOut]:
+    cursor: str | None = None
+    while True:
+        actions, cursor = page(**params, cursor=cursor)
+        yield from actions
+        if not cursor:
+            return
+
+
+def iter_action_list(
+    status: schemas.ActionStatus | None = None,
+    action_user: str | None = None,
+    max_age_minutes: int | None = None,
+    page_size: int | None = None,
+    fields: schemas.ActionFields | None = None,
+    after: str | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    """Yield the actions of all `action_list` pages, newest first.
+
+    With `after`, yield the actions created after that action, oldest first.
+    The next page is fetched only after all actions of the previous page have
+    been consumed.
+    """
+    return _iter_pages(
+        _action_list_page,
+        status=status,
+        action_user=action_user,
+        max_age_minutes=max_age_minutes,
+        limit=page_size,
+        fields=fields,
+        after=after,
+    )
+
+
+def iter_admin_action_list(
+    status: schemas.ActionStatus,
+    max_age_minutes: int | None = None,
+    page_size: int | None = None,
+    fields: schemas.ActionFields | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    """Yield the actions of all `admin_action_list` pages, newest first.
+
+    See `iter_action_list`.
+    """
+    return _iter_pages(
+        _admin_action_list_page,
+        status=status,
+        max_age_minutes=max_age_minutes,
+        limit=page_size,
+        fields=fields,
+    )
+
+
+def stream_action_list(
+    status: schemas.ActionStatus | None = None,
+    action_user: str | None = None,
+    max_age_minutes: int | None = None,
+    page_size: int | None = None,
+    fields: schemas.ActionFields | None = None,
+    after: str | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    """Yield all `action_list` actions of a single streamed response, newest first.
+
+    With `after`, yield the actions created after that action, oldest first.
+
+    The server streams the actions as JSON lines while it reads them, and
+    they are parsed one line at a time, so neither side holds all actions in
+    memory. `page_size` is the number of actions the server reads at a time.
+    """
+    return _action_list_stream(  # type: ignore[call-arg]
+        status=status,
+        action_user=action_user,
+        max_age_minutes=max_age_minutes,
+        limit=page_size,
+        fields=fields,
+        after=after,
+        headers=NDJSON_HEADERS,
+    )
+
+
+def stream_admin_action_list(
+    status: schemas.ActionStatus,
+    max_age_minutes: int | None = None,
+    page_size: int | None = None,
+    fields: schemas.ActionFields | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    """Yield all `admin_action_list` actions of a single streamed response, newest first.
+
+    See `stream_action_list`.
+    """
+    return _admin_action_list_stream(  # type: ignore[call-arg]
+        status=status,
+        max_age_minutes=max_age_minutes,
+        limit=page_size,
+        fields=fields,
+        headers=NDJSON_HEADERS,
+    )
+
+
+def stream_admin_action_scan(
+    status: list[schemas.ActionStatus] | None = None,
+    name: str | None = None,
+    max_age_minutes: int | None = None,
+    segments: int | None = None,
+    fields: schemas.ActionFields | None = None,
+) -> Iterator[schemas.ActionSchemaOut]:
+    """Yield the actions of all users, in no particular order.
+
+    The server scans the whole actions table with `segments` concurrent
+    segment scans and streams the matching actions while it reads them.
+    """
+    return _admin_action_scan_stream(
+        status=status,
+        name=name,
+        max_age_minutes=max_age_minutes,
+        segments=segments,
+        fields=fields,
+    )
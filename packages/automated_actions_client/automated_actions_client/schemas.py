@@ -8,6 +8,18 @@ import pydantic
 from clientele.schemas import ListResponse  # noqa
 
 
+class ActionEvent(pydantic.BaseModel):
+    event: str
+    at: float
+    attempt: int | None = None
+    error: str | None = None
+
+
+class ActionFields(str, enum.Enum):
+    ALL = "all"
+    SUMMARY = "summary"
+
+
 class ActionSchemaOut(pydantic.BaseModel):
     name: str
     owner: str
@@ -15,10 +27,21 @@ class ActionSchemaOut(pydantic.BaseModel):
     action_id: str
     result: str | None = None
     task_args: dict[str, typing.Any] | None = None
+    history: list[ActionEvent] | None = None
+    queue_wait_secs: float | None = None
+    run_secs: float | None = None
     created_at: float
     updated_at: float
 
 
+class ActionStatsOut(pydantic.BaseModel):
+    name: str | None = None
+    status: ActionStatus | None = None
+    owner: str | None = None
+    hour: float | None = None
+    count: int
+
+
 class ActionStatus(str, enum.Enum):
     PENDING = "PENDING"
     RUNNING = "RUNNING"
@@ -27,6 +50,22 @@ class ActionStatus(str, enum.Enum):
     CANCELLED = "CANCELLED"
 
 
+class AuthorizeDecision(pydantic.BaseModel):
+    obj: str
+    params: dict[str, str] | None = None
+    authorized: bool
+    within_rate_limits: bool
+
+
+class AuthorizeItem(pydantic.BaseModel):
+    obj: str
+    params: dict[str, str] | None = None
+
+
+class AuthorizeRequest(pydantic.BaseModel):
+    items: list[AuthorizeItem]
+
+
 class CreateTokenParam(pydantic.BaseModel):
     name: str
     username: str
@@ -38,6 +77,17 @@ class HTTPValidationError(pydantic.BaseModel):
     detail: list[ValidationError]
 
 
+class RevokeTokenParam(pydantic.BaseModel):
+    token: str
+
+
+class StatsField(str, enum.Enum):
+    NAME = "name"
+    STATUS = "status"
+    OWNER = "owner"
+    HOUR = "hour"
+
+
 class UserSchemaOut(pydantic.BaseModel):
     name: str
     username: str
@@ -61,10 +111,30 @@ class ResponseCreateToken(pydantic.BaseModel):
     pass
 
 
+class ResponseRevokeToken(pydantic.BaseModel):
+    pass
+
+
 class ResponseActionList(ListResponse[ActionSchemaOut]):
     pass
 
 
+class ResponseAdminActionList(ListResponse[ActionSchemaOut]):
+    pass
+
+
+class ResponseAdminArchiveActionList(ListResponse[ActionSchemaOut]):
+    pass
+
+
+class ResponseAuthorize(ListResponse[AuthorizeDecision]):
+    pass
+
+
+class ResponseActionStats(ListResponse[ActionStatsOut]):
+    pass
+
+
 def get_subclasses_from_same_file() -> list[type[pydantic.BaseModel]]:
     """
     Due to how Python declares classes in a module,
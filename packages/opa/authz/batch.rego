@@ -0,0 +1,21 @@
+package authz
+
+# METADATA
+# description: |
+#   Authorization and rate limit decisions for multiple objects in one query.
+#   input.items is a list of {"obj", "params", "ops_count"} objects; the result
+#   contains one decision per item in the same order.
+# entrypoint: true
+batch := [decision |
+	some item in input.items
+	permissions := user_permissions(data.users, data.roles, _authz_index, input.username, item.obj)
+	decision := {
+		"authorized": params_authorized(permissions, object.get(item, "params", {})),
+		"within_rate_limits": permissions_within_rate_limits(
+			permissions,
+			input.username,
+			item.obj,
+			object.get(item, "ops_count", 0),
+		),
+	}
+]
@@ -0,0 +1,36 @@
+package authz_test
+
+import data.authz
+
+_test_batch_users := {"user1": ["restarter"]}
+
+_test_batch_roles := {"restarter": [{
+	"obj": "restart",
+	"max_ops": 2,
+	"params": {"cluster": "^cluster-1$"},
+}]}
+
+test_batch_decisions if {
+	authz.batch == [
+		{"authorized": true, "within_rate_limits": true},
+		{"authorized": false, "within_rate_limits": true},
+		{"authorized": true, "within_rate_limits": false},
+		{"authorized": false, "within_rate_limits": false},
+	] with input as {
+		"username": "user1",
+		"items": [
+			{"obj": "restart", "params": {"cluster": "cluster-1"}, "ops_count": 1},
+			{"obj": "restart", "params": {"cluster": "cluster-2"}, "ops_count": 0},
+			{"obj": "restart", "params": {"cluster": "cluster-1"}, "ops_count": 2},
+			{"obj": "delete", "params": {}},
+		],
+	}
+		with data.users as _test_batch_users
+		with data.roles as _test_batch_roles
+}
+
+test_batch_empty if {
+	authz.batch == [] with input as {"username": "user1", "items": []}
+		with data.users as _test_batch_users
+		with data.roles as _test_batch_roles
+}
@@ -0,0 +1,53 @@
+package authz
+
+# The optional data.authz_index document maps every user (and the default
+# permissions of all other users) to their permissions by object. Permissions
+# for all objects ("*") are already merged into every object entry. It's
+# generated from data.users and data.roles by data.build.bundle (see
+# build/index.rego) and records the data.roles_revision published with the
+# roles data it was built from. An index of another revision, e.g., the roles
+# data changed after the index was built, is ignored as a whole. Without a
+# matching index, the policies scan all roles of the user.
+default _authz_index := false
+
+_authz_index := data.authz_index if data.authz_index.revision == data.roles_revision
+
+# Roles of the user including the default roles for all users
+user_role_names(users, username) := array.concat(
+	object.get(users, username, []),
+	object.get(users, "*", []),
+)
+
+# Index entry of the user, unless there's no index of the current roles revision
+_user_index(index, username) := object.get(index.users, username, index.default) if index
+
+# Permissions of the user for the given object, including the permissions for all objects ("*")
+user_permissions(users, roles, index, username, obj) := permissions if {
+	user_index := _user_index(index, username)
+	permissions := object.get(user_index, obj, object.get(user_index, "*", []))
+} else := [permission |
+	some role_name in user_role_names(users, username)
+	some permission in object.get(roles, role_name, [])
+	object_matches(permission.obj, obj)
+]
+
+# Objects the user has any permissions for
+user_objects(users, roles, index, username) := objects if {
+	user_index := _user_index(index, username)
+	objects := {obj | some obj, _ in user_index}
+} else := {permission.obj |
+	some role_name in user_role_names(users, username)
+	some permission in object.get(roles, role_name, [])
+}
+
+# All permissions of the user
+user_all_permissions(users, roles, index, username) := all_permissions if {
+	user_index := _user_index(index, username)
+	all_permissions := {permission |
+		some permissions in user_index
+		some permission in permissions
+	}
+} else := {permission |
+	some role_name in user_role_names(users, username)
+	some permission in object.get(roles, role_name, [])
+}
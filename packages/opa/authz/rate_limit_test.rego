@@ -38,173 +38,85 @@ _test_roles_max_ops := {
 	}],
 }
 
-mock_runtime_with_env := {"env": {
-	"OPA_ACTION_API_URL": "http://fake-api.example.com",
-	"OPA_ACTION_API_TOKEN": "fake-token",
-	"OPA_MAX_AGE_MINUTES": "30",
-}}
-
-mock_send_empty_actions(request) := response if {
-	_ = request
-	response := {"status_code": 200, "body": []} # No existing actions
-}
-
 # Scenario 1: Specific action ("limited-action") with max_ops = 3
 test_max_ops_specific_action_count_0_allowed if {
 	authz.within_rate_limits with input as {
 		"username": "user_max_ops_limited",
 		"obj": "limited-action",
 		"params": {"p1": "v1"},
+		"ops_count": 0,
 	}
-		with http.send as mock_send_empty_actions
-		with opa.runtime as mock_runtime_with_env
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
 }
 
-mock_send_count_2_relevant_actions(request) := response if {
-	_ = request
-	response := {"status_code": 200, "body": [
-		{"name": "limited-action", "status": "COMPLETED"},
-		{"name": "limited-action", "status": "RUNNING"},
-		# Total 2 relevant actions
-	]}
-}
-
 test_max_ops_specific_action_count_2_allowed if {
 	authz.within_rate_limits with input as {
 		"username": "user_max_ops_limited",
 		"obj": "limited-action",
 		"params": {"p1": "v1"},
+		"ops_count": 2,
 	}
-		with http.send as mock_send_count_2_relevant_actions
-		with opa.runtime as mock_runtime_with_env
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
 }
 
-mock_send_count_3_relevant_actions(request) := response if {
-	_ = request
-	response := {"status_code": 200, "body": [
-		{"name": "limited-action", "status": "COMPLETED"},
-		{"name": "limited-action", "status": "RUNNING"},
-		{"name": "limited-action", "status": "COMPLETED"},
-		# Total 3 relevant actions, limit is 3, so count >= limit
-	]}
-}
-
+# count >= limit
 test_max_ops_specific_action_count_3_denied if {
 	not authz.within_rate_limits with input as {
 		"username": "user_max_ops_limited",
 		"obj": "limited-action",
 		"params": {"p1": "v1"},
+		"ops_count": 3,
 	}
-		with http.send as mock_send_count_3_relevant_actions
-		with opa.runtime as mock_runtime_with_env
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
 }
 
-# 2 relevant actions, 1 CANCELLED (ignored), 1 other obj (ignored)
-# max_ops = 3. Relevant count is 2. 2 < 3, so allowed.
-mock_send_mixed_status_and_obj(request) := response if {
-	_ = request
-	response := {"status_code": 200, "body": [
-		{"name": "limited-action", "status": "COMPLETED"}, # Relevant
-		{"name": "limited-action", "status": "RUNNING"}, # Relevant
-		{"name": "limited-action", "status": "CANCELLED"}, # Ignored (status)
-		{"name": "other-action", "status": "COMPLETED"}, # Ignored (obj)
-	]}
-}
-
-test_max_ops_specific_action_count_2_plus_ignored_allowed if {
+# no ops_count in input, e.g., for endpoints which aren't rate limited
+test_max_ops_specific_action_count_missing_allowed if {
 	authz.within_rate_limits with input as {
 		"username": "user_max_ops_limited",
 		"obj": "limited-action",
 		"params": {"p1": "v1"},
 	}
-		with http.send as mock_send_mixed_status_and_obj
-		with opa.runtime as mock_runtime_with_env
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
 }
 
 # Scenario 2: Admin role with obj: "*" and max_ops = 2
-mock_send_admin_action_a_count_1(request) := response if {
-	_ = request # request.url for user_admin_max_ops
-
-	# 1 relevant for "admin-action-A"
-	response := {"status_code": 200, "body": [{"name": "admin-action-A", "status": "COMPLETED"}]}
-}
-
 test_max_ops_admin_action_a_count_1_allowed if {
 	authz.within_rate_limits with input as {
 		"username": "user_admin_max_ops",
 		"obj": "admin-action-A",
 		"params": {},
+		"ops_count": 1,
 	}
-		with http.send as mock_send_admin_action_a_count_1
-		with opa.runtime as mock_runtime_with_env
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
 }
 
-mock_send_admin_action_a_count_2(request) := response if {
-	_ = request
-	response := {"status_code": 200, "body": [
-		{"name": "admin-action-A", "status": "COMPLETED"},
-		{"name": "admin-action-A", "status": "RUNNING"},
-		# 2 relevant for "admin-action-A", limit is 2, so count >= limit
-	]}
-}
-
 test_max_ops_admin_action_a_count_2_denied if {
 	not authz.within_rate_limits with input as {
 		"username": "user_admin_max_ops",
 		"obj": "admin-action-A",
 		"params": {},
+		"ops_count": 2,
 	}
-		with http.send as mock_send_admin_action_a_count_2
-		with opa.runtime as mock_runtime_with_env
-		with data.users as _test_users_max_ops
-		with data.roles as _test_roles_max_ops
-}
-
-mock_send_admin_action_a_at_limit(request) := response if {
-	_ = request
-	response := {"status_code": 200, "body": [
-		{"name": "admin-action-A", "status": "COMPLETED"},
-		{"name": "admin-action-A", "status": "RUNNING"},
-		# No "admin-action-B" actions
-	]}
-}
-
-test_max_ops_admin_action_b_allowed_while_action_a_at_limit if {
-	# Count for "admin-action-A" is 2 (at limit for that action).
-	# Current attempt is for "admin-action-B", count for "admin-action-B" is 0.
-	# Should be allowed as max_ops is per specific action obj.
-	authz.within_rate_limits with input as {
-		"username": "user_admin_max_ops",
-		"obj": "admin-action-B", # Attempting a different action
-		"params": {},
-	}
-		with http.send as mock_send_admin_action_a_at_limit
-		with opa.runtime as mock_runtime_with_env
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
 }
 
 # max_ops is defined but is not a number
 test_max_ops_not_a_number_results_in_allowed if {
-	# is_number(permission.max_ops) will be false for "not-a-number".
 	authz.within_rate_limits with input as {
 		"username": "user_invalid_max_ops_type",
 		"obj": "action-invalid-maxops",
 		"params": {},
+		"ops_count": 5,
 	}
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
-		with opa.runtime as mock_runtime_with_env
 }
 
 test_max_ops_zero_results_in_allowed if {
@@ -212,27 +124,19 @@ test_max_ops_zero_results_in_allowed if {
 		"username": "user_max_ops_zero",
 		"obj": "action-maxops-zero",
 		"params": {},
+		"ops_count": 100,
 	}
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
-		with opa.runtime as mock_runtime_with_env
-}
-
-# API call to action-list fails
-mock_send_api_error(request) := response if {
-	_ = request
-	response := {"status_code": 500, "body": {"error": "Internal Server Error"}}
 }
 
-test_max_ops_api_error_results_in_deny if {
-	# This tests that "fail-open" behavior for the max_ops check part.
-	not authz.within_rate_limits with input as {
-		"username": "user_max_ops_limited",
-		"obj": "limited-action",
-		"params": {"p1": "v1"},
+test_max_ops_unlimited_action_allowed if {
+	authz.within_rate_limits with input as {
+		"username": "user_no_max_ops_def",
+		"obj": "unlimited-action",
+		"params": {},
+		"ops_count": 100,
 	}
-		with http.send as mock_send_api_error
-		with opa.runtime as mock_runtime_with_env
 		with data.users as _test_users_max_ops
 		with data.roles as _test_roles_max_ops
 }
@@ -7,23 +7,16 @@ default authorized := false
 # entrypoint: true
 # scope: document
 authorized if {
-	# Check if the user has specific roles
-	user_roles := data.users[input.username]
-	some role_name in user_roles
-	check_role_permissions(data.roles[role_name], input.username, input.obj, input.params)
+	permissions := user_permissions(data.users, data.roles, _authz_index, input.username, input.obj)
+	params_authorized(permissions, input.params)
 }
 
-authorized if {
-	# Check if there are default roles for all users
-	default_roles := data.users["*"]
-	some role_name in default_roles
-	check_role_permissions(data.roles[role_name], input.username, input.obj, input.params)
-}
+default params_authorized(_, _) := false
 
-check_role_permissions(role_permissions, username, current_input_obj, current_input_params) if {
-	some permission in role_permissions
-	object_matches(permission.obj, current_input_obj)
-	valid_params(permission.params, current_input_params)
+# Check if any of the permissions allows the given params
+params_authorized(permissions, params) if {
+	some permission in permissions
+	valid_params(permission.params, params)
 }
 
 # Match any input if permission_obj is "*"
@@ -49,3 +49,11 @@ test_default_action_list_action_user_param_is_allowed_for_opa if {
 		"params": {"action_user": "some-user"},
 	}
 }
+
+test_default_authorize if {
+	authz.authorized with input as {
+		"username": "random-user",
+		"obj": "authorize",
+		"params": {},
+	}
+}
@@ -37,7 +37,6 @@ test_admin_allowed if {
 			"extra": "extra-value",
 		},
 	}
-		with http.send as mock_send_empty_actions
 		with data.users as _test_users
 		with data.roles as _test_roles
 }
@@ -1,13 +1,10 @@
 package authz
 
 objects contains obj if {
-	some role in data.users[input.username]
-	some permission in data.roles[role]
-	obj := permission.obj
+	some obj in user_objects(data.users, data.roles, _authz_index, input.username)
 }
 
-objects contains obj if {
-	some role in data.users["*"]
-	some permission in data.roles[role]
-	obj := permission.obj
-}
+# METADATA
+# description: All permissions of the user, e.g., for the capability tokens of the API server
+# entrypoint: true
+permissions := user_all_permissions(data.users, data.roles, _authz_index, input.username)
@@ -72,3 +72,51 @@ test_unknown_user_objects if {
 		obj in expected
 	}
 }
+
+test_user_permissions if {
+	permissions := authz.permissions with input as {"username": "user1"}
+		with data.users as _user_test_users
+		with data.roles as _user_test_roles
+
+	permissions == {_user_test_roles.default[0], _user_test_roles["test-team"][0]}
+}
+
+test_user_permissions_indexed if {
+	index := data.build.bundle.authz_index with data.users as _user_test_users
+		with data.roles as _user_test_roles
+		with data.roles_revision as "r1"
+
+	permissions := authz.permissions with input as {"username": "admin-user"}
+		with data.users as _user_test_users
+		with data.roles as _user_test_roles
+		with data.roles_revision as "r1"
+		with data.authz_index as index
+
+	permissions == {_user_test_roles.default[0], _user_test_roles.admin[0]}
+}
+
+test_user_permissions_stale_index if {
+	# the admin role has been revoked and a new roles revision published after the index was built
+	index := data.build.bundle.authz_index with data.users as _user_test_users
+		with data.roles as _user_test_roles
+		with data.roles_revision as "r1"
+	users := object.union(_user_test_users, {"admin-user": []})
+
+	permissions := authz.permissions with input as {"username": "admin-user"}
+		with data.users as users
+		with data.roles as _user_test_roles
+		with data.roles_revision as "r2"
+		with data.authz_index as index
+
+	permissions == {_user_test_roles.default[0]}
+}
+
+test_roles_revision if {
+	revision := data.build.revision with data.users as _user_test_users
+		with data.roles as _user_test_roles
+	users := object.union(_user_test_users, {"admin-user": []})
+	changed := data.build.revision with data.users as users
+		with data.roles as _user_test_roles
+
+	revision.roles_revision != changed.roles_revision
+}
@@ -0,0 +1,31 @@
+package benchmark
+
+# Synthetic roles data for `make bench`: hundreds of roles, thousands of users.
+_roles_count := 500
+
+_users_count := 5000
+
+_objects_count := 50
+
+# METADATA
+# description: |
+#   Synthetic users and roles data in the format of dev/roles.yml. The default
+#   roles for all users come from authz/default_roles.yml.
+# entrypoint: true
+roles_data := {
+	"users": {sprintf("user-%d", [i]): _user_roles(i) | some i in numbers.range(0, _users_count - 1)},
+	"roles": {sprintf("role-%d", [i]): _role_permissions(i) | some i in numbers.range(0, _roles_count - 1)},
+}
+
+_user_roles(i) := [sprintf("role-%d", [(i * 7 + j) % _roles_count]) | some j in numbers.range(0, 2)]
+
+_role_permissions(i) := [{
+	"obj": sprintf("action-%d", [(i + j) % _objects_count]),
+	"max_ops": 5,
+	"params": {
+		"cluster": sprintf("^cluster-%d$", [i % 10]),
+		"namespace": sprintf("^namespace-%d-.*", [j]),
+	},
+} |
+	some j in numbers.range(0, 4)
+]
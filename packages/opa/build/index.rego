@@ -0,0 +1,49 @@
+package build
+
+_default_roles := object.get(data.users, "*", [])
+
+# METADATA
+# description: |
+#   Revision of the roles data: a digest of the users and roles, including the
+#   default roles. Publish it with the roles data whenever they change, e.g.
+#   opa eval --format raw -d authz -d build -d roles.yml 'data.build.revision' > roles_revision.json
+# entrypoint: true
+revision := {"roles_revision": crypto.sha256(json.marshal([data.users, data.roles]))}
+
+# METADATA
+# description: |
+#   Precomputed (user, obj) permission index for the authz policies. Store the
+#   result as a data file next to the roles data and their revision, e.g.
+#   opa eval --format raw -d authz -d build -d roles.yml -d roles_revision.json 'data.build.bundle' > authz_index.json
+# entrypoint: true
+bundle := {"authz_index": {
+	"revision": data.roles_revision,
+	"users": {username: _permission_index(data.roles, array.concat(roles, _default_roles)) |
+		some username, roles in data.users
+		username != "*"
+	},
+	"default": _permission_index(data.roles, _default_roles),
+}}
+
+_permission_index(roles, role_names),
+}
+
+_permission_index(roles, role_names) := {obj: array.concat(
+	_permissions(roles, role_names, obj),
+	_wildcard_permissions(roles, role_names, obj),
+) |
+	some obj in {permission.obj |
+		some role_name in role_names
+		some permission in roles[role_name]
+	}
+}
+
+_permissions(roles, role_names, obj) := [permission |
+	some role_name in role_names
+	some permission in roles[role_name]
+	permission.obj == obj
+]
+
+_wildcard_permissions(_, _, "*") := []
+
+_wildcard_permissions(roles, role_names, obj) := _permissions(roles, role_names, "*") if obj != "*"
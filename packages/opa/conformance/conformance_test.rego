@@ -0,0 +1,65 @@
+package authz_conformance_test
+
+import data.authz
+import data.build
+
+# prebuilt permission index per suite
+_indexes[suite.name] := index if {
+	some suite in data.conformance.suites
+	index := build.bundle.authz_index with data.users as suite.users
+		with data.roles as suite.roles
+		with data.roles_revision as "current"
+}
+
+# index built from an outdated roles revision that grants everything; the
+# policies must ignore it and scan the current roles instead
+_stale_indexes[suite.name] := index if {
+	some suite in data.conformance.suites
+	index := build.bundle.authz_index with data.users as suite.users
+		with data.roles as {role_name: [{"obj": "*", "max_ops": null, "params": {}}] |
+			some role_name, _ in suite.roles
+		}
+		with data.roles_revision as "outdated"
+}
+
+# METADATA
+# description: Conformance cases shared with the in-process authorizer of the API server
+failed_cases contains sprintf("%s/%s%s", [suite.name, case.name, variant]) if {
+	some suite in data.conformance.suites
+
+	# false disables the prebuilt index, i.e., the policies scan all roles
+	some variant, index in {
+		"": false,
+		" (indexed)": _indexes[suite.name],
+		" (stale index)": _stale_indexes[suite.name],
+	}
+	some case in suite.cases
+
+	result := {
+		"authorized": authz.authorized,
+		"within_rate_limits": authz.within_rate_limits,
+		"objects": authz.objects,
+	} with input as case.input
+		with data.users as suite.users
+		with data.roles as suite.roles
+		with data.roles_revision as "current"
+		with data.authz_index as index
+
+	# the same case as the single item of a batch query
+	batch := authz.batch with input as {"username": case.input.username, "items": [case.input]}
+		with data.users as suite.users
+		with data.roles as suite.roles
+		with data.roles_revision as "current"
+		with data.authz_index as index
+
+	expected := object.union(case.expected, {
+		"objects": {obj | some obj in case.expected.objects},
+		"batch": [object.filter(case.expected, ["authorized", "within_rate_limits"])],
+	})
+	object.union(result, {"batch": batch}) != expected
+}
+
+test_conformance if {
+	print("failed conformance cases:", failed_cases)
+	count(failed_cases) == 0
+}